@@ -0,0 +1,133 @@
+import signal
+from http import HTTPStatus
+
+from PySide6.QtCore import QObject, QSettings, QTimer, QThreadPool
+
+from app import RECORDINGS_DIR, APP_NAME
+from app.services import retention
+from app.services.camera_channel import CameraChannel
+from app.services.control_api import DEFAULT_PORT, ControlServer
+from app.services.logger import get_logger
+from app.services.recording_service import RecordingService
+from app.services.wall_layout import DEFAULT_CAMERA_COUNT, MAX_CAMERAS
+
+
+class RecorderDaemon(QObject):
+    """
+    Records the configured cameras without any widgets, controlled over a local HTTP API.
+
+    Uses the same settings, capture threads, recording service, pre-event
+    buffers, motion trigger and retention as the GUI, but decodes only the
+    full-resolution stream and only while a camera records, buffers or is
+    watched for motion; nothing is scaled or converted for display.
+
+    ``GET /status``, ``POST /recording/start``, ``POST /recording/stop`` and
+    ``POST /refresh``; the last three take an optional ``camera`` number (from 1).
+    A refresh of all cameras also picks up a changed camera count.
+    """
+
+    def __init__(self, port=None, parent=None):
+        super().__init__(parent)
+        self.logger = get_logger('RecorderDaemon')
+        self.settings = QSettings(APP_NAME, "AxisApp")
+        self.threadpool = QThreadPool(self)
+
+        self.recording_service = RecordingService(parent=self)
+        self.recording_service.recorder_failed.connect(
+            lambda recorder_id, message: self.logger.warning(f'Recording {recorder_id} failed: {message}')
+        )
+
+        self.channels = []
+        self.sync_channels()
+
+        self.api = ControlServer({
+            ('GET', '/status'): self.status,
+            ('POST', '/recording/start'): self.start_recording,
+            ('POST', '/recording/stop'): self.stop_recording,
+            ('POST', '/refresh'): self.refresh,
+        }, port=port or int(self.settings.value('headless/port', DEFAULT_PORT)), parent=self)
+
+        self.retention_timer = QTimer(self)
+        self.retention_timer.timeout.connect(self.enforce_retention)
+        self.retention_timer.start(retention.CHECK_INTERVAL_MS)
+        self.enforce_retention()
+
+    def sync_channels(self):
+        """Start or close channels to match the configured camera count; returns the new ones."""
+        count = min(MAX_CAMERAS, max(1, int(self.settings.value('cameras/count', DEFAULT_CAMERA_COUNT))))
+        while len(self.channels) > count:
+            channel = self.channels.pop()
+            channel.close()
+            channel.deleteLater()
+        added = []
+        for i in range(len(self.channels), count):
+            title = self.settings.value(f"device_{i}/name") or f'Panel {i + 1}'
+            channel = CameraChannel(title, self.settings.value(f"device_{i}/ip") or None, i,
+                                    self.recording_service, display=False, parent=self)
+            channel.state_changed.connect(lambda state, c=channel: self.logger.info(f'{c.title}: {state.value}'))
+            channel.start()
+            added.append(channel)
+        self.channels += added
+        return added
+
+    def _selected(self, query):
+        if 'camera' not in query:
+            return [channel for channel in self.channels if channel.stream_ip]
+        number = int(query['camera'])
+        if not 1 <= number <= len(self.channels):
+            raise ValueError(f'camera must be 1-{len(self.channels)}')
+        return [self.channels[number - 1]]
+
+    def status(self, query):
+        return HTTPStatus.OK, {
+            'cameras': [dict(channel.status(), number=i + 1) for i, channel in enumerate(self.channels)],
+            'recorders': list(self.recording_service.stats().values()),
+        }
+
+    def start_recording(self, query):
+        for channel in self._selected(query):
+            channel.start_recording_thread()
+        return self.status(query)
+
+    def stop_recording(self, query):
+        for channel in self._selected(query):
+            if channel.is_recording:
+                channel.stop_recording()
+        return self.status(query)
+
+    def refresh(self, query):
+        """Re-read the settings (camera addresses, recording options) and restart the streams."""
+        if 'camera' in query:
+            channels = self._selected(query)
+        else:
+            added = self.sync_channels()
+            channels = [channel for channel in self.channels if channel not in added]
+        for channel in channels:
+            channel.refresh()
+        return self.status(query)
+
+    def enforce_retention(self):
+        self.threadpool.start(
+            retention.RetentionTask(RECORDINGS_DIR, retention.RetentionPolicy.from_settings(self.settings))
+        )
+
+    def shutdown(self):
+        self.api.close()
+        for channel in self.channels:
+            channel.close()
+        self.recording_service.shutdown()
+        self.threadpool.waitForDone()
+
+
+def run(app, port=None):
+    """Run the daemon on ``app`` (a ``QCoreApplication``) until SIGINT or SIGTERM."""
+    daemon = RecorderDaemon(port)
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: app.quit())
+    # Qt's loop doesn't return to Python on its own; let the signal handlers run.
+    wakeup = QTimer()
+    wakeup.timeout.connect(lambda: None)
+    wakeup.start(500)
+    code = app.exec()
+    daemon.shutdown()
+    return code
@@ -1,20 +1,33 @@
 
+import argparse
 import multiprocessing
 import sys
 import os
-from PySide6.QtWidgets import QApplication
 from app import RECORDINGS_DIR, APP_NAME
 from app.services.logger import get_logger
-from app.widgets.main_window import MainWindow
 
 def main():
     logger = get_logger(__name__)
+    parser = argparse.ArgumentParser(prog='python -m app.main')
+    parser.add_argument('--headless', action='store_true', help='record without a GUI, controlled over HTTP')
+    parser.add_argument('--port', type=int, help='control API port for --headless (default 8765)')
+    args, qt_args = parser.parse_known_args()
     try:
-        app = QApplication(sys.argv)
-        app.setApplicationName(APP_NAME)
-
         os.makedirs(RECORDINGS_DIR, exist_ok=True)
 
+        if args.headless:
+            # No widgets: a core application, and nothing from the GUI is imported.
+            from PySide6.QtCore import QCoreApplication
+            from app import headless
+            app = QCoreApplication(sys.argv[:1] + qt_args)
+            app.setApplicationName(APP_NAME)
+            sys.exit(headless.run(app, args.port))
+
+        from PySide6.QtWidgets import QApplication
+        from app.widgets.main_window import MainWindow
+        app = QApplication(sys.argv[:1] + qt_args)
+        app.setApplicationName(APP_NAME)
+
         window = MainWindow()
         window.show()
         #window.showFullScreen()
@@ -0,0 +1,202 @@
+import math
+import os
+import struct
+import subprocess
+
+import cv2
+import numpy as np
+
+from app.services.keyframe_index import KeyframeIndex
+from app.services.motion_detector import ANALYSIS_WIDTH, DEFAULT_SENSITIVITY, MotionDetector
+from app.services.session_manifest import recording_parts
+from app.widgets.passthrough_recorder_thread import ffmpeg_path
+
+ACTIVITY_SUFFIX = '.activity'
+# Header: magic, version; then one uint16 per second of video (share of the frame that moved, scaled to 65535).
+_HEADER = struct.Struct('<4sH')
+_MAGIC = b'VHAI'
+_VERSION = 1
+_SCALE = 65535
+ANALYSIS_FPS = 2            # frames scored per second of video
+EVENT_THRESHOLD = MotionDetector(DEFAULT_SENSITIVITY).threshold
+EVENT_GAP_SECONDS = 5       # quieter stretches this short don't split an event
+MAX_KEYFRAME_GAP_MS = 2000  # keyframes further apart than this could miss an event between them
+
+
+def activity_index_path(video_path):
+    return os.path.splitext(video_path)[0] + ACTIVITY_SUFFIX
+
+
+def save_activity(path, scores):
+    data = np.round(np.clip(np.asarray(scores, np.float32), 0, 1) * _SCALE).astype('<u2')
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION))
+        f.write(data.tobytes())
+
+
+def load_activity(path):
+    """Per-second scores stored in ``path``, or None if it is missing or unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            magic, version = _HEADER.unpack(f.read(_HEADER.size))
+            data = f.read()
+    except (OSError, struct.error):
+        return None
+    if magic != _MAGIC or version != _VERSION:
+        return None
+    return np.frombuffer(data[:len(data) - len(data) % 2], '<u2').astype(np.float32) / _SCALE
+
+
+class ActivityWriter:
+    """
+    Collects a motion score per second of a video while it is encoded, saved on ``close()``.
+
+    ``add()`` takes every frame; the detector looks at ``ANALYSIS_FPS`` of them
+    a second and each second keeps its highest score.
+    """
+
+    def __init__(self, path, max_fps=ANALYSIS_FPS):
+        self.path = path
+        self.scores = []
+        self._detector = MotionDetector(DEFAULT_SENSITIVITY, max_fps=max_fps)
+
+    def add(self, frame, second, timestamp):
+        score = self._detector.feed(frame, timestamp)
+        if score is None:
+            return
+        if second >= len(self.scores):
+            self.scores.extend([0.0] * (second + 1 - len(self.scores)))
+        self.scores[second] = max(self.scores[second], score)
+
+    def close(self):
+        save_activity(self.path, self.scores)
+
+
+def scan_activity(file, max_fps=ANALYSIS_FPS):
+    """
+    Per-second scores of an existing video, or None if it can't be decoded.
+
+    An MP4 with a keyframe at least every ``MAX_KEYFRAME_GAP_MS`` (cameras
+    usually send one a second or two) is scanned with ffmpeg decoding its
+    keyframes only, each one scoring the seconds since the one before. Other
+    files, or without ffmpeg, are decoded whole and ``max_fps`` frames a second
+    are converted and scored.
+    """
+    keyframes = KeyframeIndex.load(file)
+    if keyframes and keyframes.times and ffmpeg_path():
+        gaps = np.diff(keyframes.times + [keyframes.duration])
+        if gaps.max(initial=0) <= MAX_KEYFRAME_GAP_MS:
+            scores = _scan_keyframes(file, keyframes, max_fps)
+            if scores is not None:
+                return scores
+    return _scan_frames(file, max_fps)
+
+
+def _scan_keyframes(file, keyframes, max_fps):
+    capture = cv2.VideoCapture(file)
+    width, height = capture.get(cv2.CAP_PROP_FRAME_WIDTH), capture.get(cv2.CAP_PROP_FRAME_HEIGHT)
+    capture.release()
+    if width <= 0 or height <= 0:
+        return None
+    # ffmpeg shrinks the frames to what the detector looks at, so only small frames cross the pipe.
+    size = (ANALYSIS_WIDTH, max(2, round(height * ANALYSIS_WIDTH / width / 2) * 2))
+    frame_bytes = size[0] * size[1] * 3
+    command = [ffmpeg_path(), '-nostdin', '-loglevel', 'error', '-skip_frame', 'nokey', '-i', file,
+               '-vf', f'scale={size[0]}:{size[1]}', '-fps_mode', 'passthrough',
+               '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-']
+
+    detector = MotionDetector(DEFAULT_SENSITIVITY, max_fps=max_fps)
+    scores = [0.0] * max(1, math.ceil(keyframes.duration / 1000))
+    previous = 0
+    decoded = False
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        for time_ms in keyframes.times:
+            data = process.stdout.read(frame_bytes)
+            if len(data) < frame_bytes:
+                break
+            decoded = True
+            score = detector.feed(np.frombuffer(data, np.uint8).reshape(size[1], size[0], 3), time_ms / 1000)
+            if score is None:
+                continue
+            # Whatever changed since the last keyframe looked at happened in between.
+            for second in range(previous, min(time_ms // 1000, len(scores) - 1) + 1):
+                scores[second] = max(scores[second], score)
+            previous = time_ms // 1000
+    finally:
+        process.kill()
+        process.wait()
+    return scores if decoded else None
+
+
+def _scan_frames(file, max_fps):
+    capture = cv2.VideoCapture(file)
+    try:
+        if not capture.isOpened():
+            return None
+        fps = capture.get(cv2.CAP_PROP_FPS)
+        if fps <= 0:
+            return None
+        step = max(1, round(fps / max_fps))
+        writer = ActivityWriter(activity_index_path(file), max_fps=0)
+        frame_number = 0
+        while capture.grab():
+            if frame_number % step == 0:
+                ok, frame = capture.retrieve()
+                if ok:
+                    writer.add(frame, int(frame_number / fps), frame_number / fps)
+            frame_number += 1
+        if not frame_number:
+            return None
+        # Trailing seconds without a scored frame still belong to the video.
+        writer.scores.extend([0.0] * (math.ceil(frame_number / fps) - len(writer.scores)))
+        return writer.scores
+    finally:
+        capture.release()
+
+
+class ActivityIndex:
+    """A recording's per-second motion scores on its playback timeline."""
+
+    def __init__(self, scores):
+        self.scores = np.asarray(scores, np.float32)
+
+    @classmethod
+    def for_recording(cls, path):
+        """
+        ``(index, missing)``: the scores of every file of ``path`` laid end to end,
+        and the files that have no activity sidecar yet (zero in the index).
+        """
+        parts, missing = [], []
+        for file, duration in recording_parts(path):
+            scores = load_activity(activity_index_path(file))
+            if scores is None:
+                missing.append(file)
+                scores = np.zeros(0, np.float32)
+            if duration:
+                # Placed by the segment's length, as the player does.
+                seconds = math.ceil(duration)
+                scores = np.pad(scores[:seconds], (0, max(0, seconds - len(scores))))
+            parts.append(scores)
+        return cls(np.concatenate(parts) if parts else []), missing
+
+    def __len__(self):
+        return len(self.scores)
+
+    def events(self, threshold=EVENT_THRESHOLD):
+        """``[(first second, last second)]`` of the stretches with motion."""
+        active = np.flatnonzero(self.scores >= threshold)
+        if not len(active):
+            return []
+        breaks = np.flatnonzero(np.diff(active) > EVENT_GAP_SECONDS)
+        starts = np.concatenate(([active[0]], active[breaks + 1]))
+        ends = np.concatenate((active[breaks], [active[-1]]))
+        return list(zip(starts.tolist(), ends.tolist()))
+
+    def next_event(self, second, threshold=EVENT_THRESHOLD):
+        """Start (s) of the first event beginning after ``second``, or None."""
+        return next((start for start, _ in self.events(threshold) if start > second), None)
+
+    def previous_event(self, second, threshold=EVENT_THRESHOLD):
+        """Start (s) of the last event beginning before ``second``, or None."""
+        return next((start for start, _ in reversed(self.events(threshold)) if start < second), None)
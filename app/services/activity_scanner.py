@@ -0,0 +1,67 @@
+import cv2
+from PySide6.QtCore import QObject, Signal, QRunnable, QThread, QThreadPool
+
+from app.services.activity_index import ActivityIndex, activity_index_path, save_activity, scan_activity
+from app.services.logger import get_logger
+
+
+class ActivitySignals(QObject):
+    finished = Signal(str)   # recording path
+
+
+class ActivityTask(QRunnable):
+    def __init__(self, path, files):
+        super().__init__()
+        self.signals = ActivitySignals()
+        self._path = path
+        self._files = files
+        self.logger = get_logger('ActivityTask')
+
+    def run(self):
+        for file in self._files:
+            try:
+                scores = scan_activity(file)
+                if scores is not None:
+                    save_activity(activity_index_path(file), scores)
+            except (OSError, cv2.error) as e:
+                self.logger.warning(f'Could not index activity of {file}: {e}')
+        self.signals.finished.emit(self._path)
+
+
+class ActivityIndexer(QObject):
+    """
+    Activity indexes for the media player.
+
+    Recordings made in re-encode mode get their sidecars while they are written;
+    files without one (passthrough, older recordings) are scanned once on a
+    low-priority thread, and ``ready`` fires when the index is complete.
+    """
+    ready = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._pool.setThreadPriority(QThread.LowestPriority)
+        self._pending = {}
+        self._scanned = set()       # files already tried, decodable or not
+
+    def activity(self, path):
+        """The index of ``path`` as far as it is known; missing parts are queued for a scan."""
+        index, missing = ActivityIndex.for_recording(path)
+        missing = [file for file in missing if file not in self._scanned]
+        if missing and path not in self._pending:
+            self._scanned.update(missing)
+            task = ActivityTask(path, missing)
+            task.signals.finished.connect(self._on_finished)
+            self._pending[path] = task
+            self._pool.start(task)
+        return index
+
+    def _on_finished(self, path):
+        self._pending.pop(path, None)
+        self.ready.emit(path)
+
+    def shutdown(self):
+        self._pool.clear()
+        self._pool.waitForDone()
@@ -0,0 +1,46 @@
+from urllib.parse import urlencode
+
+from app import AXIS_PASSWORD, AXIS_USER_NAME
+
+GRID_PROFILE = 'grid'
+FULL_PROFILE = 'full'
+
+# 'auto' sizes each tile's stream to the tile; a fixed resolution applies to every tile.
+AUTO_RESOLUTION = 'auto'
+DEFAULT_GRID_RESOLUTION = AUTO_RESOLUTION
+DEFAULT_GRID_FPS = 15
+DEFAULT_TILE_SIZE = (640, 360)
+# Scaled 16:9 streams a tile can ask the encoder for, smallest first.
+TILE_RESOLUTIONS = ((320, 180), (480, 270), (640, 360), (960, 540), (1280, 720), (1920, 1080))
+# (widest tile, fps): small tiles don't need every frame to look live.
+TILE_FPS = ((240, 6), (480, 10))
+
+
+def stream_url(ip, resolution=None, fps=None):
+    """
+    RTSP url of an Axis encoder channel.
+
+    ``resolution`` (e.g. ``'640x360'``) and ``fps`` ask the encoder for a scaled
+    stream through the VAPIX media parameters; without them the camera's default
+    (full resolution) profile is used.
+    """
+    url = f'rtsp://{AXIS_USER_NAME}:{AXIS_PASSWORD}@{ip}/axis-media/media.amp'
+    params = {}
+    if resolution:
+        params['resolution'] = resolution
+    if fps:
+        params['fps'] = int(fps)
+    return f'{url}?{urlencode(params)}' if params else url
+
+
+def tile_stream(width, height, max_fps=DEFAULT_GRID_FPS):
+    """
+    ``(resolution, fps)`` of the smallest scaled stream that fills a ``width`` x ``height`` tile.
+
+    The picture is fitted to the tile at 16:9, and a rung up to ~10% smaller
+    than the picture is still used: the upscale doesn't show, the bandwidth does.
+    """
+    shown = min(width, height * 16 / 9)
+    w, h = next(((w, h) for w, h in TILE_RESOLUTIONS if w >= shown * 0.9), TILE_RESOLUTIONS[-1])
+    fps = next((fps for widest, fps in TILE_FPS if shown <= widest), max_fps)
+    return f'{w}x{h}', min(fps, int(max_fps))
@@ -0,0 +1,515 @@
+import datetime
+import os
+import time
+
+from PySide6.QtCore import QObject, QSettings, Signal, QTimer
+
+from app import RECORDINGS_DIR, APP_NAME
+from app.services import axis
+from app.services.frame_mailbox import FrameMailbox
+from app.services.frame_overlay import DEFAULT_FONT_SCALE, DEFAULT_POSITION
+from app.services.frame_pacer import DEFAULT_DISPLAY_FPS
+from app.services.logger import get_logger
+from app.services.motion_detector import DEFAULT_MAX_FPS, DEFAULT_POST_ROLL_SECONDS, MotionDetector, parse_zones
+from app.services.pre_event_buffer import DEFAULT_PRE_EVENT_MB, DEFAULT_PRE_EVENT_SECONDS
+from app.services.recording_service import DEFAULT_QUEUE_MB, DROP_OLDEST
+from app.services.stream_info import StreamInfo
+from app.widgets.passthrough_recorder_thread import PassthroughRecorder, ffmpeg_path
+from app.widgets.process_capture_thread import ProcessCaptureThread
+from app.widgets.video_capture_thread import VideoCaptureThread
+
+DEFAULT_SEGMENT_MINUTES = 5
+# A resized tile settles for this long before its stream is re-requested at the new size.
+RESTREAM_DELAY_MS = 1500
+CAPTURE_BACKENDS = {
+    'thread': VideoCaptureThread,
+    'process': ProcessCaptureThread,
+}
+
+
+class CameraChannel(QObject):
+    """
+    One camera's streams, pre-event buffer, recorder and motion trigger, without any widgets.
+
+    With ``display`` the channel runs a display stream whose frames a panel takes
+    with ``take_frame()`` while it is visible, plus a full-resolution record
+    stream when the two differ. Without it (headless) there is only the record stream, and it runs
+    only while the camera records, buffers pre-event frames or is watched for motion.
+    """
+    state_changed = Signal(object)
+    video_error = Signal(str)
+
+    def __init__(self, title, stream_ip, panel_index, recording_service=None, display=True, parent=None):
+        super().__init__(parent)
+        self.logger = get_logger('CameraChannel')
+
+        self.title = title
+        self.stream_ip = stream_ip
+        self.panel_index = panel_index
+        self.recording_service = recording_service
+        self.display = display
+
+        self.settings = QSettings(APP_NAME, "AxisApp")
+
+        # Grid tiles show the encoder's low-res profile; a zoomed panel and the
+        # recorder use the full-resolution one.
+        self.stream_profile = axis.GRID_PROFILE
+        self.display_size = None
+        # Until the panel is shown its display stream is only grabbed, unless it feeds a recording.
+        self.visible = False
+        self.video_url = self.profile_url(self.stream_profile) if display else None
+        self.record_url = self.profile_url(axis.FULL_PROFILE)
+        self.restream_timer = QTimer(self)
+        self.restream_timer.setSingleShot(True)
+        self.restream_timer.setInterval(RESTREAM_DELAY_MS)
+        self.restream_timer.timeout.connect(self._switch_stream)
+
+        self._is_recording = False
+        self.frame_mailbox = FrameMailbox()
+
+        # Recording started by the motion detector; it stops after the post-roll without motion.
+        self.motion_detector = None
+        self.motion_recording = False
+        self._last_motion = 0
+        self.motion_timer = QTimer(self)
+        self.motion_timer.setInterval(1000)
+        self.motion_timer.timeout.connect(self.check_motion_post_roll)
+
+        self.video_thread = None
+        self.record_thread = None
+        self.recorder = None
+        self._record_sink = None
+        self._pre_event_sink = None
+        self.stream_info: StreamInfo | None = None
+        self.record_stream_info: StreamInfo | None = None
+        self.stream_state = None
+
+        # While switching profiles the old stream stays on screen until the new one delivers.
+        self._pending_thread = None
+        self._pending_mailbox = None
+        self._pending_stream_info = None
+        self._retiring_threads = []
+
+    def start(self):
+        if self.display:
+            # The display size is known by now; an 'auto' grid stream depends on it.
+            self.video_url = self.profile_url(self.stream_profile)
+        if self.video_url:
+            self.start_video_thread()
+        self.sync_pre_event()
+        self.sync_motion()
+
+    def profile_url(self, profile):
+        if not self.stream_ip:
+            return None
+        if profile == axis.FULL_PROFILE:
+            return axis.stream_url(self.stream_ip)
+        resolution = self.settings.value('stream/grid_resolution', axis.DEFAULT_GRID_RESOLUTION)
+        fps = int(self.settings.value('stream/grid_fps', axis.DEFAULT_GRID_FPS)) if resolution else None
+        if resolution == axis.AUTO_RESOLUTION:
+            resolution, fps = axis.tile_stream(*(self.display_size or axis.DEFAULT_TILE_SIZE), fps)
+        return axis.stream_url(self.stream_ip, resolution, fps)
+
+    @property
+    def dual_stream(self):
+        return self.video_url != self.record_url
+
+    @property
+    def is_recording(self):
+        return self._is_recording
+
+    def set_stream_info(self, stream_info):
+        # Called directly when the pending stream is promoted, when sender() is None too.
+        if self._pending_thread is not None and self.sender() is self._pending_thread:
+            self._pending_stream_info = stream_info
+            return
+        if self.sender() is not None and self.sender() is not self.video_thread:
+            return  # a retired stream that opened after all
+        self.stream_info = stream_info
+        if not self.dual_stream and not self.record_thread:
+            self.set_record_stream_info(stream_info)
+
+    def set_record_stream_info(self, stream_info):
+        self.record_stream_info = stream_info
+        self.sync_pre_event()
+
+        if self._is_recording and (not self.recorder):
+            self.logger.debug(f'starting recording after pressing button.')
+            self.start_recording_thread(motion=self.motion_recording)
+
+    def take_frame(self):
+        """Latest display frame, or None; the first frame of a new profile's stream switches to it."""
+        if self._pending_thread:
+            frame = self._pending_mailbox.take()
+            if frame is not None:
+                self._promote_pending_thread()
+                return frame
+        return self.frame_mailbox.take()
+
+    def set_display_size(self, width, height):
+        self.display_size = (width, height)
+        for thread in (self.video_thread, self._pending_thread):
+            if thread:
+                thread.set_display_size(width, height)
+        if self.display and self.stream_ip and self.stream_profile == axis.GRID_PROFILE:
+            # A tile that grew or shrank may want another rung of the encoder's scaled streams.
+            self.restream_timer.start()
+
+    def set_visible(self, visible):
+        self.visible = visible
+        for thread in (self.video_thread, self._pending_thread):
+            if thread:
+                thread.set_visible(visible)
+
+    def on_state_changed(self, state):
+        if self.sender() is not self._watched_thread():
+            return
+        self.stream_state = state
+        self.state_changed.emit(state)
+
+    def on_video_error(self, message):
+        if self.sender() is not self._watched_thread():
+            return
+        self.video_error.emit(message)
+
+    def display_fps(self):
+        """Most frames a second the panel shows: the camera's own cap, else the wall's; None for all."""
+        fps = int(self.settings.value(f'device_{self.panel_index}/display_fps', 0))
+        return fps or int(self.settings.value('display/max_fps', DEFAULT_DISPLAY_FPS)) or None
+
+    def _watched_thread(self):
+        """Thread whose health and motion stand for the camera's: the display stream, headless the record one."""
+        return self.video_thread if self.display else self.record_thread
+
+    def _create_capture_thread(self, url, mailbox, probe_result=None):
+        backend = CAPTURE_BACKENDS.get(self.settings.value('capture/backend', 'thread'), VideoCaptureThread)
+        if not self.display:
+            # Worker processes keep decoding off the GUI thread; without a GUI they only add copies.
+            backend = VideoCaptureThread
+        return backend(url, mailbox, probe_result=probe_result)
+
+    def _create_display_thread(self, url, mailbox, probe_result=None):
+        thread = self._create_capture_thread(url, mailbox, probe_result)
+        thread.stream_opened.connect(self.set_stream_info)
+        thread.video_error.connect(self.on_video_error)
+        thread.state_changed.connect(self.on_state_changed)
+        thread.motion_scored.connect(self.on_motion_scored)
+        if self.display_size:
+            thread.set_display_size(*self.display_size)
+        thread.set_display_fps(self.display_fps())
+        thread.set_visible(self.visible)
+        return thread
+
+    def _retire_thread(self, thread):
+        """Stop a capture thread without blocking the GUI on its last read."""
+        # Connect before stopping, so a thread that exits right away still reports it.
+        self._retiring_threads.append(thread)
+        thread.finished.connect(lambda: self._forget_retired_thread(thread))
+        thread.stop()
+        if not thread.isRunning():
+            self._forget_retired_thread(thread)
+
+    def _forget_retired_thread(self, thread):
+        if thread in self._retiring_threads:
+            self._retiring_threads.remove(thread)
+
+    def start_video_thread(self, probe_result=None):
+        self.frame_mailbox.clear()
+        self.stream_info = None
+        self.video_thread = self._create_display_thread(self.video_url, self.frame_mailbox, probe_result)
+        self.video_thread.motion_detector = self.motion_detector
+        self.video_thread.start()
+
+    def set_stream_profile(self, profile):
+        """Switch the displayed stream between the grid and full-resolution profiles."""
+        if profile == self.stream_profile or not self.display:
+            return
+        self.stream_profile = profile
+        if profile == axis.GRID_PROFILE:
+            # Back in the grid the tile is about to shrink; pick its stream once it has.
+            self.restream_timer.start()
+        else:
+            self._switch_stream()
+
+    def _switch_stream(self):
+        """Re-request the display stream if its profile or tile size now asks for another url."""
+        url = self.profile_url(self.stream_profile)
+        if url == self.video_url or not self.video_thread:
+            self.video_url = url
+            return
+
+        self._discard_pending_thread()
+        self.video_url = url
+        self._pending_mailbox = FrameMailbox()
+        self._pending_thread = self._create_display_thread(url, self._pending_mailbox)
+        self._pending_thread.start()
+
+    def _promote_pending_thread(self):
+        old_thread = self.video_thread
+        self.video_thread = self._pending_thread
+        self.frame_mailbox = self._pending_mailbox
+        self._pending_thread = None
+        self._pending_mailbox = None
+        self.set_stream_info(self._pending_stream_info)
+        self._pending_stream_info = None
+        old_thread.motion_detector = None
+        self.video_thread.motion_detector = self.motion_detector
+
+        if old_thread.record_queue is not None:
+            # The recorder was fed by the display stream; hand it to the new record source.
+            old_thread.record_queue = None
+            self._record_source().record_queue = self._record_sink
+        self._retire_thread(old_thread)
+        self.logger.debug(f'{self.title}: switched to the {self.stream_profile} stream.')
+
+    def _discard_pending_thread(self):
+        if self._pending_thread:
+            self._retire_thread(self._pending_thread)
+        self._pending_thread = None
+        self._pending_mailbox = None
+        self._pending_stream_info = None
+
+    def _record_source(self):
+        """Capture thread feeding the recorder: the display stream, or a dedicated full-res one."""
+        if self.record_thread or self.dual_stream:
+            return self._ensure_record_thread()
+        return self.video_thread
+
+    def _ensure_record_thread(self):
+        # Once started, the record stream runs until recording stops, even if the
+        # panel is zoomed to the full-resolution profile meanwhile.
+        if not self.record_thread and self.record_url:
+            self.record_stream_info = None
+            self.record_thread = self._create_capture_thread(self.record_url, None)
+            self.record_thread.stream_opened.connect(self.set_record_stream_info)
+            if not self.display:
+                self.record_thread.video_error.connect(self.on_video_error)
+                self.record_thread.state_changed.connect(self.on_state_changed)
+                self.record_thread.motion_scored.connect(self.on_motion_scored)
+                self.record_thread.motion_detector = self.motion_detector
+            self.record_thread.start()
+        return self.record_thread
+
+    def pre_event_seconds(self):
+        if self.settings.value('recording/mode', 'encode') != 'encode':
+            return 0
+        return int(self.settings.value(f'device_{self.panel_index}/pre_event_seconds', DEFAULT_PRE_EVENT_SECONDS))
+
+    def sync_pre_event(self):
+        """Keep the camera's pre-event buffer open in the recording service while it is enabled."""
+        seconds = self.pre_event_seconds()
+        sink = self._pre_event_sink
+        if sink and not (seconds and sink.is_open):
+            # Disabled, or its encoder died: let it go.
+            self.recording_service.close(sink.recorder_id)
+            self._pre_event_sink = None
+            if self._record_sink is sink:
+                self._detach_record_sink()
+        if self._pre_event_sink or not (seconds and self.recording_service and self.record_url):
+            return
+
+        source = self._record_source()
+        if not source or not self.record_stream_info:
+            return  # called again once the record stream reports its geometry
+        width, height, fps = self.record_stream_info
+        budget = int(self.settings.value('recording/pre_event_mb', DEFAULT_PRE_EVENT_MB)) * 1024 * 1024
+        self._pre_event_sink = self.recording_service.open_buffer(
+            self.title, fps if fps > 1 else 25, width, height, seconds, budget, **self._queue_options()
+        )
+        if not self.recorder:
+            source.record_queue = self._record_sink = self._pre_event_sink
+
+    def sync_motion(self):
+        """Analyse the camera for motion while it has a motion sensitivity set."""
+        sensitivity = int(self.settings.value(f'device_{self.panel_index}/motion_sensitivity', 0))
+        self.motion_detector = MotionDetector(
+            sensitivity,
+            parse_zones(self.settings.value(f'device_{self.panel_index}/motion_zones', '')),
+            int(self.settings.value('motion/max_fps', DEFAULT_MAX_FPS)),
+        ) if sensitivity and self.stream_ip else None
+        if not self.display:
+            if self.motion_detector:
+                self._ensure_record_thread()
+            elif not self._record_sink and self.record_thread:
+                self._detach_record_sink()
+        watched = self._watched_thread()
+        if watched:
+            watched.motion_detector = self.motion_detector
+
+        if self.motion_detector:
+            self.motion_timer.start()
+        else:
+            self.motion_timer.stop()
+            if self.motion_recording:
+                self.stop_recording()
+
+    def on_motion_scored(self, score):
+        if self.sender() is not self._watched_thread() or not self.motion_detector:
+            return
+        if not self.motion_detector.is_motion(score):
+            return
+        self._last_motion = time.monotonic()
+        if not self._is_recording:
+            # The pre-event buffer, when enabled, supplies the pre-roll.
+            self.logger.info(f'{self.title}: motion ({score:.1%} of the zones), recording.')
+            self.start_recording_thread(motion=True)
+
+    def check_motion_post_roll(self):
+        post_roll = int(self.settings.value('motion/post_roll_seconds', DEFAULT_POST_ROLL_SECONDS))
+        if self.motion_recording and time.monotonic() - self._last_motion > post_roll:
+            self.logger.info(f'{self.title}: no motion for {post_roll}s, stopping.')
+            self.stop_recording()
+
+    def _queue_options(self):
+        return {
+            'queue_bytes': int(self.settings.value('recording/queue_mb', DEFAULT_QUEUE_MB)) * 1024 * 1024,
+            'overflow': self.settings.value('recording/overflow', DROP_OLDEST),
+        }
+
+    def _overlay_options(self):
+        return {
+            'position': self.settings.value('overlay/position', DEFAULT_POSITION),
+            'font_scale': float(self.settings.value('overlay/font_scale', DEFAULT_FONT_SCALE)),
+            'resolution': self.settings.value('overlay/resolution', 'minute'),
+        }
+
+    def _detach_record_sink(self):
+        for thread in (self.video_thread, self.record_thread):
+            if thread:
+                thread.record_queue = None
+        if self.record_thread and not (self.motion_detector and not self.display):
+            self._retire_thread(self.record_thread)
+            self.record_thread = None
+            self.record_stream_info = None
+            if not self.display:
+                self.stream_state = None
+        self._record_sink = None
+
+    def start_recording_thread(self, motion=False):
+        # Only a recording the detector started is stopped by the post-roll; starting by hand keeps it going.
+        self.motion_recording = motion
+        self._is_recording = True
+        if self.recorder:
+            return
+        if not self.record_url:
+            self.logger.warning("No video URL for recording.")
+            return
+
+        session_name = f"{self.title.replace(' ', '_')}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        session_dir = os.path.join(RECORDINGS_DIR, session_name)
+        segment_seconds = int(self.settings.value('recording/segment_minutes', DEFAULT_SEGMENT_MINUTES)) * 60
+
+        if self.settings.value('recording/mode', 'encode') == 'passthrough':
+            if ffmpeg_path():
+                self.recorder = PassthroughRecorder(self.title, session_dir, self.record_url, segment_seconds)
+                self.recorder.start()
+                self.logger.info(f"Started passthrough recording: {session_dir}")
+                return
+            self.logger.warning("ffmpeg not found, falling back to re-encoded recording.")
+
+        source = self._record_source()
+        if (not source) or (not self.record_stream_info):
+            self.logger.warning("No video capture for recording.")
+            return
+        if not self.recording_service:
+            self.logger.warning("No recording service to encode with.")
+            return
+
+        width, height, fps = self.record_stream_info
+        self.logger.debug(f'width: {width}, height: {height}, fps: {fps}')
+        if fps <= 1:
+            fps = 25  # fallback
+
+        self.logger.debug(f'fps: {fps}')
+        os.makedirs(session_dir, exist_ok=True)
+        self.recorder = self._record_sink = self.recording_service.start(
+            self.title, session_dir, fps, width, height, segment_seconds,
+            overlay=self._overlay_options(), **self._queue_options()
+        )
+        source.record_queue = self._record_sink
+        self.logger.info(f"Started recording: {session_dir}")
+
+    def stop_recording(self):
+        self._is_recording = False
+        self.motion_recording = False
+        if isinstance(self.recorder, PassthroughRecorder):
+            # ffmpeg finishes the file on the recorder's thread; keep it until it has.
+            self._retire_thread(self.recorder)
+        elif self.recorder:
+            self.recorder.stop()
+        self.recorder = None
+
+        if self._pre_event_sink and self._pre_event_sink.is_open:
+            # Keep feeding the buffer for the next event.
+            self._record_sink = self._pre_event_sink
+        else:
+            self._detach_record_sink()
+            self.sync_pre_event()
+
+        self.logger.info(f"Stopped recording: {self.title}")
+
+    def load_config(self):
+        ip_addbase = self.settings.value(f'device_{self.panel_index}/ip')
+        nickname = self.settings.value(f"device_{self.panel_index}/name")
+        self.logger.debug(f'Ip Address after refresh: {ip_addbase}')
+
+        self.stream_ip = ip_addbase if ip_addbase else None
+        self.video_url = self.profile_url(self.stream_profile) if self.display else None
+        self.record_url = self.profile_url(axis.FULL_PROFILE)
+        self.title = nickname if nickname else f'Panel {self.panel_index + 1}'
+
+    def refresh(self, probe_result=None):
+        """Reload the camera's settings and restart its streams."""
+        self._discard_pending_thread()
+        if self.video_thread:
+            # The old stream may still be opening; let it finish off the GUI thread,
+            # feeding nothing and showing nothing meanwhile.
+            self.video_thread.motion_detector = None
+            self.video_thread.record_queue = None
+            self._retire_thread(self.video_thread)
+            self.video_thread = None
+            self.logger.debug(f'{self.title}: {self.frame_mailbox.dropped} stale frames dropped by the display.')
+            self.frame_mailbox = FrameMailbox()
+
+        record_source = self.record_thread
+        if record_source:
+            self._retire_thread(record_source)
+            self.record_thread = None
+            self.record_stream_info = None
+
+        if self._pre_event_sink and not self.recorder:
+            # The camera or its settings may have changed; reopen the buffer for the new stream.
+            self.recording_service.close(self._pre_event_sink.recorder_id)
+            self._pre_event_sink = self._record_sink = None
+
+        self.load_config()
+
+        if self.video_url:
+            self.start_video_thread(probe_result)
+        if self._record_sink and self.record_url:
+            self._record_source().record_queue = self._record_sink
+        self.sync_pre_event()
+        self.sync_motion()
+
+    def status(self):
+        return {
+            'camera': self.title,
+            'ip': self.stream_ip,
+            'state': self.stream_state.value if self.stream_state else None,
+            # Armed: asked to record; recording: a recorder is actually running.
+            'armed': self._is_recording,
+            'recording': self.recorder is not None,
+            'motion_recording': self.motion_recording,
+            'motion_detection': self.motion_detector is not None,
+            'pre_event_seconds': self.pre_event_seconds() if self._pre_event_sink else 0,
+        }
+
+    def close(self):
+        self.motion_timer.stop()
+        self.restream_timer.stop()
+        if self._is_recording:
+            self.stop_recording()
+        for thread in (self.video_thread, self._pending_thread, self.record_thread, *self._retiring_threads):
+            if thread and thread.isRunning():
+                thread.stop()
+                thread.wait()
@@ -0,0 +1,146 @@
+import threading
+import time
+
+import cv2
+
+from app.services.logger import get_logger
+from app.services.safe_video_capture import open_capture
+from app.services.stream_health import Backoff, StreamState
+from app.services.stream_info import StreamInfo
+
+STALL_TIMEOUT = 5.0
+OFFLINE_AFTER = 5
+WATCHDOG_INTERVAL = 0.5
+
+
+class CaptureLoop:
+    """
+    Self-healing read loop shared by the thread and process capture backends.
+
+    The stream moves through ``StreamState``: CONNECTING on the first open, LIVE
+    while frames arrive, STALLED when no frame has arrived for a moment (either
+    reads fail or a read blocks, which the watchdog catches), RECONNECTING after
+    ``stall_timeout`` without frames, and OFFLINE once ``offline_after``
+    reconnects in a row have failed. Reconnects never give up; they just back
+    off up to the backoff's maximum delay.
+
+    The loop knows nothing about Qt or shared memory: backends plug in through
+    the ``on_opened(StreamInfo)``, ``on_frame(frame, timestamp)`` and
+    ``on_state(StreamState)`` callbacks. When ``wants_frame(timestamp)`` says
+    nobody needs the next frame (expected about one frame interval from now), it
+    is only grabbed: the session stays alive and healthy, but the frame is never
+    converted to BGR nor handed over.
+    """
+
+    def __init__(self, video_source, probe_result=None, on_opened=None, on_frame=None, on_state=None,
+                 backoff: Backoff | None = None, stall_timeout=STALL_TIMEOUT, offline_after=OFFLINE_AFTER,
+                 wants_frame=None):
+        self.video_source = video_source
+        self.probe_result = probe_result
+        self.on_opened = on_opened
+        self.on_frame = on_frame
+        self.on_state = on_state
+        self.wants_frame = wants_frame
+        self.backoff = backoff or Backoff()
+        self.stall_timeout = stall_timeout
+        self.offline_after = offline_after
+
+        self.state = None
+        self.reconnects = 0
+        self.last_frame_time = None
+        self._state_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self.logger = get_logger('CaptureLoop')
+
+    def _set_state(self, state):
+        with self._state_lock:
+            if state == self.state:
+                return
+            self.state = state
+        self.logger.debug(f'{self.video_source}: {state.value}')
+        if self.on_state:
+            self.on_state(state)
+
+    def _watchdog(self):
+        # A read that blocks never returns an error, so flag the stall from outside the loop.
+        while not self._stop_event.wait(WATCHDOG_INTERVAL):
+            last = self.last_frame_time
+            if self.state == StreamState.LIVE and last and time.monotonic() - last > self.stall_timeout / 2:
+                self._set_state(StreamState.STALLED)
+
+    def run(self):
+        watchdog = threading.Thread(target=self._watchdog, name='CaptureWatchdog', daemon=True)
+        watchdog.start()
+        failures = 0
+        probe_result = self.probe_result
+        try:
+            while not self._stop_event.is_set():
+                if self.state is None:
+                    self._set_state(StreamState.CONNECTING)
+                elif self.state != StreamState.OFFLINE:
+                    # An offline camera stays offline through its retries, until one opens.
+                    self._set_state(StreamState.RECONNECTING)
+                cap = open_capture(self.video_source, timeout=self.stall_timeout, probe_result=probe_result,
+                                   read_timeout=self.stall_timeout)
+                probe_result = None  # only trust a pre-computed probe for the first attempt
+                if not cap:
+                    failures += 1
+                    if failures >= self.offline_after:
+                        self._set_state(StreamState.OFFLINE)
+                    delay = self.backoff.next()
+                    self.logger.info(f'Could not open {self.video_source}, retrying in {delay:.1f}s')
+                    self._stop_event.wait(delay)
+                    continue
+
+                try:
+                    failures = 0
+                    self.backoff.reset()
+                    self._read_frames(cap)
+                finally:
+                    cap.release()
+
+                if not self._stop_event.is_set():
+                    self.reconnects += 1
+                    self._stop_event.wait(self.backoff.next())
+        finally:
+            self._stop_event.set()
+
+    def _read_frames(self, cap):
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 0)
+        if self.on_opened:
+            self.on_opened(StreamInfo(
+                int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                cap.get(cv2.CAP_PROP_FPS)
+            ))
+
+        self.last_frame_time = time.monotonic()
+        frame_interval = 0
+        while not self._stop_event.is_set():
+            # Ask about the frame the read will return, not about now: a rate cap
+            # decides on its timestamp.
+            if self.wants_frame is None or self.wants_frame(time.time() + frame_interval):
+                ret, frame = cap.read()
+            else:
+                ret, frame = cap.grab(), None
+            now = time.monotonic()
+            if not ret:
+                if now - self.last_frame_time >= self.stall_timeout:
+                    self.logger.warning(f'No frames from {self.video_source} for {self.stall_timeout}s, reconnecting.')
+                    return
+                self._set_state(StreamState.STALLED)
+                self._stop_event.wait(0.05)
+                continue
+
+            frame_interval += (min(now - self.last_frame_time, 1) - frame_interval) / 8
+            self.last_frame_time = now
+            self._set_state(StreamState.LIVE)
+            if frame is not None:
+                self.on_frame(frame, time.time())
+
+    def stop(self):
+        self._stop_event.set()
+
+    @property
+    def stopped(self):
+        return self._stop_event.is_set()
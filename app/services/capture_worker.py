@@ -0,0 +1,145 @@
+import queue
+import threading
+
+from app.services.capture_loop import CaptureLoop
+from app.services.frame_pacer import FramePacer
+from app.services.frame_prep import prepare_display_frame
+from app.services.logger import get_logger
+from app.services.shm_frame_ring import ShmFrameRing
+from app.services.stream_info import StreamInfo
+
+
+class _WorkerSession:
+    """Worker-side state: the rings the parent handed over, the current display size and rate."""
+
+    def __init__(self, conn, loop_factory):
+        self.conn = conn
+        self.send_lock = threading.Lock()
+        self.control = queue.SimpleQueue()
+        self.display_ring = None
+        self.record_ring = None
+        self.display_size = None
+        self.display_fps = None   # display frames a second the parent wants: None for all, 0 for none
+        self.display_pacer = FramePacer()
+        self.stream_info = None
+        self.loop = loop_factory(self)
+
+    def send(self, message):
+        # The capture loop's watchdog reports state from its own thread.
+        with self.send_lock:
+            self.conn.send(message)
+
+    def listen(self):
+        """Read parent messages on a side thread so 'stop' also interrupts reconnect backoff."""
+        try:
+            while True:
+                message = self.conn.recv()
+                if message[0] == 'stop':
+                    break
+                self.control.put(message)
+        except (EOFError, OSError):
+            pass
+        self.loop.stop()
+
+    def apply_control(self):
+        while True:
+            try:
+                message = self.control.get_nowait()
+            except queue.Empty:
+                return
+            kind = message[0]
+            if kind == 'ring':
+                if self.display_ring:
+                    self.display_ring.close()
+                self.display_ring = ShmFrameRing.attach(message[1])
+            elif kind == 'record_ring':
+                if self.record_ring:
+                    self.record_ring.close()
+                self.record_ring = ShmFrameRing.attach(message[1]) if message[1] else None
+            elif kind == 'display_size':
+                self.display_size = message[1:]
+            elif kind == 'display_fps':
+                self.display_fps = message[1]
+                self.display_pacer.set_rate(message[1])
+
+    def _display_due(self, timestamp):
+        if not self.display_ring or self.display_fps == 0:
+            return False
+        return self.display_pacer.due(timestamp)
+
+    def wants_frame(self, timestamp):
+        # Neither recorded nor due on screen: the capture loop only grabs it.
+        self.apply_control()
+        return self.record_ring is not None or self._display_due(timestamp)
+
+    def on_opened(self, info):
+        self.stream_info = info
+        if self.display_ring:
+            # (Re)connected: wait for the parent to confirm rings that fit this stream.
+            self.display_ring.close()
+            self.display_ring = None
+        self.send(('opened', *info))
+
+    def on_frame(self, frame, timestamp):
+        self.apply_control()
+
+        height, width = frame.shape[:2]
+        if (width, height) != self.stream_info[:2]:
+            # The stream changed resolution; let the parent reallocate the rings.
+            self.on_opened(StreamInfo(width, height, self.stream_info.fps))
+
+        if self._display_due(timestamp) and self.display_pacer.admit(timestamp):
+            display_frame = prepare_display_frame(frame, self.display_size)
+            if self.display_ring.fits(display_frame):
+                slot, seq = self.display_ring.publish(display_frame, timestamp)
+                self.send(('frame', slot, seq))
+
+        if self.record_ring and self.record_ring.fits(frame):
+            slot, seq = self.record_ring.publish(frame, timestamp)
+            self.send(('record_frame', slot, seq))
+
+    def on_state(self, state):
+        self.send(('state', state.value))
+
+    def close(self):
+        for ring in (self.display_ring, self.record_ring):
+            if ring:
+                ring.close()
+
+
+def capture_worker(video_source, conn, probe_result=None):
+    """
+    Decode loop run in a dedicated process by ``ProcessCaptureThread``.
+
+    The worker runs the shared ``CaptureLoop`` (so it reconnects on its own),
+    reports the stream geometry and waits for the parent to allocate
+    shared-memory rings big enough for it. Every decoded frame is then resized
+    to the panel's display size and published into the display ring; while
+    recording, the full frame also goes into the record ring (a record-only
+    capture never gets a display ring). The parent caps the display rate, lower
+    still while the panel is hidden, and frames nobody wants are only grabbed. Only
+    ``(slot, seq)`` notifications cross the pipe.
+    """
+    logger = get_logger('CaptureWorker')
+    session = _WorkerSession(conn, lambda s: CaptureLoop(
+        video_source,
+        probe_result=probe_result,
+        on_opened=s.on_opened,
+        on_frame=s.on_frame,
+        on_state=s.on_state,
+        wants_frame=s.wants_frame
+    ))
+    threading.Thread(target=session.listen, name='CaptureWorkerControl', daemon=True).start()
+    try:
+        session.loop.run()
+    except (EOFError, BrokenPipeError):
+        pass
+    except Exception as e:
+        logger.exception(f'Exception in capture worker: {e}')
+        try:
+            session.send(('error', str(e)))
+        except (EOFError, BrokenPipeError):
+            pass
+    finally:
+        session.close()
+        conn.close()
@@ -0,0 +1,111 @@
+import json
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from PySide6.QtCore import QObject
+from PySide6.QtNetwork import QHostAddress, QTcpServer
+
+from app.services.logger import get_logger
+
+DEFAULT_PORT = 8765
+MAX_REQUEST_BYTES = 8192
+
+
+class ControlServer(QObject):
+    """
+    Minimal HTTP/JSON control API served from the Qt event loop, so handlers run on the main thread.
+
+    ``routes`` maps ``(method, path)`` to a callable taking the query parameters
+    (a dict of single values) and returning ``(HTTPStatus, JSON-serialisable body)``.
+    Only request lines and headers are read; bodies are ignored. It listens on
+    localhost unless told otherwise and has no authentication, so anything a
+    browser sends is refused: requests with an ``Origin`` header (which every
+    cross-site POST carries), and requests for another ``Host``, which is how a
+    DNS-rebound page would reach it.
+    """
+
+    def __init__(self, routes, port=DEFAULT_PORT, host=QHostAddress.LocalHost, parent=None):
+        super().__init__(parent)
+        self.logger = get_logger('ControlServer')
+        self.routes = routes
+        self._buffers = {}
+        self.server = QTcpServer(self)
+        self.server.newConnection.connect(self._on_new_connection)
+        if not self.server.listen(QHostAddress(host), port):
+            raise OSError(f'Could not listen on port {port}: {self.server.errorString()}')
+        self.logger.info(f'Control API on http://{self.server.serverAddress().toString()}:{self.server.serverPort()}')
+
+    @property
+    def port(self):
+        return self.server.serverPort()
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self._buffers[socket] = b''
+            socket.readyRead.connect(lambda s=socket: self._on_ready_read(s))
+            socket.disconnected.connect(lambda s=socket: self._forget(s))
+
+    def _forget(self, socket):
+        self._buffers.pop(socket, None)
+        socket.deleteLater()
+
+    def _on_ready_read(self, socket):
+        if socket not in self._buffers:
+            return
+        data = self._buffers[socket] + bytes(socket.readAll())
+        if b'\r\n\r\n' not in data and b'\n\n' not in data:
+            if len(data) > MAX_REQUEST_BYTES:
+                self._respond(socket, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, {'error': 'request too large'})
+            else:
+                self._buffers[socket] = data
+            return
+        del self._buffers[socket]
+        lines = data.replace(b'\r\n', b'\n').split(b'\n\n', 1)[0].decode('latin-1').split('\n')
+        try:
+            method, target, _ = lines[0].strip().split(' ', 2)
+        except ValueError:
+            self._respond(socket, HTTPStatus.BAD_REQUEST, {'error': 'bad request line'})
+            return
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        if 'origin' in headers or not self._is_local_host(headers.get('host')):
+            self._respond(socket, HTTPStatus.FORBIDDEN, {'error': 'browser requests are not accepted'})
+            return
+        self._respond(socket, *self._dispatch(method.upper(), target))
+
+    def _is_local_host(self, host):
+        if host is None:
+            return True   # HTTP/1.0 clients may leave it out; browsers never do
+        if host.startswith('['):
+            host = host[1:].split(']', 1)[0]
+        elif host.count(':') == 1:
+            host = host.split(':', 1)[0]
+        return host.lower() in ('localhost', '127.0.0.1', '::1', self.server.serverAddress().toString())
+
+    def _dispatch(self, method, target):
+        url = urlsplit(target)
+        handler = self.routes.get((method, url.path.rstrip('/') or '/'))
+        if handler is None:
+            if any(path == url.path for _, path in self.routes):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f'{method} not allowed'}
+            return HTTPStatus.NOT_FOUND, {'error': f'no such endpoint: {url.path}'}
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            return handler(query)
+        except (KeyError, ValueError) as e:
+            return HTTPStatus.BAD_REQUEST, {'error': str(e)}
+
+    def _respond(self, socket, status, body):
+        payload = json.dumps(body, default=str).encode()
+        header = (f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+                  'Content-Type: application/json\r\n'
+                  f'Content-Length: {len(payload)}\r\n'
+                  'Connection: close\r\n\r\n').encode()
+        socket.write(header + payload)
+        socket.disconnectFromHost()
+
+    def close(self):
+        self.server.close()
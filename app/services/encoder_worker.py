@@ -0,0 +1,326 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from app.services.activity_index import ActivityWriter, activity_index_path
+from app.services.frame_encoder import FrameEncoder
+from app.services.frame_index import FrameIndexWriter, frame_index_path
+from app.services.frame_overlay import FrameOverlay
+from app.services.logger import get_logger
+from app.services.pre_event_buffer import PreEventBuffer, decode_jpeg, encode_jpeg
+from app.services.session_manifest import SEGMENT_PATTERN, SessionManifest
+from app.services.shm_frame_ring import ShmFrameRing
+
+STATS_INTERVAL = 1.0
+# Longer gaps mean the stream was down; they are not filled with a frozen picture.
+MAX_FILL_SECONDS = 5
+
+
+class _Session:
+    """
+    One recording: frames encoded into fixed-length segments listed in its manifest.
+
+    The output runs at a constant ``fps`` on the capture clock. A frame that
+    arrives more than a frame interval late is preceded by copies of the last
+    one, and one that arrives more than an interval early is skipped, so an hour
+    of recording plays back as an hour. Each segment has a frame index sidecar
+    with the capture time of every frame in it, and an activity sidecar with a
+    motion score for every second.
+    """
+
+    def __init__(self, session_dir, fps, size, overlay, segment_seconds, started_at):
+        self.fps = fps
+        self.size = size
+        self.overlay = overlay
+        self.segment_frames = max(1, round(segment_seconds * fps)) if segment_seconds else None
+        self.manifest = SessionManifest(session_dir, overlay.title, 'encode',
+                                        started_at=datetime.fromtimestamp(started_at).isoformat())
+        self.encoder = None
+        self.index = None
+        self.activity = None
+        self.segment_written = 0
+        self.frames = 0
+        self.duplicated = 0
+        self.skipped = 0
+        self.encode_seconds = 0.0
+        self._origin = None     # capture time of output frame 0
+        self._last = None       # (stamped frame, capture time) of the latest frame written
+        self._releasing = []
+        self._open_segment(started_at)
+
+    def _open_segment(self, started_at):
+        filename = SEGMENT_PATTERN.format(len(self.manifest.segments))
+        path = os.path.join(self.manifest.directory, filename)
+        encoder = FrameEncoder(path, self.fps, *self.size, self.overlay)
+        if self.encoder:
+            # Finishing the old file (writing its index) happens off the encode path,
+            # so rotation costs no frames.
+            self.manifest.finish_segment(self.segment_written / self.fps)
+            releaser = threading.Thread(target=self._release, args=(self.encoder, self.index, self.activity))
+            releaser.start()
+            self._releasing.append(releaser)
+        self.encoder = encoder
+        self.index = FrameIndexWriter(frame_index_path(path), self.fps, started_at)
+        self.activity = ActivityWriter(activity_index_path(path))
+        self.segment_written = 0
+        self.manifest.add_segment(filename, datetime.fromtimestamp(started_at))
+        self.manifest.save()
+
+    @staticmethod
+    def _release(encoder, index, activity):
+        encoder.release()
+        index.close()
+        activity.close()
+
+    def write(self, frame, timestamp):
+        if self._origin is None:
+            self._origin = timestamp
+        behind = round((timestamp - self._origin) * self.fps) - self.frames
+        if behind <= -2:
+            self.skipped += 1
+            return
+        if behind > MAX_FILL_SECONDS * self.fps:
+            self._origin = timestamp - self.frames / self.fps
+        elif behind >= 2:
+            for _ in range(behind):
+                self._write(None, self._last[1])
+            self.duplicated += behind
+
+        self._write(frame, timestamp)
+
+    def _write(self, frame, timestamp):
+        """Write ``frame``, or repeat the last one when it is None."""
+        if self.segment_frames and self.segment_written >= self.segment_frames:
+            self._open_segment(timestamp)
+        started = time.perf_counter()
+        if frame is None:
+            self.encoder.repeat(self._last[0])
+        else:
+            # Scored before the overlay, whose clock would count as motion.
+            self.activity.add(frame, int(self.segment_written / self.fps), timestamp)
+            self._last = (self.encoder.write(frame, timestamp), timestamp)
+        self.encode_seconds += time.perf_counter() - started
+        self.index.append(timestamp)
+        self.segment_written += 1
+        self.frames += 1
+
+    def close(self):
+        self._release(self.encoder, self.index, self.activity)
+        for releaser in self._releasing:
+            releaser.join()
+        self.manifest.finish_segment(self.segment_written / self.fps)
+        self.manifest.finish()
+        self.manifest.save()
+
+
+class _Channel:
+    """
+    A panel's frames from ``ring``: kept in the pre-event buffer while idle,
+    encoded into a session while recording.
+    """
+
+    def __init__(self, ring, fps, width, height, panel_name, pre_event_seconds, pre_event_bytes):
+        self.ring = ring
+        self.fps = fps
+        self.size = (width, height)
+        self.panel_name = panel_name
+        self.pre_event = PreEventBuffer(pre_event_seconds, pre_event_bytes) if pre_event_seconds else None
+        self.max_backlog_bytes = pre_event_bytes
+        self.session = None
+        self.backlog = deque()
+        self.backlog_bytes = 0
+        self.dropped = 0
+        self.lag = 0.0
+
+    def start_session(self, session_dir, segment_seconds, overlay_options, fields):
+        if self.pre_event:
+            # The buffered seconds become a write-behind backlog that the encoder
+            # works through ahead of the live frames, so starting never waits.
+            self.backlog = self.pre_event.drain()
+            self.backlog_bytes = sum(data.nbytes for _, data in self.backlog)
+        started_at = self.backlog[0][0] if self.backlog else time.time()
+        self.dropped = 0
+        self.lag = 0.0
+        overlay = FrameOverlay(self.panel_name, **(overlay_options or {}))
+        for name, value in fields.items():
+            overlay.set_field(name, value)
+        self.session = _Session(session_dir, self.fps, self.size, overlay, segment_seconds, started_at)
+
+    def on_frame(self, slot, seq):
+        frame = self.ring.copy(slot, seq)
+        self.ring.mark_read(seq)
+        if frame is None:
+            # The capture side lapped us while this notification was queued.
+            self.dropped += 1
+            return
+        timestamp = self.ring.timestamp(slot)
+
+        if self.session is None:
+            if self.pre_event:
+                self.pre_event.put(frame, timestamp)
+        elif self.backlog:
+            data = encode_jpeg(frame)
+            if data is None or self.backlog_bytes + data.nbytes > self.max_backlog_bytes:
+                self.dropped += 1
+                return
+            self.backlog.append((timestamp, data))
+            self.backlog_bytes += data.nbytes
+        else:
+            self.session.write(frame, timestamp)
+            self.lag = time.time() - timestamp
+
+    def write_backlog(self):
+        if self.session is None or not self.backlog:
+            return
+        timestamp, data = self.backlog.popleft()
+        self.backlog_bytes -= data.nbytes
+        self.session.write(decode_jpeg(data), timestamp)
+        self.lag = time.time() - timestamp
+
+    def finish_session(self):
+        while self.backlog:
+            self.write_backlog()
+        stats = self.stats()
+        self.session.close()
+        self.session = None
+        return stats
+
+    def stats(self):
+        session = self.session
+        frames = session.frames if session else 0
+        buffered = self.pre_event.nbytes if self.pre_event else 0
+        return {
+            'frames': frames,
+            'dropped': self.dropped,
+            'segments': len(session.manifest.segments) if session else 0,
+            'duplicated': session.duplicated if session else 0,
+            'skipped': session.skipped if session else 0,
+            'encode_ms': round(1000 * session.encode_seconds / frames, 2) if frames else 0.0,
+            'lag_ms': round(1000 * self.lag),
+            'buffer_bytes': buffered + self.backlog_bytes,
+            'buffer_seconds': round(float(self.pre_event.duration), 1) if self.pre_event else 0.0,
+        }
+
+    def close(self):
+        if self.session:
+            self.finish_session()
+        self.ring.close()
+
+    def abort(self):
+        """Close after an error: finish the segment being written and drop the backlog."""
+        self.backlog.clear()
+        self.backlog_bytes = 0
+        try:
+            if self.session:
+                self.session.close()
+        finally:
+            self.session = None
+            self.ring.close()
+
+
+def encoder_worker(commands, events):
+    """
+    Encoder process run by ``RecordingService``.
+
+    One worker hosts any number of panel channels. Each channel keeps its
+    pre-event buffer while idle and, while recording, writes a session of
+    fixed-length segments. Frames never travel through the queues: the GUI
+    process publishes them into a per-channel shared-memory ring and only sends
+    ``(slot, seq)``. A worker that falls behind finds those slots already
+    overwritten and counts the frames as dropped, so a slow encoder loses
+    frames instead of building up an unbounded backlog. A channel that raises
+    (a bad frame, a full disk on rotation) is closed and reported as failed on
+    its own; the worker keeps encoding the others.
+    """
+    logger = get_logger('EncoderWorker')
+    channels = {}
+    fields = {}
+    last_stats = time.monotonic()
+
+    def fail(channel_id, error):
+        logger.warning(f'Recording channel {channel_id} failed: {error!r}')
+        channel = channels.pop(channel_id, None)
+        if channel:
+            try:
+                channel.abort()
+            except Exception as e:
+                logger.warning(f'Could not finish recording channel {channel_id}: {e!r}')
+        events.put(('failed', channel_id, str(error)))
+
+    while True:
+        backlog = any(channel.backlog for channel in channels.values())
+        try:
+            message = commands.get_nowait() if backlog else commands.get(timeout=STATS_INTERVAL)
+        except queue.Empty:
+            message = None
+
+        if message:
+            kind, channel_id = message[0], message[1] if len(message) > 1 else None
+            channel = channels.get(channel_id)
+            if kind == 'exit':
+                break
+            elif kind == 'frame':
+                if channel:
+                    try:
+                        channel.on_frame(*message[2:])
+                    except Exception as e:
+                        fail(channel_id, e)
+            elif kind == 'open':
+                try:
+                    channels[channel_id] = _Channel(ShmFrameRing.attach(message[2]), *message[3:])
+                except Exception as e:
+                    logger.warning(f'Could not open recording channel {channel_id}: {e}')
+                    events.put(('failed', channel_id, str(e)))
+            elif kind == 'field':
+                # Overlay fields shared by every recording in this worker.
+                name, value = message[2:]
+                fields[name] = value
+                for channel in channels.values():
+                    if channel.session:
+                        channel.session.overlay.set_field(name, value)
+            elif kind == 'record' and channel:
+                session_dir, segment_seconds, overlay_options = message[2:]
+                try:
+                    channel.start_session(session_dir, segment_seconds, overlay_options, fields)
+                    events.put(('started', channel_id))
+                except Exception as e:
+                    logger.warning(f'Could not start recording {session_dir}: {e}')
+                    events.put(('failed', channel_id, str(e)))
+            elif kind == 'stop' and channel and channel.session:
+                try:
+                    events.put(('stopped', channel_id, channel.finish_session()))
+                except Exception as e:
+                    fail(channel_id, e)
+            elif kind == 'close' and channel:
+                try:
+                    channel.close()
+                except Exception as e:
+                    fail(channel_id, e)
+                else:
+                    channels.pop(channel_id)
+                    events.put(('closed', channel_id))
+
+        # Interleave the pre-event backlog with live frames, one backlog frame per pass.
+        for channel_id, channel in list(channels.items()):
+            try:
+                channel.write_backlog()
+            except Exception as e:
+                fail(channel_id, e)
+
+        if time.monotonic() - last_stats >= STATS_INTERVAL:
+            last_stats = time.monotonic()
+            for channel_id, channel in channels.items():
+                events.put(('stats', channel_id, channel.stats()))
+
+    for channel_id, channel in list(channels.items()):
+        try:
+            if channel.session:
+                events.put(('stopped', channel_id, channel.finish_session()))
+            channel.close()
+        except Exception as e:
+            fail(channel_id, e)
+        else:
+            events.put(('closed', channel_id))
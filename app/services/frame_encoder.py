@@ -0,0 +1,32 @@
+import cv2
+
+from app.services.frame_overlay import FrameOverlay
+
+
+class FrameEncoder:
+    """``cv2.VideoWriter`` that burns ``overlay`` (camera name, capture time, ...) into every frame."""
+
+    def __init__(self, output_path, fps, width, height, overlay: FrameOverlay):
+        self.output_path = output_path
+        self.width = width
+        self.height = height
+        self.overlay = overlay
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        self.writer = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+        if not self.writer.isOpened():
+            raise OSError(f'Could not open {output_path} for writing')
+
+    def write(self, frame, timestamp=None):
+        """Stamp and write ``frame``; returns the stamped frame so it can be repeated."""
+        if frame.shape[:2] != (self.height, self.width):
+            # The stream reconnected at another resolution; keep the file consistent.
+            frame = cv2.resize(frame, (self.width, self.height))
+        frame = self.overlay.apply(frame, timestamp)
+        self.writer.write(frame)
+        return frame
+
+    def repeat(self, stamped_frame):
+        self.writer.write(stamped_frame)
+
+    def release(self):
+        self.writer.release()
@@ -0,0 +1,44 @@
+class FrameMailbox:
+    """
+    Single-slot, latest-frame-wins hand-off between a capture thread and the GUI.
+
+    The capture thread overwrites the slot with every new frame and the GUI pulls
+    the newest one on its own display tick. Publishing is a single reference
+    assignment, which is atomic under the GIL, so neither side ever takes a lock
+    or waits on the other. Frames that are overwritten before the GUI gets to
+    them are counted in ``dropped`` instead of being queued.
+    """
+
+    def __init__(self):
+        self._slot = None  # (sequence, frame)
+        self._published = 0
+        self._taken = 0
+        self.dropped = 0
+
+    def put(self, frame):
+        """Publish a frame. Called from the capture thread only."""
+        self._published += 1
+        self._slot = (self._published, frame)
+
+    def take(self):
+        """Return the newest unseen frame, or None. Called from the GUI thread only."""
+        slot = self._slot
+        if slot is None:
+            return None
+
+        seq, frame = slot
+        if seq <= self._taken:
+            return None
+
+        self.dropped += seq - self._taken - 1
+        self._taken = seq
+        return frame
+
+    def clear(self):
+        self._slot = None
+        self._published = 0
+        self._taken = 0
+
+    @property
+    def published(self):
+        return self._published
@@ -0,0 +1,76 @@
+import time
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+POSITIONS = ('top-left', 'top-right', 'bottom-left', 'bottom-right')
+DEFAULT_POSITION = 'top-left'
+DEFAULT_FONT_SCALE = 1.0
+TIME_FORMATS = {'minute': ('%y-%m-%d %H:%M', 60), 'second': ('%y-%m-%d %H:%M:%S', 1)}
+MARGIN = 10
+_FONT = cv2.FONT_HERSHEY_PLAIN
+_PAD = 3
+
+
+class FrameOverlay:
+    """
+    Camera name, capture time and extra fields (battery, GPS, ...) burned into recorded frames.
+
+    The text is rasterised into a small alpha mask (white text) only when what it
+    says changes, which with the default minute resolution is once a minute.
+    Every other frame just blends white through that mask onto the few rows and
+    columns it covers.
+    """
+
+    def __init__(self, title, position=DEFAULT_POSITION, font_scale=DEFAULT_FONT_SCALE, resolution='minute'):
+        self.title = title
+        self.position = position if position in POSITIONS else DEFAULT_POSITION
+        self.font_scale = float(font_scale)
+        self.time_format, self._period = TIME_FORMATS.get(resolution, TIME_FORMATS['minute'])
+        self.fields = {}
+        self._key = None
+        self._alpha = None      # alpha mask of the white text, repeated per colour channel
+
+    def set_field(self, name, value):
+        """Show ``value`` after the time; None removes the field."""
+        if value is None:
+            self.fields.pop(name, None)
+        else:
+            self.fields[name] = str(value)
+        self._key = None
+
+    def text(self, timestamp=None):
+        captured = datetime.fromtimestamp(timestamp) if timestamp else datetime.now()
+        return ' '.join([self.title, captured.strftime(self.time_format), *self.fields.values()])
+
+    def _render(self, text):
+        thickness = max(1, round(self.font_scale))
+        (width, height), baseline = cv2.getTextSize(text, _FONT, self.font_scale, thickness)
+        alpha = np.zeros((height + baseline + 2 * _PAD, width + 2 * _PAD), np.uint8)
+        cv2.putText(alpha, text, (_PAD, _PAD + height), _FONT, self.font_scale, 255, thickness, cv2.LINE_AA)
+
+        self._alpha = cv2.merge([alpha, alpha, alpha])
+
+    def _origin(self, frame_width, frame_height):
+        tile_height, tile_width = self._alpha.shape[:2]
+        x = MARGIN if self.position.endswith('left') else frame_width - tile_width - MARGIN
+        y = MARGIN if self.position.startswith('top') else frame_height - tile_height - MARGIN
+        return max(0, x), max(0, y)
+
+    def apply(self, frame, timestamp=None):
+        """Blend the overlay into ``frame`` and return it; read-only frames are copied first."""
+        timestamp = timestamp or time.time()
+        key = int(timestamp // self._period)
+        if key != self._key:
+            self._render(self.text(timestamp))
+            self._key = key
+        if not frame.flags.writeable:
+            frame = frame.copy()
+
+        x, y = self._origin(frame.shape[1], frame.shape[0])
+        roi = frame[y:y + self._alpha.shape[0], x:x + self._alpha.shape[1]]
+        alpha = self._alpha[:roi.shape[0], :roi.shape[1]]
+        # The text is white, so blending reduces to roi + (255 - roi) * alpha / 255.
+        cv2.add(roi, cv2.multiply(cv2.bitwise_not(roi), alpha, scale=1 / 255), dst=roi)
+        return frame
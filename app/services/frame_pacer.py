@@ -0,0 +1,31 @@
+DEFAULT_DISPLAY_FPS = 15
+
+
+class FramePacer:
+    """
+    Lets at most ``max_fps`` frames a second through, evenly spread; without a rate every frame passes.
+
+    A frame may come a quarter of an interval early, so that on a jittery stream a
+    cap that divides the camera's rate keeps every n-th frame rather than falling
+    to the next lower rate.
+    """
+
+    def __init__(self, max_fps=None):
+        self.interval = 0
+        self._next_time = 0
+        self.set_rate(max_fps)
+
+    def set_rate(self, max_fps):
+        self.interval = 1 / max_fps if max_fps else 0
+        self._next_time = 0
+
+    def due(self, timestamp):
+        """Whether ``admit()`` would let a frame taken at ``timestamp`` through."""
+        return timestamp >= self._next_time - self.interval / 4
+
+    def admit(self, timestamp):
+        if not self.due(timestamp):
+            return False
+        # Keep the cadence, but don't let a pause bank frames for a burst.
+        self._next_time = max(self._next_time, timestamp - self.interval / 2) + self.interval
+        return True
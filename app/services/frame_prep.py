@@ -0,0 +1,28 @@
+import cv2
+
+
+def fit_size(width, height, target_size):
+    """Largest (w, h) with the frame's aspect ratio that fits inside ``target_size``."""
+    target_width, target_height = target_size
+    scale = min(target_width / width, target_height / height)
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+def prepare_display_frame(frame, target_size):
+    """
+    Resize a BGR frame to the size it will be shown at, keeping its aspect ratio.
+
+    Runs in the capture worker so the GUI thread only has to wrap the result in a
+    ``QImage.Format_BGR888`` and blit it. Returns the frame untouched when no
+    target is known yet or it already has the right size.
+    """
+    if not target_size or target_size[0] <= 0 or target_size[1] <= 0:
+        return frame
+
+    height, width = frame.shape[:2]
+    size = fit_size(width, height, target_size)
+    if size == (width, height):
+        return frame
+
+    interpolation = cv2.INTER_AREA if size[0] < width else cv2.INTER_LINEAR
+    return cv2.resize(frame, size, interpolation=interpolation)
@@ -0,0 +1,98 @@
+import bisect
+import os
+import struct
+
+import numpy as np
+
+_CONTAINERS = {b'moov', b'trak', b'mdia', b'minf', b'stbl'}
+
+
+def _boxes(f, start, end):
+    """``(type, payload start, box end)`` of the MP4 boxes between ``start`` and ``end``."""
+    position = start
+    while position + 8 <= end:
+        f.seek(position)
+        size, kind = struct.unpack('>I4s', f.read(8))
+        header = 8
+        if size == 1:
+            size = struct.unpack('>Q', f.read(8))[0]
+            header = 16
+        elif size == 0:
+            size = end - position
+        if size < header:
+            return
+        yield kind, position + header, position + size
+        position += size
+
+
+def _find(f, start, end, kind):
+    return next(((a, b) for k, a, b in _boxes(f, start, end) if k == kind), None)
+
+
+class KeyframeIndex:
+    """Positions (ms) and frame numbers of a video's keyframes, read from the MP4 sample tables."""
+
+    def __init__(self, times_ms, frames, duration_ms):
+        self.times = times_ms
+        self.frames = frames
+        self.duration = duration_ms
+
+    @classmethod
+    def load(cls, path):
+        """Index of the video track in ``path``, or None if it has no ``moov`` yet (still recording) or isn't MP4."""
+        try:
+            with open(path, 'rb') as f:
+                return cls._parse(f, os.fstat(f.fileno()).st_size)
+        except (OSError, struct.error, ValueError):
+            return None
+
+    @classmethod
+    def _parse(cls, f, size):
+        moov = _find(f, 0, size, b'moov')
+        if not moov:
+            return None
+        for kind, start, end in _boxes(f, *moov):
+            if kind != b'trak':
+                continue
+            mdia = _find(f, start, end, b'mdia')
+            hdlr = mdia and _find(f, *mdia, b'hdlr')
+            if not hdlr:
+                continue
+            f.seek(hdlr[0] + 8)
+            if f.read(4) != b'vide':
+                continue
+
+            mdhd = _find(f, *mdia, b'mdhd')
+            f.seek(mdhd[0])
+            version = f.read(1)[0]
+            f.seek(mdhd[0] + (20 if version else 12))
+            timescale = struct.unpack('>I', f.read(4))[0]
+            stbl = _find(f, *mdia, b'minf')
+            stbl = stbl and _find(f, *stbl, b'stbl')
+            stts = stbl and _find(f, *stbl, b'stts')
+            if not (timescale and stts):
+                return None
+
+            f.seek(stts[0] + 4)
+            count = struct.unpack('>I', f.read(4))[0]
+            runs = np.frombuffer(f.read(8 * count), '>u4').reshape(-1, 2)
+            # Start time of every sample, then of the one past the end.
+            starts = np.concatenate(([0], np.cumsum(np.repeat(runs[:, 1].astype(np.int64), runs[:, 0]))))
+            stss = _find(f, *stbl, b'stss')
+            if stss:
+                f.seek(stss[0] + 4)
+                count = struct.unpack('>I', f.read(4))[0]
+                frames = np.frombuffer(f.read(4 * count), '>u4').astype(np.int64) - 1
+            else:
+                # No sync sample table: every sample is a keyframe.
+                frames = np.arange(len(starts) - 1)
+            times = starts[frames] * 1000 // timescale
+            return cls(times.tolist(), frames.tolist(), int(starts[-1] * 1000 // timescale))
+        return None
+
+    def before(self, position_ms):
+        """Position of the last keyframe at or before ``position_ms``."""
+        return self.times[max(0, bisect.bisect_right(self.times, position_ms) - 1)] if self.times else 0
+
+    def frame_before(self, position_ms):
+        return self.frames[max(0, bisect.bisect_right(self.times, position_ms) - 1)] if self.frames else 0
@@ -0,0 +1,80 @@
+import cv2
+import numpy as np
+
+ANALYSIS_WIDTH = 160
+DEFAULT_SENSITIVITY = 50
+DEFAULT_MAX_FPS = 5
+DEFAULT_POST_ROLL_SECONDS = 10
+BACKGROUND_RATE = 0.05
+
+
+def parse_zones(text):
+    """``"x,y,w,h; ..."`` in percent of the frame -> ``[(x, y, w, h), ...]`` as fractions; bad entries are skipped."""
+    zones = []
+    for part in (text or '').split(';'):
+        try:
+            x, y, w, h = (float(value) / 100 for value in part.split(','))
+        except ValueError:
+            continue
+        if w > 0 and h > 0:
+            zones.append((x, y, w, h))
+    return zones
+
+
+class MotionDetector:
+    """
+    Scores how much of a frame (or of its zones) changed against a running background.
+
+    Frames are shrunk to ``ANALYSIS_WIDTH`` grey pixels, so the cost is the same
+    for every stream, and at most ``max_fps`` frames a second are looked at;
+    ``feed()`` returns None for the others. ``sensitivity`` (1-100) lowers both
+    the per-pixel difference and the share of changed pixels that count as motion.
+    """
+
+    def __init__(self, sensitivity=DEFAULT_SENSITIVITY, zones=None, max_fps=DEFAULT_MAX_FPS):
+        sensitivity = min(max(int(sensitivity), 1), 100)
+        self.pixel_threshold = 60 - sensitivity / 2
+        self.threshold = 0.002 + 0.05 * (1 - sensitivity / 100)
+        self.zones = zones or []
+        self.interval = 1 / max_fps if max_fps else 0
+        self._next_time = 0
+        self._background = None
+        self._mask = None
+        self._zone_pixels = 0
+
+    def _reset(self, shape):
+        height, width = shape
+        self._background = None
+        self._mask = np.zeros(shape, np.uint8)
+        for x, y, w, h in self.zones or [(0, 0, 1, 1)]:
+            self._mask[int(y * height):int((y + h) * height), int(x * width):int((x + w) * width)] = 255
+        self._zone_pixels = max(1, cv2.countNonZero(self._mask))
+
+    def due(self, timestamp):
+        """Whether ``feed()`` would look at a frame taken at ``timestamp``."""
+        return timestamp >= self._next_time
+
+    def feed(self, frame, timestamp):
+        """Fraction (0-1) of the zones that moved, or None if this frame was skipped."""
+        if timestamp < self._next_time:
+            return None
+        self._next_time = timestamp + self.interval
+
+        height, width = frame.shape[:2]
+        size = (ANALYSIS_WIDTH, max(1, round(height * ANALYSIS_WIDTH / width)))
+        grey = cv2.cvtColor(cv2.resize(frame, size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        grey = cv2.GaussianBlur(grey, (5, 5), 0)
+        if self._mask is None or self._mask.shape != grey.shape:
+            self._reset(grey.shape)
+        if self._background is None:
+            self._background = grey.astype(np.float32)
+            return 0.0
+
+        diff = cv2.absdiff(grey, cv2.convertScaleAbs(self._background))
+        _, moved = cv2.threshold(diff, self.pixel_threshold, 255, cv2.THRESH_BINARY)
+        score = cv2.countNonZero(cv2.bitwise_and(moved, self._mask)) / self._zone_pixels
+        cv2.accumulateWeighted(grey, self._background, BACKGROUND_RATE)
+        return score
+
+    def is_motion(self, score):
+        return score is not None and score >= self.threshold
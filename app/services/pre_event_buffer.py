@@ -0,0 +1,53 @@
+from collections import deque
+
+import cv2
+
+JPEG_QUALITY = 85
+DEFAULT_PRE_EVENT_SECONDS = 0
+DEFAULT_PRE_EVENT_MB = 64
+
+
+class PreEventBuffer:
+    """
+    The last ``seconds`` of frames, JPEG-compressed and capped at ``max_bytes``.
+
+    Compressed frames take roughly a twentieth of the raw size, so a few seconds
+    of full-resolution video per camera cost tens of megabytes, not gigabytes.
+    Whichever limit is hit first evicts the oldest frames.
+    """
+
+    def __init__(self, seconds, max_bytes, quality=JPEG_QUALITY):
+        self.seconds = seconds
+        self.max_bytes = max_bytes
+        self.quality = quality
+        self.frames = deque()
+        self.nbytes = 0
+
+    def put(self, frame, timestamp):
+        data = encode_jpeg(frame, self.quality)
+        if data is None:
+            return
+        self.frames.append((timestamp, data))
+        self.nbytes += data.nbytes
+        while self.frames and (timestamp - self.frames[0][0] > self.seconds or self.nbytes > self.max_bytes):
+            self.nbytes -= self.frames.popleft()[1].nbytes
+
+    def drain(self):
+        """Hand over every buffered ``(timestamp, jpeg)`` pair, oldest first, and start empty."""
+        frames = self.frames
+        self.frames = deque()
+        self.nbytes = 0
+        return frames
+
+    @property
+    def duration(self):
+        return self.frames[-1][0] - self.frames[0][0] if self.frames else 0.0
+
+
+def encode_jpeg(frame, quality=JPEG_QUALITY):
+    ok, data = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return data if ok else None
+
+
+def decode_jpeg(data):
+    return cv2.imdecode(data, cv2.IMREAD_COLOR)
@@ -0,0 +1,359 @@
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from multiprocessing import resource_tracker
+
+import cv2
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from app.services.encoder_worker import encoder_worker
+from app.services.logger import get_logger
+from app.services.shm_frame_ring import ShmFrameRing
+
+MIN_RING_SLOTS = 2
+DEFAULT_QUEUE_MB = 64
+POLL_MS = 500
+MAX_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+SHUTDOWN_TIMEOUT = 5
+
+ACTIVE_STATES = ('buffering', 'starting', 'recording', 'stopping', 'closing')
+FINISHED_STATES = ('stopped', 'closed', 'failed')
+
+# What a sink does with a frame when the encoder is a full queue behind.
+DROP_OLDEST = 'drop_oldest'      # overwrite the oldest unread frame
+DROP_NEWEST = 'drop_newest'      # refuse the incoming frame
+DROP_NON_KEY = 'drop_non_key'    # past half full, keep only one frame per KEYFRAME_INTERVAL
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST, DROP_NON_KEY)
+KEYFRAME_INTERVAL = 1.0
+
+
+class RecordingSink:
+    """
+    Queue-like handle that capture threads push frames into (``full()`` / ``put_nowait()``).
+
+    Frames are copied into the recording's shared-memory ring and only the slot
+    is queued for the encoder process, so capture never waits on encoding. The
+    ring is the queue: its size is the byte budget, and once the encoder is that
+    far behind, ``overflow`` decides which frames are lost.
+    """
+
+    def __init__(self, service, recorder_id, ring: ShmFrameRing, commands, width, height, overflow=DROP_OLDEST):
+        self.recorder_id = recorder_id
+        self.overflow = overflow
+        self.dropped = 0
+        self._service = service
+        self._ring = ring
+        self._commands = commands
+        self._size = (width, height)
+        self._frame_bytes = width * height * 3
+        self._last_key = 0.0
+        self._lock = threading.Lock()
+        self._open = True
+
+    def full(self):
+        return False
+
+    def put_nowait(self, frame):
+        with self._lock:
+            if not self._open:
+                return
+            timestamp = time.time()
+            if not self._admit(timestamp):
+                self.dropped += 1
+                return
+            if frame.shape[1::-1] != self._size:
+                frame = cv2.resize(frame, self._size)
+            slot, seq = self._ring.publish(frame, timestamp)
+            self._commands.put(('frame', self.recorder_id, slot, seq))
+
+    def _admit(self, timestamp):
+        pending, capacity = self._ring.pending, self._ring.slot_count
+        is_key = timestamp - self._last_key >= KEYFRAME_INTERVAL
+        if self.overflow == DROP_NEWEST:
+            admit = pending < capacity
+        elif self.overflow == DROP_NON_KEY:
+            admit = pending < capacity // 2 or (is_key and pending < capacity)
+        else:
+            # The ring overwrites the oldest unread slot; the encoder counts that frame as dropped.
+            admit = True
+        if admit and is_key:
+            self._last_key = timestamp
+        return admit
+
+    @property
+    def queued_frames(self):
+        ring = self._ring
+        return ring.pending if ring else 0
+
+    @property
+    def queued_bytes(self):
+        return self.queued_frames * self._frame_bytes
+
+    def detach(self):
+        """Stop accepting frames; the ring stays alive until the encoder lets go of it."""
+        with self._lock:
+            self._open = False
+
+    def close(self):
+        with self._lock:
+            self._open = False
+            if self._ring:
+                self._ring.close()
+                self._ring = None
+
+    @property
+    def is_open(self):
+        return self._open
+
+    def stop(self):
+        self._service.stop(self.recorder_id)
+
+
+class _Worker:
+    def __init__(self, context, events):
+        self.commands = context.Queue()
+        self.process = context.Process(target=encoder_worker, args=(self.commands, events), daemon=True)
+        self.recorder_ids = set()
+        self.process.start()
+
+
+class _Recorder:
+    def __init__(self, sink, worker, stats):
+        self.sink = sink
+        self.worker = worker
+        self.stats = stats
+        self.buffered = False
+
+
+class RecordingService(QObject):
+    """
+    Runs the re-encoding recorders in a pool of encoder processes.
+
+    Each panel gets a channel in one of the workers. A channel opened with
+    ``open_buffer`` keeps compressed pre-event frames while idle, and the
+    recording started on it begins with them.
+
+    Recordings are spread over up to ``max_workers`` processes so encoding scales
+    across cores and never competes with rendering for the GUI's GIL. Workers
+    report back through a queue that a GUI-thread timer drains, so a crashed or
+    stuck encoder only ends its own recordings.
+    """
+    recorder_stopped = Signal(str, object)
+    recorder_failed = Signal(str, str)
+
+    def __init__(self, max_workers=MAX_WORKERS, parent=None):
+        super().__init__(parent)
+        self.max_workers = max_workers
+        self.logger = get_logger('RecordingService')
+        self._context = multiprocessing.get_context('spawn')
+        self._events = self._context.Queue()
+        self._workers: list[_Worker] = []
+        self._recorders: dict[str, _Recorder] = {}
+        self._ids = itertools.count(1)
+        self._overlay_fields = {}
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.poll)
+
+        if os.name == 'posix':
+            # See ProcessCaptureThread: the tracker must be started from the GUI process.
+            resource_tracker.ensure_running()
+
+    def open_buffer(self, panel_name, fps, width, height, seconds, max_bytes,
+                    queue_bytes=DEFAULT_QUEUE_MB * 2 ** 20, overflow=DROP_OLDEST) -> RecordingSink:
+        """
+        Keep the last ``seconds`` (at most ``max_bytes``) of a panel in its encoder
+        so the next ``start`` for that panel begins with them.
+        """
+        recorder = self._open(panel_name, fps, width, height, seconds, max_bytes, queue_bytes, overflow)
+        recorder.buffered = True
+        recorder.stats['state'] = 'buffering'
+        return recorder.sink
+
+    def start(self, panel_name, session_dir, fps, width, height, segment_seconds=None,
+              queue_bytes=DEFAULT_QUEUE_MB * 2 ** 20, overflow=DROP_OLDEST, overlay=None) -> RecordingSink:
+        """
+        Start encoding a session into ``session_dir`` and return the sink its frames go into.
+        ``queue_bytes`` bounds the frames waiting for the encoder; see ``RecordingSink``.
+        ``overlay`` holds ``FrameOverlay`` keyword arguments.
+        """
+        recorder = next((r for r in self._recorders.values() if r.buffered and r.stats['panel'] == panel_name
+                         and r.stats['state'] in ('buffering', 'stopping')), None)
+        if not recorder:
+            recorder = self._open(panel_name, fps, width, height, 0, 0, queue_bytes, overflow)
+
+        recorder.worker.commands.put(('record', recorder.sink.recorder_id, session_dir, segment_seconds, overlay))
+        recorder.stats.update(state='starting', output_path=session_dir, frames=0, dropped=0, segments=0,
+                              duplicated=0, skipped=0)
+        recorder.sink.dropped = 0
+        return recorder.sink
+
+    def _open(self, panel_name, fps, width, height, pre_event_seconds, pre_event_bytes, queue_bytes, overflow):
+        for recorder_id in [rid for rid, r in self._recorders.items()
+                            if r.stats['panel'] == panel_name and r.stats['state'] not in ACTIVE_STATES]:
+            del self._recorders[recorder_id]
+
+        recorder_id = f'{panel_name}#{next(self._ids)}'
+        frame_bytes = width * height * 3
+        ring = ShmFrameRing.create(frame_bytes, max(MIN_RING_SLOTS, queue_bytes // frame_bytes))
+        worker = self._pick_worker()
+        worker.commands.put(('open', recorder_id, ring.name, fps, width, height, panel_name,
+                             pre_event_seconds, pre_event_bytes))
+        worker.recorder_ids.add(recorder_id)
+
+        sink = RecordingSink(self, recorder_id, ring, worker.commands, width, height, overflow)
+        recorder = self._recorders[recorder_id] = _Recorder(sink, worker, {
+            'panel': panel_name,
+            'output_path': None,
+            'state': 'starting',
+            'worker': worker.process.pid,
+            'frames': 0,
+            'dropped': 0,
+            'segments': 0,
+            'duplicated': 0,
+            'skipped': 0,
+            'encode_ms': 0.0,
+            'lag_ms': 0,
+            'queued_frames': 0,
+            'queued_bytes': 0,
+            'buffer_bytes': 0,
+            'buffer_seconds': 0.0,
+        })
+        if not self._timer.isActive():
+            self._timer.start(POLL_MS)
+        return recorder
+
+    def set_overlay_field(self, name, value):
+        """Show ``value`` on every recording's overlay from now on; None removes it."""
+        self._overlay_fields[name] = value
+        for worker in self._workers:
+            worker.commands.put(('field', None, name, value))
+
+    def stop(self, recorder_id):
+        """Finish the recording; a buffered panel goes back to buffering."""
+        recorder = self._recorders.get(recorder_id)
+        if not recorder or recorder.stats['state'] not in ('starting', 'recording'):
+            return
+        recorder.stats['state'] = 'stopping'
+        recorder.worker.commands.put(('stop', recorder_id))
+        if not recorder.buffered:
+            recorder.sink.detach()
+            recorder.worker.commands.put(('close', recorder_id))
+
+    def close(self, recorder_id):
+        """Finish any recording and drop the panel's channel, pre-event buffer included."""
+        recorder = self._recorders.get(recorder_id)
+        if not recorder or recorder.stats['state'] not in ACTIVE_STATES:
+            return
+        recorder.sink.detach()
+        recorder.stats['state'] = 'closing'
+        recorder.worker.commands.put(('stop', recorder_id))
+        recorder.worker.commands.put(('close', recorder_id))
+
+    def status(self):
+        """``{recorder_id: state}`` of every channel since its panel last opened one."""
+        return {recorder_id: recorder.stats['state'] for recorder_id, recorder in self._recorders.items()}
+
+    def stats(self, recorder_id=None):
+        """
+        Counters per channel: the encoder's last report plus the sink's live queue
+        depth. ``dropped`` covers frames refused by the overflow policy and frames
+        the encoder found overwritten.
+        """
+        if recorder_id is not None:
+            recorder = self._recorders.get(recorder_id)
+            return self._snapshot(recorder) if recorder else None
+        return {recorder_id: self._snapshot(recorder) for recorder_id, recorder in self._recorders.items()}
+
+    @staticmethod
+    def _snapshot(recorder):
+        stats = dict(recorder.stats)
+        sink = recorder.sink
+        stats.update(queued_frames=sink.queued_frames, queued_bytes=sink.queued_bytes,
+                     dropped=stats['dropped'] + sink.dropped)
+        return stats
+
+    def _pick_worker(self):
+        self._workers = [worker for worker in self._workers if worker.process.is_alive()]
+        idle = [worker for worker in self._workers if not worker.recorder_ids]
+        if idle:
+            return idle[0]
+        if len(self._workers) < self.max_workers:
+            worker = _Worker(self._context, self._events)
+            self._workers.append(worker)
+            for name, value in self._overlay_fields.items():
+                worker.commands.put(('field', None, name, value))
+            self.logger.info(f'Started encoder process {worker.process.pid}')
+            return worker
+        return min(self._workers, key=lambda worker: len(worker.recorder_ids))
+
+    def poll(self):
+        while True:
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                break
+            self._on_event(event)
+
+        for worker in list(self._workers):
+            if worker.process.is_alive():
+                continue
+            self._workers.remove(worker)
+            for recorder_id in list(worker.recorder_ids):
+                self._finish(recorder_id, 'failed')
+                message = f'Encoder process exited with code {worker.process.exitcode}'
+                self.logger.warning(f'{recorder_id}: {message}')
+                self.recorder_failed.emit(recorder_id, message)
+
+        if not any(r.stats['state'] in ACTIVE_STATES for r in self._recorders.values()):
+            self._timer.stop()
+
+    def _on_event(self, event):
+        kind, recorder_id = event[0], event[1]
+        recorder = self._recorders.get(recorder_id)
+        if not recorder or recorder.stats['state'] in FINISHED_STATES:
+            return
+        if kind == 'started':
+            if recorder.stats['state'] == 'starting':
+                recorder.stats['state'] = 'recording'
+        elif kind == 'stats':
+            recorder.stats.update(event[2])
+        elif kind == 'stopped':
+            recorder.stats.update(event[2])
+            if recorder.buffered and recorder.stats['state'] == 'stopping':
+                recorder.stats['state'] = 'buffering'
+            stats = self._snapshot(recorder)
+            self.logger.info(f"Recording saved: {stats['output_path']} "
+                             f"({stats['frames']} frames, {stats['dropped']} dropped, {stats['segments']} segments)")
+            self.recorder_stopped.emit(recorder_id, stats)
+        elif kind == 'closed':
+            self._finish(recorder_id, 'closed' if recorder.buffered else 'stopped')
+        elif kind == 'failed':
+            self._finish(recorder_id, 'failed')
+            recorder.worker.commands.put(('close', recorder_id))
+            self.recorder_failed.emit(recorder_id, event[2])
+
+    def _finish(self, recorder_id, state):
+        recorder = self._recorders[recorder_id]
+        recorder.stats['state'] = state
+        recorder.sink.close()
+        recorder.worker.recorder_ids.discard(recorder_id)
+
+    def shutdown(self):
+        """Finish every recording and stop the encoder processes."""
+        for recorder_id in list(self._recorders):
+            self.close(recorder_id)
+        for worker in self._workers:
+            worker.commands.put(('exit',))
+        for worker in self._workers:
+            worker.process.join(SHUTDOWN_TIMEOUT)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join(0.5)
+        self.poll()
+        for recorder in self._recorders.values():
+            recorder.sink.close()
+        self._workers = []
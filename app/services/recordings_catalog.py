@@ -0,0 +1,314 @@
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import NamedTuple
+
+import cv2
+from PySide6.QtCore import QObject, Signal, QRunnable, QThreadPool, QFileSystemWatcher, QTimer
+
+from app.services.logger import get_logger
+from app.services.session_manifest import MANIFEST_NAME, SessionManifest
+
+CATALOG_NAME = '.catalog.sqlite3'
+WATCH_DEBOUNCE_MS = 1000
+_TIMESTAMPED_NAME = re.compile(r'^(?P<camera>.+)_(?P<stamp>\d{8}_\d{6})(\.mp4)?$')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS recordings (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    camera TEXT,
+    started_at REAL,
+    ended_at REAL,
+    duration REAL,
+    size INTEGER,
+    codec TEXT,
+    width INTEGER,
+    height INTEGER,
+    segments INTEGER,
+    active INTEGER NOT NULL DEFAULT 0,
+    mtime REAL
+);
+CREATE INDEX IF NOT EXISTS recordings_by_camera ON recordings (camera, started_at);
+CREATE INDEX IF NOT EXISTS recordings_by_start ON recordings (started_at);
+"""
+
+SESSION, FILE = 'session', 'file'
+
+
+class Recording(NamedTuple):
+    path: str
+    name: str
+    kind: str              # SESSION (a directory of segments) or FILE (a single MP4)
+    camera: str | None
+    started_at: float | None
+    ended_at: float | None
+    duration: float | None
+    size: int
+    codec: str | None
+    width: int | None
+    height: int | None
+    segments: int
+    active: bool           # a session still being recorded
+
+
+_COLUMNS = ', '.join(Recording._fields)
+
+
+def _connect(db_path):
+    connection = sqlite3.connect(db_path, timeout=10)
+    # WAL lets the GUI read while a scan task writes.
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.executescript(_SCHEMA)
+    return connection
+
+
+def _entry_mtime(path):
+    """Change marker for a catalog entry: a session changes whenever its manifest is rewritten."""
+    try:
+        if os.path.isdir(path):
+            return os.stat(os.path.join(path, MANIFEST_NAME)).st_mtime
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _is_recording(path):
+    return path.endswith('.mp4') and os.path.isfile(path) or SessionManifest.is_session(path)
+
+
+def _video_info(path):
+    """``(codec, width, height, duration)`` read from the file's header; Nones if it won't open."""
+    capture = cv2.VideoCapture(path)
+    try:
+        if not capture.isOpened():
+            return None, None, None, None
+        fourcc = int(capture.get(cv2.CAP_PROP_FOURCC))
+        codec = ''.join(chr((fourcc >> 8 * i) & 0xFF) for i in range(4)).strip('\0 ') or None
+        fps = capture.get(cv2.CAP_PROP_FPS)
+        frames = capture.get(cv2.CAP_PROP_FRAME_COUNT)
+        duration = frames / fps if fps > 0 and frames > 0 else None
+        return codec, int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)), int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)), duration
+    finally:
+        capture.release()
+
+
+def _parse_name(name):
+    match = _TIMESTAMPED_NAME.match(name)
+    if not match:
+        return None, None
+    started = datetime.strptime(match['stamp'], '%Y%m%d_%H%M%S').timestamp()
+    return match['camera'].replace('_', ' '), started
+
+
+def probe_recording(path):
+    """Catalog entry for the session directory or MP4 at ``path``, or None if it is neither."""
+    name = os.path.basename(path)
+    if os.path.isdir(path):
+        manifest = SessionManifest.load(path)
+        if not manifest:
+            return None
+        segments = manifest.existing_segments()
+        size = sum(os.path.getsize(os.path.join(path, segment['path'])) for segment in segments)
+        codec = width = height = None
+        if segments:
+            codec, width, height, _ = _video_info(os.path.join(path, segments[0]['path']))
+        started = datetime.fromisoformat(manifest.started_at).timestamp()
+        duration = sum(segment.get('duration') or 0.0 for segment in segments)
+        ended = datetime.fromisoformat(manifest.stopped_at).timestamp() if manifest.stopped_at else started + duration
+        return Recording(path, name, SESSION, manifest.camera, started, ended, duration, size,
+                         codec, width, height, len(segments), not manifest.stopped_at)
+
+    if not (name.endswith('.mp4') and os.path.isfile(path)):
+        return None
+    camera, started = _parse_name(os.path.splitext(name)[0])
+    stat = os.stat(path)
+    codec, width, height, duration = _video_info(path)
+    if started is None:
+        started = stat.st_mtime - (duration or 0)
+    ended = started + duration if duration else stat.st_mtime
+    return Recording(path, name, FILE, camera, started, ended, duration, stat.st_size,
+                     codec, width, height, 1, False)
+
+
+def sync_catalog(db_path, root, paths=None):
+    """
+    Bring the catalog in line with the disk; returns ``(changed, active)``.
+
+    With ``paths`` only those entries are looked at; otherwise the top level of
+    ``root`` is listed and only entries whose change marker moved are probed.
+    ``active`` lists the sessions still being recorded.
+    """
+    connection = _connect(db_path)
+    try:
+        known = dict(connection.execute('SELECT path, mtime FROM recordings'))
+        if paths is None:
+            on_disk = {}
+            for entry in os.scandir(root):
+                if entry.name != CATALOG_NAME and _is_recording(entry.path):
+                    on_disk[entry.path] = _entry_mtime(entry.path)
+            removed = [path for path in known if path not in on_disk]
+        else:
+            on_disk = {path: _entry_mtime(path) for path in paths if _is_recording(path)}
+            removed = [path for path in paths if path not in on_disk and path in known]
+
+        changed = 0
+        with connection:
+            for path in removed:
+                connection.execute('DELETE FROM recordings WHERE path = ?', (path,))
+                changed += 1
+            for path, mtime in on_disk.items():
+                if path in known and known[path] == mtime:
+                    continue
+                try:
+                    recording = probe_recording(path)
+                except (OSError, ValueError):
+                    recording = None
+                if recording is None:
+                    continue
+                connection.execute(
+                    f'INSERT OR REPLACE INTO recordings ({_COLUMNS}, mtime) VALUES ({", ".join("?" * 14)})',
+                    (*recording, mtime)
+                )
+                changed += 1
+        active = [path for (path,) in connection.execute('SELECT path FROM recordings WHERE active')]
+        return changed, active
+    finally:
+        connection.close()
+
+
+class CatalogSignals(QObject):
+    finished = Signal(int, list)   # entries changed, sessions still recording
+
+
+class CatalogTask(QRunnable):
+    def __init__(self, db_path, root, paths=None):
+        super().__init__()
+        self.signals = CatalogSignals()
+        self._db_path = db_path
+        self._root = root
+        self._paths = paths
+        self.logger = get_logger('CatalogTask')
+
+    def run(self):
+        try:
+            changed, active = sync_catalog(self._db_path, self._root, self._paths)
+        except (OSError, sqlite3.Error) as e:
+            self.logger.warning(f'Catalog update failed: {e}')
+            changed, active = 0, []
+        self.signals.finished.emit(changed, active)
+
+
+class RecordingsCatalog(QObject):
+    """
+    SQLite index of the recordings under ``root``, kept up to date in the background.
+
+    A file-system watcher on ``root`` and on the sessions still being recorded
+    schedules incremental updates, and recorders report the sessions they close
+    through ``update()``. Updates run one at a time on a private thread pool;
+    ``query()`` only reads the database, so listing recordings never walks the disk.
+    """
+    changed = Signal()
+
+    def __init__(self, root, parent=None):
+        super().__init__(parent)
+        self.root = os.path.normpath(root)
+        self.logger = get_logger('RecordingsCatalog')
+        os.makedirs(root, exist_ok=True)
+        self.db_path = os.path.join(self.root, CATALOG_NAME)
+        self._connection = _connect(self.db_path)
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._pending_paths = set()
+        self._tasks = set()   # in flight; the pool does not keep the Python objects alive
+        self._closed = False
+
+        self._watcher = QFileSystemWatcher([self.root], self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(WATCH_DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._flush_watch)
+
+        self.rescan()
+
+    def rescan(self):
+        """Look at every entry under ``root`` (probing only those that changed)."""
+        self._start(None)
+
+    def update(self, *paths):
+        """Re-read just ``paths`` (session directories or MP4s), e.g. when a recorder closes one."""
+        self._start([os.path.normpath(path) for path in paths if path])
+
+    def _start(self, paths):
+        if self._closed:
+            return
+        task = CatalogTask(self.db_path, self.root, paths)
+        task.signals.finished.connect(lambda changed, active: self._on_task_finished(task, changed, active))
+        self._tasks.add(task)
+        self._pool.start(task)
+
+    def _on_directory_changed(self, path):
+        self._pending_paths.add(path)
+        self._debounce.start()
+
+    def _flush_watch(self):
+        paths, self._pending_paths = self._pending_paths, set()
+        if self.root in paths:
+            self.rescan()
+            paths.discard(self.root)
+        if paths:
+            self.update(*paths)
+
+    def _on_task_finished(self, task, changed, active):
+        self._tasks.discard(task)
+        watched = set(self._watcher.directories()) - {self.root}
+        stale, fresh = watched - set(active), set(active) - watched
+        if stale:
+            self._watcher.removePaths(list(stale))
+        if fresh:
+            self._watcher.addPaths(list(fresh))
+        if changed:
+            self.changed.emit()
+
+    @staticmethod
+    def _where(camera, since, until):
+        clauses, params = [], []
+        if camera is not None:
+            clauses.append('camera = ?')
+            params.append(camera)
+        if since is not None:
+            clauses.append('ended_at >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append('started_at <= ?')
+            params.append(until)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def query(self, camera=None, since=None, until=None, limit=None, offset=0, newest_first=True):
+        """Recordings overlapping ``[since, until]`` (epoch seconds), optionally for one camera."""
+        where, params = self._where(camera, since, until)
+        # The path breaks ties so pages never overlap or skip rows.
+        order = 'DESC' if newest_first else 'ASC'
+        sql = f'SELECT {_COLUMNS} FROM recordings{where} ORDER BY started_at {order}, path {order}'
+        if limit is not None:
+            sql += ' LIMIT ? OFFSET ?'
+            params += [limit, offset]
+        return [Recording(*row[:-1], bool(row[-1])) for row in self._connection.execute(sql, params)]
+
+    def count(self, camera=None, since=None, until=None):
+        where, params = self._where(camera, since, until)
+        return self._connection.execute(f'SELECT COUNT(*) FROM recordings{where}', params).fetchone()[0]
+
+    def cameras(self):
+        return [camera for (camera,) in self._connection.execute(
+            'SELECT DISTINCT camera FROM recordings WHERE camera IS NOT NULL ORDER BY camera')]
+
+    def close(self):
+        self._closed = True
+        self._debounce.stop()
+        self._pool.waitForDone()
+        self._connection.close()
@@ -1,19 +1,32 @@
+import asyncio
 
 from PySide6.QtCore import QObject, Signal, QRunnable
 
+from app.services.rtsp_probe import probe
+
+PROBE_TIMEOUT = 3.0
+
 
 class RefreshSignals(QObject):
-    refresh_panel = Signal(object)   # emits a PanelWidget
+    refresh_panel = Signal(object, object)   # emits a WallPanel and its ProbeResult (or None)
     finished = Signal()
 
 class RefreshTask(QRunnable):
-    def __init__(self, panels):
+    def __init__(self, panel_urls, timeout=PROBE_TIMEOUT):
         super().__init__()
         self.signals = RefreshSignals()
-        self._panels = panels
+        self._panel_urls = panel_urls
+        self._timeout = timeout
 
     def run(self):
-        # Emit a signal for each panel; UI work happens in the main thread.
-        for p in self._panels:
-            self.signals.refresh_panel.emit(p)
-        self.signals.finished.emit()
\ No newline at end of file
+        # Probe every camera concurrently; each panel is signalled as soon as its own
+        # probe finishes, and the UI work happens in the main thread.
+        asyncio.run(self._probe_panels())
+        self.signals.finished.emit()
+
+    async def _probe_panels(self):
+        async def probe_panel(panel, url):
+            result = await probe(url, self._timeout) if url else None
+            self.signals.refresh_panel.emit(panel, result)
+
+        await asyncio.gather(*(probe_panel(panel, url) for panel, url in self._panel_urls))
@@ -0,0 +1,137 @@
+import os
+import shutil
+import time
+from typing import NamedTuple
+
+from PySide6.QtCore import QObject, Signal, QRunnable
+
+from app.services.activity_index import ACTIVITY_SUFFIX
+from app.services.frame_index import FRAME_INDEX_SUFFIX
+from app.services.logger import get_logger
+from app.services.session_manifest import SessionManifest
+
+GB = 1024 ** 3
+# Every limit is opt-in: nothing is deleted until one is set in the settings.
+DEFAULT_MAX_AGE_DAYS = 0
+DEFAULT_MIN_FREE_GB = 0
+CHECK_INTERVAL_MS = 5 * 60 * 1000
+# Files touched this recently may still be open for writing.
+ACTIVE_GRACE = 120
+SIDECAR_SUFFIXES = ('.json', FRAME_INDEX_SUFFIX, ACTIVITY_SUFFIX)
+
+
+class RetentionPolicy(NamedTuple):
+    max_age_days: float = 0    # 0 disables each limit
+    max_bytes: int = 0
+    min_free_bytes: int = 0
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(
+            max_age_days=int(settings.value("retention/max_age_days", DEFAULT_MAX_AGE_DAYS)),
+            max_bytes=int(settings.value("retention/max_gb", 0)) * GB,
+            min_free_bytes=int(settings.value("retention/min_free_gb", DEFAULT_MIN_FREE_GB)) * GB,
+        )
+
+
+def _recording_files(root):
+    """Every deletable recording file as ``(mtime, size, path)``: loose MP4s and session segments."""
+    files = []
+    for entry in os.scandir(root):
+        if entry.is_file() and entry.name.endswith('.mp4'):
+            paths = [entry.path]
+        elif entry.is_dir() and SessionManifest.is_session(entry.path):
+            paths = [e.path for e in os.scandir(entry.path) if e.is_file() and e.name.endswith('.mp4')]
+        else:
+            continue
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+    files.sort()
+    return files
+
+
+def _remove(path, root):
+    os.remove(path)
+    stem = os.path.splitext(path)[0]
+    for suffix in SIDECAR_SUFFIXES:
+        if os.path.isfile(stem + suffix):
+            os.remove(stem + suffix)
+
+    directory = os.path.dirname(path)
+    if os.path.abspath(directory) != os.path.abspath(root):
+        if not any(name.endswith('.mp4') for name in os.listdir(directory)):
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def enforce_retention(root, policy: RetentionPolicy, now=None):
+    """
+    Delete the oldest recordings until ``policy`` holds; returns the deleted paths.
+
+    Age goes first, then the total-size cap, then the free-space floor. Files that
+    were written to within ``ACTIVE_GRACE`` seconds are never touched. The floor
+    is left alone when deleting every old recording still wouldn't meet it (the
+    disk is filled by something else), and given up as soon as a deletion doesn't
+    free any space.
+    """
+    if not os.path.isdir(root):
+        return []
+    now = now or time.time()
+    files = _recording_files(root)
+    total = sum(size for _, size, _ in files)
+    free = shutil.disk_usage(root).free
+    deleted = []
+
+    min_free = policy.min_free_bytes
+    reclaimable = sum(size for mtime, size, _ in files if now - mtime >= ACTIVE_GRACE)
+    if min_free and free + reclaimable < min_free:
+        get_logger('Retention').warning(
+            f'Only {free / GB:.1f} GB free and {reclaimable / GB:.1f} GB of old recordings; '
+            f'not deleting them for the {min_free / GB:.0f} GB free-space floor.')
+        min_free = 0
+
+    for mtime, size, path in files:
+        if now - mtime < ACTIVE_GRACE:
+            break
+        too_old = policy.max_age_days and now - mtime > policy.max_age_days * 86400
+        too_big = policy.max_bytes and total > policy.max_bytes
+        too_full = min_free and free < min_free
+        if not (too_old or too_big or too_full):
+            break
+        try:
+            _remove(path, root)
+        except OSError:
+            continue
+        total -= size
+        deleted.append(path)
+        freed = shutil.disk_usage(root).free
+        if too_full and not (too_old or too_big) and freed <= free:
+            break   # still held open or linked elsewhere: more deletions won't help either
+        free = freed
+    return deleted
+
+
+class RetentionSignals(QObject):
+    finished = Signal(list)
+
+
+class RetentionTask(QRunnable):
+    def __init__(self, root, policy: RetentionPolicy):
+        super().__init__()
+        self.signals = RetentionSignals()
+        self._root = root
+        self._policy = policy
+        self.logger = get_logger('RetentionTask')
+
+    def run(self):
+        try:
+            deleted = enforce_retention(self._root, self._policy)
+        except OSError as e:
+            self.logger.warning(f'Retention check failed: {e}')
+            deleted = []
+        for path in deleted:
+            self.logger.info(f'Deleted old recording: {path}')
+        self.signals.finished.emit(deleted)
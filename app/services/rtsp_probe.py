@@ -0,0 +1,184 @@
+import asyncio
+import base64
+import hashlib
+import os
+import re
+from typing import NamedTuple
+from urllib.parse import urlsplit, urlunsplit
+
+RTSP_DEFAULT_PORT = 554
+USER_AGENT = 'vision-hub-probe'
+
+
+class SdpInfo(NamedTuple):
+    codec: str | None
+    width: int | None
+    height: int | None
+    fps: float | None
+
+
+class ProbeResult(NamedTuple):
+    url: str
+    ok: bool
+    status: int | None = None
+    sdp: SdpInfo | None = None
+    error: str | None = None
+
+
+def parse_sdp(text):
+    """Extract codec, resolution and frame rate of the first video media section."""
+    codec = width = height = fps = None
+    in_video = False
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith('m='):
+            if in_video:
+                break
+            in_video = line.startswith('m=video')
+            continue
+        if not in_video or not line.startswith('a='):
+            continue
+
+        key, _, value = line[2:].partition(':')
+        if key == 'rtpmap' and codec is None:
+            # a=rtpmap:96 H264/90000
+            parts = value.split(None, 1)
+            if len(parts) == 2:
+                codec = parts[1].split('/')[0].upper()
+        elif key == 'framerate':
+            try:
+                fps = float(value)
+            except ValueError:
+                pass
+        elif key == 'x-dimensions':
+            # a=x-dimensions:1920,1080
+            match = re.match(r'\s*(\d+)\s*,\s*(\d+)', value)
+            if match:
+                width, height = int(match.group(1)), int(match.group(2))
+        elif key == 'framesize':
+            # a=framesize:96 1920-1080
+            match = re.search(r'(\d+)-(\d+)\s*$', value)
+            if match:
+                width, height = int(match.group(1)), int(match.group(2))
+        elif key == 'cliprect' and width is None:
+            # a=cliprect:0,0,1080,1920 (top, left, bottom, right)
+            values = [v for v in value.split(',') if v.strip().isdigit()]
+            if len(values) == 4:
+                height, width = int(values[2]), int(values[3])
+
+    return SdpInfo(codec, width, height, fps)
+
+
+def _strip_credentials(parts):
+    host = parts.hostname or ''
+    netloc = f'{host}:{parts.port}' if parts.port else host
+    return urlunsplit((parts.scheme, netloc, parts.path, parts.query, ''))
+
+
+def _parse_challenge(header):
+    scheme, _, params = header.partition(' ')
+    fields = dict(re.findall(r'(\w+)="?([^",]*)"?', params))
+    return scheme.lower(), fields
+
+
+def _authorization(challenge, method, uri, username, password):
+    scheme, fields = challenge
+    if scheme == 'basic':
+        token = base64.b64encode(f'{username}:{password}'.encode()).decode()
+        return f'Basic {token}'
+
+    def md5(value):
+        return hashlib.md5(value.encode()).hexdigest()
+
+    realm, nonce = fields.get('realm', ''), fields.get('nonce', '')
+    ha1 = md5(f'{username}:{realm}:{password}')
+    ha2 = md5(f'{method}:{uri}')
+    header = f'Digest username="{username}", realm="{realm}", nonce="{nonce}", uri="{uri}"'
+    if 'auth' in fields.get('qop', '').split(','):
+        cnonce = os.urandom(8).hex()
+        response = md5(f'{ha1}:{nonce}:00000001:{cnonce}:auth:{ha2}')
+        header += f', qop=auth, nc=00000001, cnonce="{cnonce}"'
+    else:
+        response = md5(f'{ha1}:{nonce}:{ha2}')
+    return header + f', response="{response}"'
+
+
+class _RtspSession:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.cseq = 0
+
+    async def request(self, method, uri, headers=None):
+        self.cseq += 1
+        lines = [f'{method} {uri} RTSP/1.0', f'CSeq: {self.cseq}', f'User-Agent: {USER_AGENT}']
+        lines += [f'{key}: {value}' for key, value in (headers or {}).items()]
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode())
+        await self.writer.drain()
+
+        head = (await self.reader.readuntil(b'\r\n\r\n')).decode(errors='replace')
+        status_line, *header_lines = head.strip().split('\r\n')
+        status = int(status_line.split()[1])
+        response_headers = {}
+        for line in header_lines:
+            key, _, value = line.partition(':')
+            response_headers[key.strip().lower()] = value.strip()
+
+        body = b''
+        length = int(response_headers.get('content-length', 0))
+        if length:
+            body = await self.reader.readexactly(length)
+        return status, response_headers, body.decode(errors='replace')
+
+
+async def _probe(url):
+    parts = urlsplit(url)
+    uri = _strip_credentials(parts)
+    reader, writer = await asyncio.open_connection(parts.hostname, parts.port or RTSP_DEFAULT_PORT)
+    try:
+        session = _RtspSession(reader, writer)
+        status, _, _ = await session.request('OPTIONS', uri)
+        if status >= 400 and status != 401:
+            return ProbeResult(url, False, status, error=f'OPTIONS returned {status}')
+
+        headers = {'Accept': 'application/sdp'}
+        status, response_headers, body = await session.request('DESCRIBE', uri, headers)
+        if status == 401 and parts.username and 'www-authenticate' in response_headers:
+            challenge = _parse_challenge(response_headers['www-authenticate'])
+            headers['Authorization'] = _authorization(
+                challenge, 'DESCRIBE', uri, parts.username, parts.password or ''
+            )
+            status, response_headers, body = await session.request('DESCRIBE', uri, headers)
+
+        if status != 200:
+            return ProbeResult(url, False, status, error=f'DESCRIBE returned {status}')
+        return ProbeResult(url, True, status, sdp=parse_sdp(body))
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+
+async def probe(url, timeout=3.0) -> ProbeResult:
+    """
+    Check that an RTSP stream answers OPTIONS/DESCRIBE and return its SDP summary.
+
+    Sources that are not RTSP URLs (local files, device indices) are reported as
+    reachable without probing; ``cv2.VideoCapture`` is the only way to check them.
+    """
+    if not isinstance(url, str) or not url.lower().startswith('rtsp://'):
+        return ProbeResult(url, True)
+
+    try:
+        return await asyncio.wait_for(_probe(url), timeout)
+    except asyncio.TimeoutError:
+        return ProbeResult(url, False, error=f'Timed out after {timeout}s')
+    except (OSError, ValueError, IndexError, asyncio.IncompleteReadError, asyncio.LimitOverrunError) as e:
+        return ProbeResult(url, False, error=str(e) or type(e).__name__)
+
+
+def probe_stream(url, timeout=3.0) -> ProbeResult:
+    """Blocking wrapper for use from worker threads and processes."""
+    return asyncio.run(probe(url, timeout))
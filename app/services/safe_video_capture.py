@@ -1,34 +1,37 @@
-
-
-import multiprocessing
 import cv2
 
 from app.services.logger import get_logger
+from app.services.rtsp_probe import ProbeResult, probe_stream
 
 logger = get_logger(__name__)
 
-def _try_open_worker(video_url, queue):
-    cap = cv2.VideoCapture(0)
-    queue.put(True if cap.isOpened() else False)
-    cap.release()
-
-def open_capture(video_url, timeout=5):
-    if multiprocessing.current_process().name != 'MainProcess':
+def open_capture(video_url, timeout=5, probe_result: ProbeResult | None = None, read_timeout=None):
+    """
+    Open ``video_url`` exactly once, after a cheap RTSP OPTIONS/DESCRIBE probe.
+
+    ``probe_result`` lets callers that already probed the stream (e.g. the
+    concurrent refresh) skip the probe. Returns None when the stream is
+    unreachable or fails to open within ``timeout`` seconds. With
+    ``read_timeout`` set, a read that gets no data for that long fails instead
+    of blocking.
+    """
+    if probe_result is None or probe_result.url != video_url:
+        probe_result = probe_stream(video_url, timeout)
+
+    if not probe_result.ok:
+        logger.info(f"Stream probe failed for {video_url}: {probe_result.error}")
         return None
+    if probe_result.sdp:
+        logger.debug(f"Stream {video_url} offers {probe_result.sdp}")
 
-    queue = multiprocessing.Queue(maxsize=1)
-    process = multiprocessing.Process(target=_try_open_worker, args=(video_url, queue))
-    process.start()
-    process.join(timeout)
-    if process.is_alive():
-        process.terminate()
-        process.join(timeout=0.5)
-        logger.info(f"Timeout occurred while opening {video_url}")
-        return None
-
-    result = queue.get()
-    return cv2.VideoCapture(0) if result else None
-
-
+    params = [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, int(timeout * 1000)]
+    if read_timeout:
+        params += [cv2.CAP_PROP_READ_TIMEOUT_MSEC, int(read_timeout * 1000)]
 
+    cap = cv2.VideoCapture(video_url, cv2.CAP_FFMPEG, params)
+    if cap.isOpened():
+        return cap
 
+    cap.release()
+    logger.info(f"Failed to open {video_url}")
+    return None
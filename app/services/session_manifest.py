@@ -0,0 +1,93 @@
+import json
+import os
+from datetime import datetime
+
+MANIFEST_NAME = 'manifest.json'
+SEGMENT_PATTERN = 'segment_{:03d}.mp4'
+
+
+class SessionManifest:
+    """
+    Segments of one recording session, kept as ``manifest.json`` in the session directory.
+
+    Each segment records its file, wall-clock start and duration, which is enough
+    for the media player to lay the segments end to end as one timeline. The
+    retention manager may delete old segments without touching the manifest, so
+    readers go through ``existing_segments()``.
+    """
+
+    def __init__(self, directory, camera, mode, source=None, started_at=None, stopped_at=None, segments=None):
+        self.directory = directory
+        self.camera = camera
+        self.mode = mode
+        self.source = source
+        self.started_at = started_at or datetime.now().isoformat()
+        self.stopped_at = stopped_at
+        self.segments = segments or []
+
+    @classmethod
+    def load(cls, directory):
+        try:
+            with open(os.path.join(directory, MANIFEST_NAME)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return cls(directory, data.get('camera'), data.get('mode'), data.get('source'),
+                   data.get('started_at'), data.get('stopped_at'), data.get('segments'))
+
+    @staticmethod
+    def is_session(directory):
+        return os.path.isfile(os.path.join(directory, MANIFEST_NAME))
+
+    def add_segment(self, filename, started_at: datetime, duration=None):
+        segment = {'path': filename, 'started_at': started_at.isoformat(), 'duration': duration}
+        self.segments.append(segment)
+        return segment
+
+    def finish_segment(self, duration):
+        if self.segments:
+            self.segments[-1]['duration'] = round(duration, 3)
+
+    def finish(self):
+        self.stopped_at = datetime.now().isoformat()
+
+    def save(self):
+        data = {
+            'camera': self.camera,
+            'mode': self.mode,
+            'source': self.source,
+            'started_at': self.started_at,
+            'stopped_at': self.stopped_at,
+            'segments': self.segments,
+        }
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        # Write-then-rename so a reader never sees a half-written manifest.
+        with open(path + '.tmp', 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(path + '.tmp', path)
+
+    def existing_segments(self):
+        """Segments still on disk, each with its ``offset`` (seconds) on the session timeline."""
+        segments = []
+        offset = 0.0
+        for segment in self.segments:
+            if not os.path.isfile(os.path.join(self.directory, segment['path'])):
+                continue
+            segments.append(dict(segment, offset=offset))
+            offset += segment.get('duration') or 0.0
+        return segments
+
+    @property
+    def duration(self):
+        return sum(segment.get('duration') or 0.0 for segment in self.existing_segments())
+
+
+def recording_parts(path):
+    """``[(file, duration or None)]`` making up the recording at ``path``: an MP4 or a session directory."""
+    if not os.path.isdir(path):
+        return [(path, None)]
+    manifest = SessionManifest.load(path)
+    if not manifest:
+        return []
+    return [(os.path.join(path, segment['path']), segment.get('duration'))
+            for segment in manifest.existing_segments()]
@@ -0,0 +1,148 @@
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Ring header: slot_count, slot_bytes, latest_seq, latest_slot, read_seq.
+_SLOT_COUNT, _SLOT_BYTES, _LATEST_SEQ, _LATEST_SLOT, _READ_SEQ = range(5)
+_HEADER_LEN = 5
+
+# Per-slot header: seq, width, height, channels, capture timestamp in microseconds.
+_SEQ, _WIDTH, _HEIGHT, _CHANNELS, _TIMESTAMP_US = range(5)
+_SLOT_HEADER_LEN = 5
+
+_ALIGN = 64
+
+
+def _align(n):
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class ShmFrameRing:
+    """
+    Fixed-size ring of frame slots in ``multiprocessing.shared_memory``.
+
+    One process publishes decoded frames, another reads them by slot without the
+    pixel data ever being pickled. Each slot carries a sequence number that the
+    writer invalidates before touching the pixels (a seqlock), so a reader can
+    tell whether a copy it took was overwritten halfway through.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self._owner = owner
+
+        self._header = np.ndarray((_HEADER_LEN,), dtype=np.int64, buffer=shm.buf)
+        self.slot_count = int(self._header[_SLOT_COUNT])
+        self.slot_bytes = int(self._header[_SLOT_BYTES])
+
+        self._slot_headers = np.ndarray(
+            (self.slot_count, _SLOT_HEADER_LEN), dtype=np.int64, buffer=shm.buf, offset=_align(_HEADER_LEN * 8)
+        )
+        self._data_offset = _align(_HEADER_LEN * 8) + _align(self.slot_count * _SLOT_HEADER_LEN * 8)
+        self._next_slot = 0
+
+    @classmethod
+    def create(cls, slot_bytes, slot_count=4):
+        size = (_align(_HEADER_LEN * 8)
+                + _align(slot_count * _SLOT_HEADER_LEN * 8)
+                + slot_count * _align(slot_bytes))
+        shm = shared_memory.SharedMemory(create=True, size=size)
+
+        header = np.ndarray((_HEADER_LEN,), dtype=np.int64, buffer=shm.buf)
+        header[_SLOT_COUNT] = slot_count
+        header[_SLOT_BYTES] = slot_bytes
+        header[_LATEST_SEQ] = 0
+        header[_LATEST_SLOT] = 0
+        header[_READ_SEQ] = 0
+        del header
+
+        ring = cls(shm, owner=True)
+        ring._slot_headers[:, _SEQ] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name):
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def latest_seq(self):
+        return int(self._header[_LATEST_SEQ])
+
+    @property
+    def pending(self):
+        """Frames published but not yet marked read; never more than the ring holds."""
+        return min(self.slot_count, self.latest_seq - int(self._header[_READ_SEQ]))
+
+    def _slot_array(self, slot, width, height, channels):
+        offset = self._data_offset + slot * _align(self.slot_bytes)
+        return np.ndarray((height, width, channels), dtype=np.uint8, buffer=self._shm.buf, offset=offset)
+
+    # -- writer side ---------------------------------------------------------
+
+    def fits(self, frame):
+        return frame.nbytes <= self.slot_bytes
+
+    def publish(self, frame, timestamp=None):
+        """Copy ``frame`` into the next slot and return ``(slot, seq)``."""
+        slot = self._next_slot
+        slot_header = self._slot_headers[slot]
+        slot_header[_SEQ] = 0
+        self._next_slot = (slot + 1) % self.slot_count
+
+        height, width = frame.shape[:2]
+        channels = frame.shape[2] if frame.ndim == 3 else 1
+        seq = self.latest_seq + 1
+
+        self._slot_array(slot, width, height, channels)[...] = frame.reshape(height, width, channels)
+        slot_header[_WIDTH] = width
+        slot_header[_HEIGHT] = height
+        slot_header[_CHANNELS] = channels
+        slot_header[_TIMESTAMP_US] = int((timestamp if timestamp is not None else time.time()) * 1_000_000)
+        slot_header[_SEQ] = seq
+
+        self._header[_LATEST_SLOT] = slot
+        self._header[_LATEST_SEQ] = seq
+        return slot, seq
+
+    # -- reader side ---------------------------------------------------------
+
+    def timestamp(self, slot):
+        return self._slot_headers[slot][_TIMESTAMP_US] / 1_000_000
+
+    def view(self, slot, seq):
+        """Return a zero-copy view of ``slot`` if it still holds frame ``seq``; it may be overwritten later."""
+        slot_header = self._slot_headers[slot]
+        if slot_header[_SEQ] != seq:
+            return None
+        width, height, channels = (int(v) for v in slot_header[_WIDTH:_CHANNELS + 1])
+        return self._slot_array(slot, width, height, channels)
+
+    def copy(self, slot, seq):
+        """Return a private copy of frame ``seq``, or None if it was overwritten meanwhile."""
+        frame = self.view(slot, seq)
+        if frame is None:
+            return None
+        frame = frame.copy()
+        if self._slot_headers[slot][_SEQ] != seq:
+            return None
+        return frame
+
+    def mark_read(self, seq):
+        """Tell the writer this reader is done with every frame up to ``seq``."""
+        self._header[_READ_SEQ] = seq
+
+    def close(self):
+        self._header = None
+        self._slot_headers = None
+        self._shm.close()
+
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
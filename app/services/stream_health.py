@@ -0,0 +1,35 @@
+import random
+from enum import Enum
+
+
+class StreamState(str, Enum):
+    CONNECTING = 'connecting'
+    LIVE = 'live'
+    STALLED = 'stalled'
+    RECONNECTING = 'reconnecting'
+    OFFLINE = 'offline'
+
+
+class Backoff:
+    """
+    Jittered exponential backoff for reconnect attempts.
+
+    Each delay is drawn uniformly from the upper half of the current window
+    ("equal jitter"), so panels that lost their cameras at the same moment do
+    not hammer the encoder in lockstep, yet never retry sooner than half the
+    nominal delay.
+    """
+
+    def __init__(self, base=1.0, factor=2.0, maximum=30.0):
+        self.base = base
+        self.factor = factor
+        self.maximum = maximum
+        self.attempts = 0
+
+    def next(self):
+        window = min(self.maximum, self.base * self.factor ** self.attempts)
+        self.attempts += 1
+        return window / 2 + random.uniform(0, window / 2)
+
+    def reset(self):
+        self.attempts = 0
@@ -0,0 +1,8 @@
+from typing import NamedTuple
+
+
+class StreamInfo(NamedTuple):
+    """Geometry and rate of an opened stream, as reported by the capture backend."""
+    width: int
+    height: int
+    fps: float
@@ -0,0 +1,398 @@
+import hashlib
+import json
+import math
+import os
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+from PySide6.QtCore import QObject, Signal, QRunnable, QThread, QThreadPool, QRect
+from PySide6.QtGui import QPixmap
+
+from app.services.keyframe_index import KeyframeIndex
+from app.services.logger import get_logger
+from app.services.session_manifest import MANIFEST_NAME, recording_parts
+
+THUMBNAIL_DIR = '.thumbnails'
+THUMBNAIL_SIZE = (160, 90)
+FRAME_COUNT = 4             # the poster frame, then previews spread over the recording
+DEFAULT_CACHE_MB = 200
+THUMBNAIL_THREADS = 2
+MEMORY_CACHE_SIZE = 300
+PREVIEW_CACHE_SIZE = 4
+JPEG_QUALITY = 80
+SPRITE_TILE = (128, 72)
+SPRITE_FRAMES = 100
+SPRITE_COLUMNS = 10
+MIN_SPRITE_INTERVAL_MS = 2000
+SPRITE_SUFFIX = '.sprite.jpg'
+SPRITE_META_SUFFIX = '.sprite.json'
+
+
+def recording_mtime(path):
+    """Change marker of a recording: its file, or a session's manifest."""
+    target = os.path.join(path, MANIFEST_NAME) if os.path.isdir(path) else path
+    return os.stat(target).st_mtime
+
+
+def _grab(file, seconds, size):
+    capture = cv2.VideoCapture(file)
+    try:
+        if not capture.isOpened():
+            return None
+        if seconds:
+            # The demuxer jumps to the keyframe before ``seconds`` and decodes from there.
+            capture.set(cv2.CAP_PROP_POS_MSEC, seconds * 1000)
+        ok, frame = capture.read()
+        if not ok and seconds:
+            capture.set(cv2.CAP_PROP_POS_MSEC, 0)
+            ok, frame = capture.read()
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA) if ok else None
+    finally:
+        capture.release()
+
+
+def render_strip(path, count=FRAME_COUNT, size=THUMBNAIL_SIZE):
+    """Poster plus ``count - 1`` previews of ``path`` side by side, or None if nothing decodes."""
+    parts = recording_parts(path)
+    if not parts:
+        return None
+    if len(parts) == 1 and not parts[0][1]:
+        capture = cv2.VideoCapture(parts[0][0])
+        fps, frames = capture.get(cv2.CAP_PROP_FPS), capture.get(cv2.CAP_PROP_FRAME_COUNT)
+        capture.release()
+        parts = [(parts[0][0], frames / fps if fps > 0 and frames > 0 else 0)]
+
+    total = sum(duration or 0 for _, duration in parts)
+    tiles = []
+    decoded = False
+    for i in range(count):
+        # Spread the frames over the whole timeline and find the segment each one falls in.
+        position = total * i / count
+        for file, duration in parts:
+            if position < (duration or 0) or file == parts[-1][0]:
+                break
+            position -= duration or 0
+        tile = _grab(file, position, size)
+        decoded = decoded or tile is not None
+        tiles.append(tile if tile is not None else np.zeros((size[1], size[0], 3), np.uint8))
+    return np.hstack(tiles) if decoded else None
+
+
+class ThumbnailCache:
+    """
+    Thumbnail strips on disk, keyed by recording path and mtime, evicted least recently used first.
+
+    Hits touch the file, so file mtimes double as the LRU order and the cache
+    needs no index of its own.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_CACHE_MB * 2 ** 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total = None    # bytes on disk, counted on the first write
+        os.makedirs(directory, exist_ok=True)
+
+    def file_for(self, path, mtime, suffix='.jpg'):
+        key = hashlib.sha1(f'{os.path.abspath(path)}\0{mtime}'.encode()).hexdigest()
+        return os.path.join(self.directory, key + suffix)
+
+    def get(self, path, mtime, suffix='.jpg'):
+        file = self.file_for(path, mtime, suffix)
+        try:
+            os.utime(file)
+        except OSError:
+            return None
+        return file
+
+    def put(self, path, mtime, image, suffix='.jpg'):
+        ok, data = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+        return self.put_bytes(path, mtime, data.tobytes(), suffix) if ok else None
+
+    def put_bytes(self, path, mtime, data, suffix):
+        file = self.file_for(path, mtime, suffix)
+        with open(file + '.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(file + '.tmp', file)
+        with self._lock:
+            if self._total is None:
+                self._evict()
+            else:
+                self._total += len(data)
+                if self._total > self.max_bytes:
+                    self._evict()
+        return file
+
+    def _evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        # Leave some headroom so the next few writes don't rescan the directory.
+        target = self.max_bytes * 0.9 if total > self.max_bytes else self.max_bytes
+        for _, size, file in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(file)
+            except OSError:
+                continue
+            total -= size
+        self._total = total
+
+
+class ThumbnailSignals(QObject):
+    finished = Signal(str, object)   # recording path, strip file (None if it could not be decoded)
+
+
+class ThumbnailTask(QRunnable):
+    def __init__(self, cache: ThumbnailCache, path):
+        super().__init__()
+        self.signals = ThumbnailSignals()
+        self._cache = cache
+        self._path = path
+        self.logger = get_logger('ThumbnailTask')
+
+    def run(self):
+        file = None
+        try:
+            mtime = recording_mtime(self._path)
+            file = self._cache.get(self._path, mtime)
+            if file is None:
+                strip = render_strip(self._path)
+                if strip is not None:
+                    file = self._cache.put(self._path, mtime, strip)
+        except (OSError, cv2.error) as e:
+            self.logger.warning(f'Could not make a thumbnail for {self._path}: {e}')
+        self.signals.finished.emit(self._path, file)
+
+
+def _part_durations(parts):
+    """Duration (ms) and keyframe index of each file of a recording."""
+    result = []
+    for file, duration in parts:
+        keyframes = KeyframeIndex.load(file)
+        if duration:
+            duration = int(duration * 1000)
+        elif keyframes:
+            duration = keyframes.duration
+        else:
+            capture = cv2.VideoCapture(file)
+            fps, frames = capture.get(cv2.CAP_PROP_FPS), capture.get(cv2.CAP_PROP_FRAME_COUNT)
+            capture.release()
+            duration = int(frames * 1000 / fps) if fps > 0 and frames > 0 else 0
+        result.append((file, duration, keyframes))
+    return result
+
+
+def render_sprite(path, tile=SPRITE_TILE, max_frames=SPRITE_FRAMES, columns=SPRITE_COLUMNS):
+    """
+    ``(sheet, meta)`` of preview frames spread over the recording at ``path``, or None.
+
+    Frames are taken at keyframes, so each one costs a single decode. ``meta``
+    also carries every keyframe's position on the recording's timeline.
+    """
+    parts = _part_durations(recording_parts(path))
+    total = sum(duration for _, duration, _ in parts)
+    if not total:
+        return None
+    count = max(1, min(max_frames, total // MIN_SPRITE_INTERVAL_MS))
+    interval = total / count
+
+    keyframes, offset = [], 0
+    for _, duration, index in parts:
+        if index:
+            keyframes.extend(offset + time for time in index.times)
+        offset += duration
+
+    width, height = tile
+    sheet = np.zeros((math.ceil(count / columns) * height, min(count, columns) * width, 3), np.uint8)
+    decoded = False
+    i, offset = 0, 0
+    for file, duration, index in parts:
+        capture = cv2.VideoCapture(file)
+        last_frame, last_tile = None, None
+        while i < count and (i * interval < offset + duration or file == parts[-1][0]):
+            position = i * interval - offset
+            ok, frame = False, None
+            if index:
+                target = index.frame_before(position)
+                if target == last_frame:
+                    frame, ok = last_tile, last_tile is not None
+                else:
+                    capture.set(cv2.CAP_PROP_POS_FRAMES, target)
+                    last_frame, last_tile = target, None
+            else:
+                capture.set(cv2.CAP_PROP_POS_MSEC, position)
+            if frame is None:
+                ok, frame = capture.read()
+                if ok:
+                    frame = cv2.resize(frame, tile, interpolation=cv2.INTER_AREA)
+                    last_tile = frame
+            if ok:
+                row, column = divmod(i, columns)
+                sheet[row * height:(row + 1) * height, column * width:(column + 1) * width] = frame
+                decoded = True
+            i += 1
+        capture.release()
+        offset += duration
+    if not decoded:
+        return None
+    meta = {'tile': tile, 'columns': columns, 'count': count, 'interval': interval,
+            'duration': total, 'keyframes': keyframes}
+    return sheet, meta
+
+
+class SeekPreview:
+    """A recording's sprite sheet and keyframe positions, for scrubbing without decoding."""
+
+    def __init__(self, sheet, meta):
+        self.sheet = sheet
+        self.tile = tuple(meta['tile'])
+        self.columns = meta['columns']
+        self.count = meta['count']
+        self.interval = meta['interval']
+        self.duration = meta['duration']
+        self.keyframes = KeyframeIndex(meta['keyframes'], [], meta['duration'])
+
+    def frame_at(self, position_ms):
+        """Preview tile (QPixmap) closest before ``position_ms``."""
+        i = min(self.count - 1, max(0, int(position_ms / self.interval)))
+        row, column = divmod(i, self.columns)
+        width, height = self.tile
+        return self.sheet.copy(QRect(column * width, row * height, width, height))
+
+    def keyframe_before(self, position_ms):
+        """Nearest cheap seek target; the position itself when the keyframes are unknown."""
+        return self.keyframes.before(position_ms) if self.keyframes.times else position_ms
+
+
+class SeekPreviewSignals(QObject):
+    finished = Signal(str, object)   # recording path, (sheet file, meta) or None
+
+
+class SeekPreviewTask(QRunnable):
+    def __init__(self, cache: ThumbnailCache, path):
+        super().__init__()
+        self.signals = SeekPreviewSignals()
+        self._cache = cache
+        self._path = path
+        self.logger = get_logger('SeekPreviewTask')
+
+    def run(self):
+        result = None
+        try:
+            mtime = recording_mtime(self._path)
+            sheet_file = self._cache.get(self._path, mtime, SPRITE_SUFFIX)
+            meta_file = self._cache.get(self._path, mtime, SPRITE_META_SUFFIX)
+            if sheet_file and meta_file:
+                with open(meta_file) as f:
+                    result = sheet_file, json.load(f)
+            else:
+                rendered = render_sprite(self._path)
+                if rendered:
+                    sheet, meta = rendered
+                    sheet_file = self._cache.put(self._path, mtime, sheet, SPRITE_SUFFIX)
+                    self._cache.put_bytes(self._path, mtime, json.dumps(meta).encode(), SPRITE_META_SUFFIX)
+                    result = (sheet_file, meta) if sheet_file else None
+        except (OSError, ValueError, cv2.error) as e:
+            self.logger.warning(f'Could not make seek previews for {self._path}: {e}')
+        self.signals.finished.emit(self._path, result)
+
+
+class ThumbnailProvider(QObject):
+    """
+    Poster frames, preview strips and scrubbing sprites for the media player, made on demand.
+
+    ``poster()`` answers from memory or returns None and queues the recording on
+    a low-priority pool; ``ready`` fires once it can answer. Work still queued
+    for rows that scrolled away is dropped with ``cancel_pending()``.
+    ``seek_preview()`` works the same way for the recording being played, ahead
+    of any queued posters, and signals ``preview_ready``.
+    """
+    ready = Signal(str)
+    preview_ready = Signal(str)
+
+    def __init__(self, recordings_dir, max_bytes=DEFAULT_CACHE_MB * 2 ** 20, parent=None):
+        super().__init__(parent)
+        self.cache = ThumbnailCache(os.path.join(recordings_dir, THUMBNAIL_DIR), max_bytes)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(THUMBNAIL_THREADS)
+        self._pool.setThreadPriority(QThread.LowestPriority)
+        self._pending = {}
+        self._strips = OrderedDict()   # path -> (poster pixmap, strip file); None when undecodable
+        self._previews = OrderedDict()   # path -> SeekPreview; None when undecodable
+        self._pending_previews = {}
+
+    def poster(self, path):
+        if path in self._strips:
+            self._strips.move_to_end(path)
+            entry = self._strips[path]
+            return entry[0] if entry else None
+        if path not in self._pending:
+            task = ThumbnailTask(self.cache, path)
+            task.signals.finished.connect(self._on_finished)
+            self._pending[path] = task
+            self._pool.start(task)
+        return None
+
+    def seek_preview(self, path):
+        if path in self._previews:
+            self._previews.move_to_end(path)
+            return self._previews[path]
+        if path not in self._pending_previews:
+            task = SeekPreviewTask(self.cache, path)
+            task.signals.finished.connect(self._on_preview_finished)
+            self._pending_previews[path] = task
+            self._pool.start(task, 1)
+        return None
+
+    def strip_file(self, path):
+        entry = self._strips.get(path)
+        return entry[1] if entry else None
+
+    def forget(self, path):
+        self._strips.pop(path, None)
+        self._previews.pop(path, None)
+
+    def cancel_pending(self):
+        for path, task in list(self._pending.items()):
+            if self._pool.tryTake(task):
+                del self._pending[path]
+
+    def _on_finished(self, path, file):
+        self._pending.pop(path, None)
+        entry = None
+        if file:
+            strip = QPixmap(file)
+            if not strip.isNull():
+                width, height = THUMBNAIL_SIZE
+                entry = (strip.copy(QRect(0, 0, width, height)), file)
+        self._strips[path] = entry
+        while len(self._strips) > MEMORY_CACHE_SIZE:
+            self._strips.popitem(last=False)
+        if entry:
+            self.ready.emit(path)
+
+    def _on_preview_finished(self, path, result):
+        self._pending_previews.pop(path, None)
+        preview = None
+        if result:
+            sheet = QPixmap(result[0])
+            if not sheet.isNull():
+                preview = SeekPreview(sheet, result[1])
+        self._previews[path] = preview
+        while len(self._previews) > PREVIEW_CACHE_SIZE:
+            self._previews.popitem(last=False)
+        if preview:
+            self.preview_ready.emit(path)
+
+    def shutdown(self):
+        self._pool.clear()
+        self._pool.waitForDone()
@@ -0,0 +1,50 @@
+import math
+from typing import NamedTuple
+
+DEFAULT_CAMERA_COUNT = 4
+MAX_CAMERAS = 64
+DEFAULT_LAYOUT = '2x2'
+
+
+class Cell(NamedTuple):
+    row: int
+    col: int
+    row_span: int = 1
+    col_span: int = 1
+
+
+class WallLayout(NamedTuple):
+    """A page of the camera wall: a ``rows`` x ``cols`` grid and the cells cameras fill, in order."""
+    name: str
+    rows: int
+    cols: int
+    cells: tuple
+
+    def pages(self, camera_count):
+        return max(1, math.ceil(camera_count / len(self.cells)))
+
+    def cell(self, camera_index):
+        """Page and cell of the ``camera_index``-th camera."""
+        page, slot = divmod(camera_index, len(self.cells))
+        return page, self.cells[slot]
+
+
+def grid(rows, cols):
+    return WallLayout(f'{rows}x{cols}', rows, cols,
+                      tuple(Cell(row, col) for row in range(rows) for col in range(cols)))
+
+
+def featured(size, span):
+    """A ``size`` x ``size`` grid whose top-left ``span`` x ``span`` corner is one large cell."""
+    cells = [Cell(0, 0, span, span)]
+    cells += [Cell(row, col) for row in range(size) for col in range(size) if row >= span or col >= span]
+    return WallLayout(f'1+{len(cells) - 1}', size, size, tuple(cells))
+
+
+LAYOUTS = {layout.name: layout for layout in (
+    grid(1, 1), grid(2, 2), featured(3, 2), grid(3, 3), featured(4, 3), grid(4, 4), grid(5, 5), grid(6, 6),
+)}
+
+
+def layout_for(name):
+    return LAYOUTS.get(name) or LAYOUTS[DEFAULT_LAYOUT]
@@ -0,0 +1,62 @@
+import numpy as np
+from PySide6.QtCore import Signal
+from PySide6.QtGui import QImage, QPainter, QColor
+from PySide6.QtWidgets import QWidget
+
+from app.services.activity_index import EVENT_THRESHOLD
+
+# A score this many times the event threshold is drawn at full strength.
+FULL_SCALE = 4
+
+
+class ActivityStrip(QWidget):
+    """Heat strip of a recording's per-second motion scores, drawn under the seek slider; a click seeks."""
+    seek_requested = Signal(int)   # position (ms)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFixedHeight(14)
+        self._scores = np.zeros(0, np.float32)
+        self._duration = 0
+        self._image = None
+
+    def set_activity(self, scores):
+        self._scores = np.asarray(scores, np.float32)
+        self._image = None
+        self.update()
+
+    def set_duration(self, duration):
+        if duration != self._duration:
+            self._duration = duration
+            self._image = None
+            self.update()
+
+    def _render(self, width):
+        """One row of ``width`` pixels, each the strongest second it covers."""
+        seconds = min(len(self._scores), int(np.ceil(self._duration / 1000))) if self._duration else len(self._scores)
+        rgba = np.zeros((1, width, 4), np.uint8)
+        if seconds:
+            span = (self._duration / 1000 if self._duration else seconds) / width
+            starts = np.minimum((np.arange(width) * span).astype(np.int64), seconds - 1)
+            columns = np.maximum.reduceat(self._scores[:seconds], starts)
+            strength = np.clip(columns / (EVENT_THRESHOLD * FULL_SCALE), 0, 1)
+            rgba[0, :, 0] = 255
+            rgba[0, :, 1] = (160 * (1 - strength)).astype(np.uint8)
+            rgba[0, :, 3] = (255 * strength).astype(np.uint8)
+        return QImage(rgba.data, width, 1, 4 * width, QImage.Format_RGBA8888).copy()
+
+    def paintEvent(self, event):
+        rect = self.contentsRect()
+        painter = QPainter(self)
+        painter.fillRect(rect, QColor('#333'))
+        if len(self._scores) and rect.width() > 0:
+            if self._image is None or self._image.width() != rect.width():
+                self._image = self._render(rect.width())
+            painter.drawImage(rect, self._image)
+        painter.end()
+
+    def mousePressEvent(self, event):
+        rect = self.contentsRect()
+        if self._duration and rect.width() > 0:
+            x = min(max(0, event.position().x() - rect.left()), rect.width())
+            self.seek_requested.emit(int(x / rect.width() * self._duration))
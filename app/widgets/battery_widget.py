@@ -1,11 +1,13 @@
 
 import psutil
 
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, Signal
 from PySide6.QtSvgWidgets import QSvgWidget
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QLabel
 
 class BatteryWidget(QWidget):
+    level_changed = Signal(object)  # percent, or None without a battery
+
     def __init__(self):
         super().__init__()
         self.percentage_label = QLabel("0%")
@@ -32,11 +34,13 @@ class BatteryWidget(QWidget):
         if battery is None:
             self.percentage_label.setText("N/A")
             self.svg_widget.hide()
+            self.level_changed.emit(None)
             return
 
         level = battery.percent
         charging = battery.power_plugged
         self.percentage_label.setText(f"{level}%")
+        self.level_changed.emit(level)
         self.svg_widget.show()
 
         color = "green" if level >= 50 else "orange" if level >= 20 else "red"
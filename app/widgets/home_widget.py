@@ -1,82 +1,150 @@
-
-
-from PySide6.QtCore import QSettings
-from PySide6.QtWidgets import QWidget, QGridLayout, QSizePolicy, QApplication
+from PySide6.QtCore import QSettings, Qt
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel, QPushButton, QApplication
 
 from app import APP_NAME
 
+from app.services import axis
 from app.services.logger import get_logger
-from app.widgets.panel_widget import PanelWidget
+from app.services.wall_layout import DEFAULT_CAMERA_COUNT, DEFAULT_LAYOUT, MAX_CAMERAS, Cell, layout_for
+from app.widgets.video_wall import VideoWall
+from app.widgets.wall_panel import WallPanel
 
 class HomeWidget(QWidget):
-    def __init__(self):
+    """
+    The camera wall: ``cameras/count`` panels placed by the ``wall/layout`` layout,
+    a page at a time when they don't all fit. Cameras off the shown page keep
+    recording and watching for motion.
+    """
+    def __init__(self, recording_service=None):
         super().__init__()
         self.logger = get_logger('HomeWidget')
-
-        self.grid_layout = QGridLayout()
-        self.grid_layout.setSpacing(20)
-        self.grid_layout.setContentsMargins(20, 20, 20, 20)
+        self.recording_service = recording_service
+
+        self.wall = VideoWall()
+        self.wall.doubleClicked.connect(self.toggle_panel_view)
+
+        self.prev_btn = QPushButton("◀")
+        self.next_btn = QPushButton("▶")
+        for btn in (self.prev_btn, self.next_btn):
+            btn.setFixedSize(60, 36)
+            btn.setStyleSheet(self.btn_style())
+        self.prev_btn.clicked.connect(lambda: self.show_page(self.page - 1))
+        self.next_btn.clicked.connect(lambda: self.show_page(self.page + 1))
+        self.page_label = QLabel()
+        self.page_label.setAlignment(Qt.AlignCenter)
+        self.page_label.setStyleSheet("color: white; font-size: 16px; padding: 0 12px;")
+
+        page_bar = QHBoxLayout()
+        page_bar.setContentsMargins(0, 0, 0, 10)
+        page_bar.addStretch()
+        page_bar.addWidget(self.prev_btn)
+        page_bar.addWidget(self.page_label)
+        page_bar.addWidget(self.next_btn)
+        page_bar.addStretch()
+        self.page_bar = QWidget()
+        self.page_bar.setLayout(page_bar)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        layout.addWidget(self.wall, 1)
+        layout.addWidget(self.page_bar)
 
         self.settings = QSettings(APP_NAME, "AxisApp")
 
         self.panels = []
-
-        for row in range(2):
-            for col in range(2):
-                panel_index = row * 2 + col + 1
-
-                stream_nickname = self.settings.value(f"device_{panel_index - 1}/name")
-                stream_ip = self.settings.value(f"device_{panel_index - 1}/ip")
-
-                panel_title = stream_nickname if stream_nickname else f'Panel {panel_index}'
-
-                panel = PanelWidget(panel_title, stream_ip=stream_ip, panel_index=panel_index -1)
-
-                panel.doubleClicked.connect(self.toggle_panel_view)
-                self.grid_layout.addWidget(panel, row, col)
-                self.panels.append(panel)
-
-        self.single_panel_mode = False
+        self.page = 0
+        self.wall_layout = None
         self.single_panel_widget = None
-        self.setLayout(self.grid_layout)
-        self.logger.debug(f'video label size: {self.panels[0].video_label.size()}')
-
-    def toggle_panel_view(self, panel_title):
-        if not self.single_panel_mode:
-            # Save current layout state
-            for panel in self.panels:
-                panel._original_size_policy = panel.sizePolicy()
-                panel._original_min_size = panel.minimumSize()
-
-            # Find and isolate the clicked panel
-            for panel in self.panels:
-                if panel.title == panel_title:
-                    self.single_panel_widget = panel
-                    break
-
-            for panel in self.panels:
-                panel.setVisible(False)
-
-            self.grid_layout.addWidget(self.single_panel_widget, 0, 0, 2, 2)
-            self.single_panel_widget.setVisible(True)
-            self.single_panel_mode = True
-
+        self.sync_cameras()
+
+    def btn_style(self):
+        return """
+            QPushButton {
+                background-color: #444;
+                color: white;
+                font-size: 18px;
+                border: none;
+                border-radius: 5px;
+            }
+            QPushButton:hover {
+                background-color: #555;
+            }
+            QPushButton:disabled {
+                color: #777;
+            }
+        """
+
+    def sync_cameras(self):
+        """Add or remove panels to match the configured camera count, and lay the wall out again."""
+        self.wall_layout = layout_for(self.settings.value("wall/layout", DEFAULT_LAYOUT))
+        count = min(MAX_CAMERAS, max(1, int(self.settings.value("cameras/count", DEFAULT_CAMERA_COUNT))))
+        self._leave_single_panel()
+
+        while len(self.panels) > count:
+            panel = self.panels.pop()
+            panel.close()
+            panel.deleteLater()
+        for panel_index in range(len(self.panels), count):
+            self.panels.append(self._create_panel(panel_index))
+
+        self.show_page(min(self.page, self.wall_layout.pages(count) - 1))
+
+    def _create_panel(self, panel_index):
+        stream_nickname = self.settings.value(f"device_{panel_index}/name")
+        stream_ip = self.settings.value(f"device_{panel_index}/ip")
+        panel_title = stream_nickname if stream_nickname else f'Panel {panel_index + 1}'
+
+        _, cell = self.wall_layout.cell(panel_index)
+        return WallPanel(panel_title, stream_ip=stream_ip, panel_index=panel_index,
+                         recording_service=self.recording_service, tile_size=self._tile_size(cell), parent=self)
+
+    def _tile_size(self, cell):
+        """Rough size of a panel in ``cell``: from the wall once it is shown, before that from the screen."""
+        if self.isVisible():
+            size = self.size()
+        elif QApplication.primaryScreen():
+            size = QApplication.primaryScreen().availableSize()
         else:
-            for i, panel in enumerate(self.panels):
-                row = i // 2
-                col = i % 2
-                self.grid_layout.addWidget(panel, row, col)
-                panel.setVisible(True)
-
-                # Restore original size policy and size
-                if hasattr(panel, '_original_min_size'):
-                    panel.setMinimumSize(panel._original_min_size)
-                if hasattr(panel, '_original_size_policy'):
-                    panel.setSizePolicy(panel._original_size_policy)
-
-                panel.updateGeometry()
-
-            self.single_panel_mode = False
-            self.single_panel_widget = None
-            self.grid_layout.invalidate()
-            self.updateGeometry()
+            return None
+        return (size.width() // self.wall_layout.cols * cell.col_span,
+                size.height() // self.wall_layout.rows * cell.row_span)
+
+    def show_page(self, page):
+        self._leave_single_panel()
+        layout = self.wall_layout
+        pages = layout.pages(len(self.panels))
+        self.page = max(0, min(page, pages - 1))
+
+        on_page = []
+        for panel_index, panel in enumerate(self.panels):
+            panel_page, cell = layout.cell(panel_index)
+            if panel_page == self.page:
+                on_page.append((panel, cell))
+        self.wall.set_panels(on_page, layout.rows, layout.cols, self._spacing())
+
+        self.page_label.setText(f"Page {self.page + 1} / {pages}")
+        self.prev_btn.setEnabled(self.page > 0)
+        self.next_btn.setEnabled(self.page < pages - 1)
+        self.page_bar.setVisible(pages > 1)
+
+    def _spacing(self):
+        return 20 if self.wall_layout.cols <= 2 else 8
+
+    def toggle_panel_view(self, panel):
+        if self.single_panel_widget is not None:
+            self.show_page(self.page)
+            return
+
+        # Isolate the clicked panel over the whole page, at full resolution.
+        self.wall.set_panels([(panel, Cell(0, 0))], 1, 1, self._spacing())
+        panel.set_stream_profile(axis.FULL_PROFILE)
+        self.single_panel_widget = panel
+        self.page_bar.setVisible(False)
+
+    def _leave_single_panel(self):
+        panel = self.single_panel_widget
+        if panel is None:
+            return
+        self.single_panel_widget = None
+        panel.set_stream_profile(axis.GRID_PROFILE)
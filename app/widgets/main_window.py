@@ -11,7 +11,10 @@ from PySide6.QtWidgets import (
 
 from app import RECORDINGS_DIR, APP_NAME
 
+from app.services import retention
 from app.services.logger import get_logger
+from app.services.recording_service import RecordingService
+from app.services.recordings_catalog import RecordingsCatalog
 from app.services.refresh import RefreshTask
 from app.widgets.battery_widget import BatteryWidget
 from app.widgets.home_widget import HomeWidget
@@ -40,9 +43,16 @@ class MainWindow(QMainWindow):
 
         self.stack = QStackedWidget()
 
-        self.home = HomeWidget()
+        self.recording_service = RecordingService(parent=self)
+        self.recording_service.recorder_failed.connect(self.on_recorder_failed)
+        self.catalog = RecordingsCatalog(RECORDINGS_DIR, parent=self)
+        self.recording_service.recorder_stopped.connect(
+            lambda recorder_id, stats: self.catalog.update(stats['output_path'])
+        )
+
+        self.home = HomeWidget(self.recording_service)
         self.settings_page = SettingsWidget()
-        self.media_player_page = MediaPlayerWidget(RECORDINGS_DIR)
+        self.media_player_page = MediaPlayerWidget(RECORDINGS_DIR, self.catalog)
 
         self.stack.addWidget(self.home)
         self.stack.addWidget(self.settings_page)
@@ -106,6 +116,8 @@ class MainWindow(QMainWindow):
         self.battery_widget.setGeometry(20, -10, 70, 35) # x, y, w, h
         self.battery_widget.setAttribute(Qt.WA_TransparentForMouseEvents)
         self.battery_widget.raise_()
+        self.battery_widget.level_changed.connect(self.update_battery_overlay)
+        self.battery_widget.update_battery()
 
         # Recording indicator setup (red dot)
         self.recording_dot = QLabel(self.stack)
@@ -120,22 +132,37 @@ class MainWindow(QMainWindow):
         self.recording_dot.setAttribute(Qt.WA_TransparentForMouseEvents)
         self.recording_dot.raise_()
 
+        self.recording_stats_timer = QTimer(self)
+        self.recording_stats_timer.timeout.connect(self.update_recording_stats)
+        self.recording_stats_timer.start(2000)
+
+        self.retention_timer = QTimer(self)
+        self.retention_timer.timeout.connect(self.enforce_retention)
+        self.retention_timer.start(retention.CHECK_INTERVAL_MS)
+        self.enforce_retention()
+
     def on_refresh_clicked(self):
         # 1) Disable button for 4 seconds and show busy text
         self.refresh_btn.setEnabled(False)
         self.refresh_btn.setText("Refreshing…")
         QTimer.singleShot(4000, self._reenable_refresh_btn)
 
-        # 2) Start background task that *signals* the main thread to refresh each panel
-        task = RefreshTask(self.home.panels)
+        # 2) Start background task that probes every camera concurrently and *signals*
+        #    the main thread to refresh each panel once its probe is done
+        self.home.sync_cameras()
+        for panel in self.home.panels:
+            if self._recording and not panel.channel.is_recording:
+                panel.start_recording_thread()  # cameras added since recording started
+            panel.load_config()
+        task = RefreshTask([(panel, panel.video_url) for panel in self.home.panels])
         task.signals.refresh_panel.connect(self._refresh_one_panel)  # runs in main thread
         task.signals.finished.connect(self._refresh_finished)
         self.threadpool.start(task)
 
-    def _refresh_one_panel(self, panel):
+    def _refresh_one_panel(self, panel, probe_result):
         # Safe: this runs in the GUI thread
-        panel.video_label.setText("Refreshing...")
-        panel.refresh_video()
+        panel.set_message("Refreshing...")
+        panel.refresh_video(probe_result)
 
     def _refresh_finished(self):
         # Optional: log or update UI; button re-enable is handled by the timer above
@@ -182,7 +209,7 @@ class MainWindow(QMainWindow):
 
     def refresh_all_videos(self):
         for panel in self.home.panels:
-            panel.video_label.setText("Refreshing...")
+            panel.set_message("Refreshing...")
             panel.refresh_video()
 
     def toggle_recording(self):
@@ -195,6 +222,7 @@ class MainWindow(QMainWindow):
             self._recording = True
             self.recording_btn.setText("Stop Recording")
             self.recording_dot.setVisible(True)
+            self.logger.debug(f'recorders: {self.recording_service.status()}')
         else:
             self.logger.debug(f'trying to stop recording')
             for panel in self.home.panels:
@@ -203,6 +231,45 @@ class MainWindow(QMainWindow):
             self.recording_btn.setText("Start Recording")
             self.recording_dot.setVisible(False)
 
+    def update_battery_overlay(self, level):
+        show = level is not None and self.settings.value("overlay/battery", False, type=bool)
+        self.recording_service.set_overlay_field('battery', f'{round(level)}%' if show else None)
+
+    def update_recording_stats(self):
+        lines = []
+        buffer_bytes = 0
+        for stats in self.recording_service.stats().values():
+            buffer_bytes += stats['buffer_bytes']
+            line = f"{stats['panel']}: {stats['state']}"
+            if stats['buffer_bytes']:
+                line += f", pre-event {stats['buffer_seconds']}s in {stats['buffer_bytes'] / 2 ** 20:.1f} MB"
+            if stats['state'] != 'buffering':
+                line += (f", {stats['frames']} frames, {stats['dropped']} dropped, {stats['encode_ms']} ms/frame, "
+                         f"{stats['queued_bytes'] / 2 ** 20:.0f} MB queued, {stats['lag_ms']} ms behind")
+            lines.append(line)
+        if buffer_bytes:
+            lines.append(f"Pre-event memory: {buffer_bytes / 2 ** 20:.1f} MB")
+        self.recording_btn.setToolTip("\n".join(lines))
+        self.recording_dot.setVisible(self._recording or any(panel.motion_recording for panel in self.home.panels))
+
+    def enforce_retention(self):
+        # Scanning and deleting run on the thread pool; the disk may be slow.
+        task = retention.RetentionTask(RECORDINGS_DIR, retention.RetentionPolicy.from_settings(self.settings))
+        task.signals.finished.connect(self.on_retention_finished)
+        self.threadpool.start(task)
+
+    def on_retention_finished(self, deleted):
+        # A deleted segment changes its session; a deleted loose MP4 is its own entry.
+        entries = set()
+        for path in deleted:
+            parent = os.path.dirname(path)
+            entries.add(path if os.path.normpath(parent) == self.catalog.root else parent)
+        if entries:
+            self.catalog.update(*entries)
+
+    def on_recorder_failed(self, recorder_id, message):
+        self.logger.warning(f'Recording {recorder_id} failed: {message}')
+
     def confirm_shutdown(self):
         msg_box = QMessageBox(
             QMessageBox.Question,
@@ -261,7 +328,9 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         for panel in self.home.panels:
-            if panel.video_thread and panel.video_thread.isRunning():
-                panel.video_thread.stop()
-                panel.stop_recording()
+            panel.channel.close()
+        self.recording_service.shutdown()
+        self.media_player_page.thumbnails.shutdown()
+        self.media_player_page.activity.shutdown()
+        self.catalog.close()
         super().closeEvent(event)
\ No newline at end of file
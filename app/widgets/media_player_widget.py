@@ -1,21 +1,54 @@
 import os
-from PySide6.QtCore import Qt, QUrl, QSize, QTime
+import time
+from datetime import datetime
+from PySide6.QtCore import Qt, QSize, QTime, QTimer, QPoint
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QPushButton,
-    QLabel, QListWidgetItem, QSlider, QFrame
+    QWidget, QVBoxLayout, QHBoxLayout, QListView, QPushButton,
+    QLabel, QSlider, QFrame, QComboBox, QStyle, QStackedWidget
 )
-from PySide6.QtMultimedia import QMediaPlayer
 from PySide6.QtMultimediaWidgets import QVideoWidget
 
+from app.services.activity_index import ActivityIndex
+from app.services.activity_scanner import ActivityIndexer
+from app.services.recordings_catalog import RecordingsCatalog
+from app.services.thumbnails import THUMBNAIL_SIZE, ThumbnailProvider
+from app.widgets.activity_strip import ActivityStrip
+from app.widgets.recording_player import RecordingPlayer
+from app.widgets.recordings_model import RecordingsModel
+from app.widgets.sync_playback_widget import SyncPlaybackWidget, overlapping_recordings
+
+
+SCRUB_SEEK_MS = 200     # at most one decoder seek per interval while the slider is dragged
+EVENT_LEAD_SECONDS = 2  # jumping to an event starts this much before it
+PERIODS = (("All time", None), ("Last 24 hours", 86400), ("Last 7 days", 7 * 86400), ("Last 30 days", 30 * 86400))
+
 
 class MediaPlayerWidget(QWidget):
-    def __init__(self, recordings_dir):
+    def __init__(self, recordings_dir, catalog: RecordingsCatalog = None):
         super().__init__()
         self.recordings_dir = recordings_dir
-
-        self.player = QMediaPlayer()
+        self.catalog = catalog or RecordingsCatalog(recordings_dir, parent=self)
+        self.catalog.changed.connect(self.on_catalog_changed)
+        self.thumbnails = ThumbnailProvider(recordings_dir, parent=self)
+        self.model = RecordingsModel(self.catalog, self.thumbnails, self)
+        self.thumbnails.preview_ready.connect(self._on_preview_ready)
+        self.seek_preview = None
+        self.activity = ActivityIndexer(self)
+        self.activity.ready.connect(self._on_activity_ready)
+        self.activity_index = ActivityIndex([])
+
+        # Dragging shows sprite frames at once and only seeks to the latest target every SCRUB_SEEK_MS.
+        self._scrub_target = None
+        self._scrub_timer = QTimer(self)
+        self._scrub_timer.setSingleShot(True)
+        self._scrub_timer.setInterval(SCRUB_SEEK_MS)
+        self._scrub_timer.timeout.connect(self._seek_scrub_target)
+
+        # A recording session plays as one timeline over its segments.
+        self.player = RecordingPlayer(self)
         self.player.durationChanged.connect(self.update_duration)
         self.player.positionChanged.connect(self.update_position)
+        self.player.ended.connect(self.stop_video)
 
         main_layout = QHBoxLayout(self)
         main_layout.setContentsMargins(20, 20, 20, 20)
@@ -41,28 +74,59 @@ class MediaPlayerWidget(QWidget):
             }
         """)
 
-        self.list_widget = QListWidget()
-        self.list_widget.setFrameShape(QFrame.NoFrame)
-        self.list_widget.setStyleSheet("""
-            QListWidget {
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setFrameShape(QFrame.NoFrame)
+        self.list_view.setIconSize(QSize(*THUMBNAIL_SIZE))
+        # Every row has the same height, so the view never measures the whole model.
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setEditTriggers(QListView.NoEditTriggers)
+        # Thumbnails still queued for rows that scrolled away are dropped; painting re-requests the visible ones.
+        self.list_view.verticalScrollBar().valueChanged.connect(self.thumbnails.cancel_pending)
+        self.list_view.setStyleSheet("""
+            QListView {
                 background-color: #2a2a2a;
                 color: white;
                 font-size: 16px;
                 border-radius: 15px;
                 padding: 10px;
             }
-            QListWidget::item {
+            QListView::item {
                 padding: 18px;
                 margin-bottom: 6px;
                 border-radius: 10px;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #444;
             }
         """)
 
+        combo_style = """
+            QComboBox {
+                background-color: #2a2a2a;
+                color: white;
+                font-size: 16px;
+                border-radius: 10px;
+                padding: 8px;
+            }
+        """
+        self.camera_combo = QComboBox()
+        self.camera_combo.addItem("All cameras", None)
+        self.period_combo = QComboBox()
+        for text, seconds in PERIODS:
+            self.period_combo.addItem(text, seconds)
+        self.order_combo = QComboBox()
+        self.order_combo.addItem("Newest first", Qt.DescendingOrder)
+        self.order_combo.addItem("Oldest first", Qt.AscendingOrder)
+        filter_layout = QHBoxLayout()
+        for combo in (self.camera_combo, self.period_combo, self.order_combo):
+            combo.setStyleSheet(combo_style)
+            combo.currentIndexChanged.connect(self.load_video_list)
+            filter_layout.addWidget(combo)
+
         left_panel.addWidget(self.refresh_btn)
-        left_panel.addWidget(self.list_widget)
+        left_panel.addLayout(filter_layout)
+        left_panel.addWidget(self.list_view)
 
         right_panel = QVBoxLayout()
         right_panel.setSpacing(20)
@@ -105,13 +169,31 @@ class MediaPlayerWidget(QWidget):
                 border-radius: 16px;
             }
         """)
-        self.seek_slider.sliderMoved.connect(self.seek_video)
+        self.seek_slider.sliderMoved.connect(self.scrub_to)
+        self.seek_slider.sliderReleased.connect(self.finish_scrub)
+
+        self.scrub_preview = QLabel(self)
+        self.scrub_preview.setStyleSheet("border: 2px solid #0078d4; border-radius: 4px; background-color: black;")
+        self.scrub_preview.hide()
 
         self.total_time_label = QLabel("00:00")
         self.total_time_label.setStyleSheet("color: white; font-size: 20px; font-weight: bold;")
 
+        self.wall_time_label = QLabel("")
+        self.wall_time_label.setStyleSheet("color: #aaa; font-size: 16px;")
+
+        # Motion per second of the recording, lined up with the slider's handle travel.
+        self.activity_strip = ActivityStrip()
+        self.activity_strip.setContentsMargins(16, 0, 16, 0)
+        self.activity_strip.seek_requested.connect(self.seek_video)
+        slider_layout = QVBoxLayout()
+        slider_layout.setSpacing(0)
+        slider_layout.addWidget(self.seek_slider)
+        slider_layout.addWidget(self.activity_strip)
+
+        seek_layout.addWidget(self.wall_time_label)
         seek_layout.addWidget(self.current_time_label)
-        seek_layout.addWidget(self.seek_slider, 1)
+        seek_layout.addLayout(slider_layout, 1)
         seek_layout.addWidget(self.total_time_label)
 
         controls_layout = QHBoxLayout()
@@ -121,8 +203,14 @@ class MediaPlayerWidget(QWidget):
         self.play_pause_btn = QPushButton("▶️ Play")
         self.stop_btn = QPushButton("⏹ Stop")
         self.forward_btn = QPushButton("10s ⏩")
-
-        buttons = [self.rewind_btn, self.play_pause_btn, self.stop_btn, self.forward_btn]
+        self.sync_btn = QPushButton("🔲 All")
+        self.previous_event_btn = QPushButton("⏮ Event")
+        self.next_event_btn = QPushButton("Event ⏭")
+        self.previous_event_btn.setEnabled(False)
+        self.next_event_btn.setEnabled(False)
+
+        buttons = [self.previous_event_btn, self.rewind_btn, self.play_pause_btn, self.stop_btn,
+                   self.forward_btn, self.next_event_btn, self.sync_btn]
         for btn in buttons:
             btn.setFixedSize(150, 70)
             btn.setStyleSheet("""
@@ -145,18 +233,30 @@ class MediaPlayerWidget(QWidget):
         right_panel.addLayout(seek_layout)
         right_panel.addLayout(controls_layout)
 
+        # The single player and the synchronized all-cameras view share the right side.
+        single_page = QWidget()
+        single_page.setLayout(right_panel)
+        self.sync_view = SyncPlaybackWidget()
+        self.sync_view.closed.connect(lambda: self.right_stack.setCurrentIndex(0))
+        self.right_stack = QStackedWidget()
+        self.right_stack.addWidget(single_page)
+        self.right_stack.addWidget(self.sync_view)
+
         # Add to main layout
         main_layout.addLayout(left_panel, 1)
-        main_layout.addLayout(right_panel, 2)
+        main_layout.addWidget(self.right_stack, 2)
 
-        self.player.setVideoOutput(self.video_widget)
+        self.player.set_video_output(self.video_widget)
 
-        self.refresh_btn.clicked.connect(self.load_video_list)
-        self.list_widget.itemDoubleClicked.connect(self.play_selected_video)
+        self.refresh_btn.clicked.connect(self.catalog.rescan)
+        self.list_view.doubleClicked.connect(self.play_selected_video)
         self.play_pause_btn.clicked.connect(self.toggle_play_pause)
         self.stop_btn.clicked.connect(self.stop_video)
+        self.sync_btn.clicked.connect(self.play_all_cameras)
         self.rewind_btn.clicked.connect(lambda: self.skip_seconds(-10))
         self.forward_btn.clicked.connect(lambda: self.skip_seconds(10))
+        self.previous_event_btn.clicked.connect(self.previous_event)
+        self.next_event_btn.clicked.connect(self.next_event)
 
         self.load_video_list()
 
@@ -164,37 +264,74 @@ class MediaPlayerWidget(QWidget):
         self.current_video_path = None
 
     def load_video_list(self):
-        """Load MP4 recordings into the list."""
-        self.list_widget.clear()
-        if not os.path.exists(self.recordings_dir):
-            os.makedirs(self.recordings_dir)
-
-        videos = [f for f in os.listdir(self.recordings_dir) if f.endswith(".mp4")]
-        videos.sort(reverse=True)
-
-        if not videos:
+        """List recordings from the catalog, filtered and ordered by the selectors."""
+        self._update_cameras()
+        self.model.newest_first = self.order_combo.currentData() == Qt.DescendingOrder
+        self.model.set_filter(camera=self.camera_combo.currentData(), since=self._since())
+        if not self.model.rowCount():
             self.video_title.setText("⚠️ No recordings found.")
-            return
 
-        for video in videos:
-            item = QListWidgetItem(f"📹 {video}")
-            item.setSizeHint(item.sizeHint() + QSize(0, 25))  # More padding for tablet
-            self.list_widget.addItem(item)
+    def on_catalog_changed(self):
+        """Re-query without losing the rows already paged in or the selection."""
+        self._update_cameras()
+        selected = self.list_view.currentIndex().data(Qt.UserRole)
+        self.model.since = self._since()
+        self.model.reload()
+        if selected and self.model.row_of(selected) >= 0:
+            self.list_view.setCurrentIndex(self.model.index(self.model.row_of(selected)))
+
+    def _since(self):
+        period = self.period_combo.currentData()
+        return time.time() - period if period else None
+
+    def _update_cameras(self):
+        cameras = self.catalog.cameras()
+        current = self.camera_combo.currentData()
+        if cameras == [self.camera_combo.itemData(i) for i in range(1, self.camera_combo.count())]:
+            return
+        self.camera_combo.blockSignals(True)
+        self.camera_combo.clear()
+        self.camera_combo.addItem("All cameras", None)
+        for camera in cameras:
+            self.camera_combo.addItem(camera, camera)
+        self.camera_combo.setCurrentIndex(max(0, self.camera_combo.findData(current)))
+        self.camera_combo.blockSignals(False)
 
     def play_selected_video(self):
         """Play the selected video when double-clicked."""
-        selected = self.list_widget.currentItem()
-        if not selected:
+        selected = self.list_view.currentIndex()
+        if not selected.isValid():
             return
 
-        self.current_video_path = os.path.join(self.recordings_dir, selected.text()[2:])
-        self.player.setSource(QUrl.fromLocalFile(self.current_video_path))
+        self.sync_view.stop()
+        self.right_stack.setCurrentIndex(0)
+        self.current_video_path = selected.data(Qt.UserRole)
+        self.seek_preview = self.thumbnails.seek_preview(self.current_video_path)
+        self._load_activity()
+        name = os.path.basename(self.current_video_path)
+        recording = self.model.recording(selected.row())
+        if not self.player.load(self.current_video_path, recording.started_at, recording.duration):
+            self.video_title.setText(f"⚠️ No segments left in {name}")
+            return
         self.player.play()
 
-        self.video_title.setText(f"▶️ Playing: {selected.text()[2:]}")
+        self.video_title.setText(f"▶️ Playing: {name}")
         self.play_pause_btn.setText("⏸ Pause")
         self.is_playing = True
 
+    def play_all_cameras(self):
+        """Play the selected recording next to what the other cameras recorded at the same time."""
+        selected = self.list_view.currentIndex()
+        if not selected.isValid():
+            return
+        recording = self.model.recording(selected.row())
+        if not recording.started_at:
+            self.video_title.setText("⚠️ Recording time unknown")
+            return
+        self.stop_video()
+        self.right_stack.setCurrentIndex(1)
+        self.sync_view.load(overlapping_recordings(self.catalog, recording))
+
     def toggle_play_pause(self):
         if self.is_playing:
             self.player.pause()
@@ -211,23 +348,107 @@ class MediaPlayerWidget(QWidget):
 
     def update_duration(self, duration):
         self.seek_slider.setRange(0, duration)
+        self.activity_strip.set_duration(duration)
         self.total_time_label.setText(self.format_time(duration))
 
     def update_position(self, position):
+        if self.seek_slider.isSliderDown():
+            return
         self.seek_slider.blockSignals(True)
         self.seek_slider.setValue(position)
         self.seek_slider.blockSignals(False)
         self.current_time_label.setText(self.format_time(position))
+        captured = self.wall_time_at(position)
+        self.wall_time_label.setText(captured.strftime('%H:%M:%S') if captured else "")
+
+    def wall_time_at(self, position):
+        """Capture time shown at ``position`` (ms), from the segment's frame index or start time."""
+        timestamp = self.player.wall_time_at(position)
+        return datetime.fromtimestamp(timestamp) if timestamp else None
+
+    def seek_wall_time(self, captured: datetime):
+        """Jump to the frame captured at ``captured`` without decoding anything to find it."""
+        position = self.player.position_at(captured.timestamp(), nearest=True)
+        if position is None:
+            return False
+        self.seek_video(position)
+        return True
 
     def seek_video(self, position):
-        self.player.setPosition(position)
+        self.player.set_position(position)
+
+    def scrub_to(self, position):
+        """Follow a slider drag: show the preview frame now, let the decoder catch up at its pace."""
+        self._scrub_target = position
+        self.current_time_label.setText(self.format_time(position))
+        self._show_scrub_preview(position)
+        if not self._scrub_timer.isActive():
+            self._scrub_timer.start()
+
+    def _seek_scrub_target(self):
+        if self._scrub_target is None:
+            return
+        # A keyframe needs no decoding up to the target, so intermediate seeks land on one.
+        target = self.seek_preview.keyframe_before(self._scrub_target) if self.seek_preview else self._scrub_target
+        self._scrub_target = None
+        self.seek_video(target)
+
+    def finish_scrub(self):
+        self._scrub_timer.stop()
+        self._scrub_target = None
+        self.scrub_preview.hide()
+        self.seek_video(self.seek_slider.value())
+
+    def _show_scrub_preview(self, position):
+        if not self.seek_preview:
+            return
+        frame = self.seek_preview.frame_at(position)
+        self.scrub_preview.setPixmap(frame)
+        self.scrub_preview.adjustSize()
+        slider = self.seek_slider
+        x = QStyle.sliderPositionFromValue(slider.minimum(), slider.maximum(), position, slider.width())
+        anchor = slider.mapTo(self, QPoint(x, 0))
+        left = min(max(0, anchor.x() - self.scrub_preview.width() // 2), self.width() - self.scrub_preview.width())
+        self.scrub_preview.move(left, anchor.y() - self.scrub_preview.height() - 8)
+        self.scrub_preview.show()
+        self.scrub_preview.raise_()
+
+    def _on_preview_ready(self, path):
+        if path == self.current_video_path:
+            self.seek_preview = self.thumbnails.seek_preview(path)
+
+    def _load_activity(self):
+        self.activity_index = self.activity.activity(self.current_video_path)
+        self.activity_strip.set_activity(self.activity_index.scores)
+        has_events = bool(self.activity_index.events())
+        self.previous_event_btn.setEnabled(has_events)
+        self.next_event_btn.setEnabled(has_events)
+
+    def _on_activity_ready(self, path):
+        if path == self.current_video_path:
+            self._load_activity()
+
+    def next_event(self):
+        """Jump to just before the next stretch of motion."""
+        start = self.activity_index.next_event(self.player.position() / 1000 + EVENT_LEAD_SECONDS)
+        if start is not None:
+            self.seek_video(int(max(0, start - EVENT_LEAD_SECONDS) * 1000))
+
+    def previous_event(self):
+        """Jump back to the start of the current stretch of motion, or the one before it."""
+        # Within a second of the lead-in counts as being at the event's start, as in the previous press.
+        start = self.activity_index.previous_event(self.player.position() / 1000 + EVENT_LEAD_SECONDS - 1)
+        if start is not None:
+            self.seek_video(int(max(0, start - EVENT_LEAD_SECONDS) * 1000))
 
     def format_time(self, ms):
-        """Convert milliseconds to mm:ss."""
+        """Convert milliseconds to mm:ss (h:mm:ss past an hour)."""
         secs = ms // 1000
+        if secs >= 3600:
+            return f"{secs // 3600}:{QTime(0, secs // 60 % 60, secs % 60).toString('mm:ss')}"
         return QTime(0, secs // 60, secs % 60).toString("mm:ss")
 
     def skip_seconds(self, seconds):
         """Jump forward or backward by X seconds."""
         new_pos = self.player.position() + (seconds * 1000)
-        self.player.setPosition(max(0, new_pos))
+        self.seek_video(min(max(0, new_pos), self.seek_slider.maximum()))
@@ -0,0 +1,170 @@
+import csv
+import os
+import shutil
+import subprocess
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit, urlunsplit
+
+from PySide6.QtCore import QThread
+
+from app.services.logger import get_logger
+from app.services.session_manifest import SEGMENT_PATTERN, SessionManifest
+from app.services.stream_health import Backoff
+
+STOP_TIMEOUT = 5
+
+
+def ffmpeg_path():
+    return shutil.which('ffmpeg')
+
+
+def _public_url(url):
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.password:
+        return url
+    netloc = parts.hostname + (f':{parts.port}' if parts.port else '')
+    return urlunsplit((parts.scheme, netloc, parts.path, parts.query, ''))
+
+
+class PassthroughRecorder(QThread):
+    """
+    Records by remuxing the camera's H.264/H.265 packets with ``ffmpeg -c copy``.
+
+    Nothing is decoded or re-encoded, so the file keeps the camera's quality and
+    costs almost no CPU. ffmpeg's segment muxer cuts the session into
+    fixed-length files on keyframes, and each finished segment is added to the
+    session manifest. The camera name and start time go into the container
+    metadata and the manifest instead of being drawn on the frames. If ffmpeg
+    drops out (camera reboot, network loss) recording resumes with the next
+    segment after a backoff.
+    """
+
+    def __init__(self, panel_name, session_dir, source_url, segment_seconds=None, parent=None):
+        super().__init__(parent)
+        self.panel_name = panel_name
+        self.session_dir = session_dir
+        self.source_url = source_url
+        self.segment_seconds = segment_seconds
+        self.running = False
+        self.manifest = SessionManifest(session_dir, panel_name, 'passthrough', _public_url(source_url))
+        self.logger = get_logger('PassthroughRecorder')
+        self._process = None
+        self._backoff = Backoff()
+        self._segment_list = None
+        self._listed = 0
+
+    def _is_live(self):
+        return self.source_url.lower().startswith('rtsp://')
+
+    def _command(self, started_at, first_segment):
+        command = [ffmpeg_path(), '-hide_banner', '-loglevel', 'fatal']
+        if self._is_live():
+            command += ['-rtsp_transport', 'tcp']
+        command += [
+            '-i', self.source_url,
+            '-map', '0:v:0', '-c', 'copy',
+            '-metadata', f'title={self.panel_name}',
+            '-metadata', f'creation_time={started_at.astimezone().isoformat()}',
+            '-f', 'segment',
+            '-segment_time', str(self.segment_seconds or 10 ** 9),
+            '-segment_start_number', str(first_segment),
+            '-segment_list', self._segment_list,
+            '-segment_list_type', 'csv',
+            '-reset_timestamps', '1',
+            '-segment_format', 'mp4',
+            # Fragmented MP4 stays playable even if ffmpeg is killed mid-file.
+            '-segment_format_options', 'movflags=+frag_keyframe+empty_moov+default_base_moof',
+            '-y', os.path.join(self.session_dir, SEGMENT_PATTERN.replace('{:03d}', '%03d'))
+        ]
+        return command
+
+    def _next_segment_number(self):
+        return len([name for name in os.listdir(self.session_dir) if name.startswith('segment_') and name.endswith('.mp4')])
+
+    def _collect_segments(self, started_at):
+        """Add segments ffmpeg has finished since the last call to the manifest."""
+        try:
+            with open(self._segment_list) as f:
+                rows = list(csv.reader(f))
+        except OSError:
+            return
+        for filename, start, end in (row[:3] for row in rows[self._listed:] if len(row) >= 3):
+            segment_start = started_at + timedelta(seconds=float(start))
+            self.manifest.add_segment(filename, segment_start, round(float(end) - float(start), 3))
+        if len(rows) > self._listed:
+            self._listed = len(rows)
+            self.manifest.save()
+
+    def _remove_segment_list(self):
+        # Everything it listed is in the manifest now.
+        try:
+            os.remove(self._segment_list)
+        except OSError:
+            pass
+
+    def run(self):
+        self.running = True
+        os.makedirs(self.session_dir, exist_ok=True)
+        self.manifest.save()
+        try:
+            while self.running:
+                started_at = datetime.now()
+                self._segment_list = os.path.join(self.session_dir, f'segments_{started_at:%H%M%S}.csv')
+                self._listed = 0
+                self._process = subprocess.Popen(
+                    self._command(started_at, self._next_segment_number()),
+                    stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+                )
+                self.logger.info(f'Remuxing {_public_url(self.source_url)} into {self.session_dir}')
+
+                part_started = time.monotonic()
+                while self.running and self._process.poll() is None:
+                    self.msleep(200)
+                    self._collect_segments(started_at)
+
+                if self.running and self._process.returncode == 0 and not self._is_live():
+                    # A file source was remuxed to its end.
+                    self.running = False
+                elif self.running:
+                    if time.monotonic() - part_started > self._backoff.maximum:
+                        self._backoff.reset()
+                    error = self._process.stderr.read().decode(errors='replace').strip()
+                    self.logger.warning(f'ffmpeg exited with {self._process.returncode} for {self.panel_name}: {error}')
+                    self._sleep(self._backoff.next())
+                else:
+                    self._stop_process()
+                self._collect_segments(started_at)
+                self._remove_segment_list()
+
+        except Exception as e:
+            self.logger.warning(f'Exception while recording {self.panel_name}: {e}')
+
+        finally:
+            self._stop_process()
+            self.manifest.finish()
+            try:
+                self.manifest.save()
+            except OSError as e:
+                self.logger.warning(f'Could not write the session manifest: {e}')
+            self.logger.info(f"Recording saved: {self.session_dir}")
+
+    def _sleep(self, seconds):
+        deadline = time.monotonic() + seconds
+        while self.running and time.monotonic() < deadline:
+            self.msleep(100)
+
+    def _stop_process(self):
+        process = self._process
+        if not process or process.poll() is not None:
+            return
+        try:
+            # 'q' lets ffmpeg flush and finish the file cleanly.
+            process.communicate(b'q', timeout=STOP_TIMEOUT)
+        except (subprocess.TimeoutExpired, OSError, ValueError):
+            process.kill()
+            process.wait()
+
+    def stop(self):
+        """End the recording without waiting; ffmpeg is told to finish on the recorder's thread."""
+        self.running = False
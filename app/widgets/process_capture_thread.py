@@ -0,0 +1,245 @@
+import multiprocessing
+import os
+import time
+from multiprocessing import resource_tracker
+
+from PySide6.QtCore import Signal, QThread
+
+from app.services.capture_worker import capture_worker
+from app.services.frame_mailbox import FrameMailbox
+from app.services.frame_pacer import FramePacer
+from app.services.logger import get_logger
+from app.services.shm_frame_ring import ShmFrameRing
+from app.services.stream_health import Backoff, StreamState
+from app.services.stream_info import StreamInfo
+
+RING_SLOTS = 4
+
+
+class ProcessCaptureThread(QThread):
+    """
+    Drop-in alternative to ``VideoCaptureThread`` that decodes in a worker process.
+
+    This thread only owns the shared-memory rings and relays slot notifications:
+    the display and the recorder get private copies, of the display-sized frames
+    at the display rate and of the full-size frames while recording is on. The
+    wall keeps drawing a frame long after the worker has moved on, on resizes and
+    exposes too, so a view of a ring slot could show it half overwritten. The
+    worker publishes display frames at the display cap, and while the panel is
+    hidden only those the motion detector looks at.
+    """
+    video_error = Signal(str)
+    stream_opened = Signal(object)
+    state_changed = Signal(object)
+    motion_scored = Signal(float)
+
+    def __init__(self, video_source, mailbox: FrameMailbox | None, record_queue=None, probe_result=None):
+        super().__init__()
+        self.video_source = video_source
+        self.probe_result = probe_result
+        self.mailbox = mailbox
+        self.record_queue = record_queue
+        self.display_size = None
+        self.visible = False
+        self.display_fps = None
+        self.display_pacer = FramePacer()
+        self.motion_detector = None
+        self.running = False
+        self.logger = get_logger('ProcessVideoThread')
+        self._conn = None
+        self._ring: ShmFrameRing | None = None
+        self._record_ring: ShmFrameRing | None = None
+        self._frame_bytes = 0
+        self._sent_display_size = None
+        self._sent_display_fps = None
+        self._backoff = Backoff()
+
+        if os.name == 'posix':
+            # Start the shared-memory tracker from the GUI thread; when it is first
+            # launched from a QThread the workers end up with their own tracker,
+            # which unlinks the ring as soon as a worker exits.
+            resource_tracker.ensure_running()
+
+    def run(self):
+        self.running = True
+        try:
+            while self.running:
+                self._run_worker()
+                if self.running:
+                    # The worker itself reconnects to the camera; getting here means the
+                    # process died, so restart it after a backoff.
+                    self.state_changed.emit(StreamState.RECONNECTING)
+                    self._sleep(self._backoff.next())
+        finally:
+            for ring in (self._ring, self._record_ring):
+                if ring:
+                    ring.close()
+            self._ring = None
+            self._record_ring = None
+            self.logger.info('Process video thread stopped and capture process released.')
+
+    def _sleep(self, seconds):
+        deadline = time.monotonic() + seconds
+        while self.running and time.monotonic() < deadline:
+            self.msleep(100)
+
+    def _run_worker(self):
+        process = None
+        try:
+            self.logger.info(f'starting capture process for: {self.video_source}')
+            # Never fork a process that is running Qt threads; spawn also matches Windows.
+            context = multiprocessing.get_context('spawn')
+            self._conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=capture_worker,
+                args=(self.video_source, child_conn, self.probe_result),
+                daemon=True
+            )
+            process.start()
+            child_conn.close()
+            self._sent_display_size = None
+            self._sent_display_fps = None  # the worker starts out publishing every frame
+
+            while self.running:
+                self._sync_worker()
+                if not self._conn.poll(0.2):
+                    if not process.is_alive():
+                        self.logger.warning(f'Capture process exited for: {self.video_source}')
+                        break
+                    continue
+
+                message = self._conn.recv()
+                kind = message[0]
+                if kind == 'frame':
+                    self._on_frame(message[1], message[2])
+                elif kind == 'record_frame':
+                    self._on_record_frame(message[1], message[2])
+                elif kind == 'opened':
+                    self._backoff.reset()
+                    self._on_opened(StreamInfo(*message[1:]))
+                elif kind == 'state':
+                    self.state_changed.emit(StreamState(message[1]))
+                elif kind == 'error':
+                    self.logger.warning(message[1])
+                    self.video_error.emit(message[1])
+                    break
+        except (EOFError, BrokenPipeError):
+            self.logger.warning(f'Lost connection to capture process for: {self.video_source}')
+        except Exception as e:
+            self.logger.exception(f'Exception in process video thread: {e}')
+            self.video_error.emit(str(e))
+        finally:
+            if process:
+                try:
+                    self._conn.send(('stop',))
+                except (OSError, BrokenPipeError):
+                    pass
+                process.join(timeout=2)
+                if process.is_alive():
+                    process.terminate()
+                    process.join(timeout=0.5)
+            if self._conn:
+                self._conn.close()
+            if self._record_ring:
+                # A restarted worker gets the record ring again from _sync_worker.
+                self._record_ring.close()
+                self._record_ring = None
+            self.probe_result = None
+
+    def _sync_worker(self):
+        """Push display size and recording changes made from the GUI thread to the worker."""
+        display_size = self.display_size
+        if self.mailbox is not None and display_size != self._sent_display_size:
+            if self._ensure_display_ring():
+                self._conn.send(('ring', self._ring.name))
+            self._conn.send(('display_size', *display_size))
+            self._sent_display_size = display_size
+
+        display_fps = self._display_fps()
+        if self.mailbox is not None and display_fps != self._sent_display_fps:
+            self._conn.send(('display_fps', display_fps))
+            self._sent_display_fps = display_fps
+
+        recording = self.record_queue is not None
+        if recording and not self._record_ring and self._frame_bytes:
+            self._record_ring = ShmFrameRing.create(self._frame_bytes, RING_SLOTS)
+            self._conn.send(('record_ring', self._record_ring.name))
+        elif not recording and self._record_ring:
+            self._conn.send(('record_ring', None))
+            self._record_ring.close()
+            self._record_ring = None
+
+    def _display_fps(self):
+        """Display frames a second the worker should publish: None for every frame, 0 for none."""
+        rates = [self.display_fps] if self.visible else []
+        detector = self.motion_detector
+        if detector is not None:
+            rates.append(1 / detector.interval if detector.interval else None)
+        if not rates:
+            return 0
+        return None if None in rates else max(rates)
+
+    def _ensure_display_ring(self):
+        """Make sure display slots fit both the source frame and the (possibly upscaled) display frame."""
+        if not self._frame_bytes:
+            return False
+        display_bytes = self._frame_bytes
+        if self.display_size:
+            display_bytes = max(display_bytes, self.display_size[0] * self.display_size[1] * 3)
+        if not self._ring or self._ring.slot_bytes < display_bytes:
+            if self._ring:
+                self._ring.close()
+            self._ring = ShmFrameRing.create(display_bytes, RING_SLOTS)
+            return True
+        return False
+
+    def _on_opened(self, info: StreamInfo):
+        self._frame_bytes = info.width * info.height * 3
+        if self._record_ring and self._record_ring.slot_bytes < self._frame_bytes:
+            self._record_ring.close()
+            self._record_ring = ShmFrameRing.create(self._frame_bytes, RING_SLOTS)
+            self._conn.send(('record_ring', self._record_ring.name))
+        if self.mailbox is not None:
+            self._ensure_display_ring()
+            self._conn.send(('ring', self._ring.name))
+        self.stream_opened.emit(info)
+
+    def _on_frame(self, slot, seq):
+        if not self._ring or self.mailbox is None:
+            return
+
+        frame = self._ring.copy(slot, seq)
+        if frame is None:
+            return
+        if self.visible and self.display_pacer.admit(time.time()):
+            # The worker may publish faster than the display cap for the motion detector.
+            self.mailbox.put(frame)
+
+        detector = self.motion_detector
+        if detector is not None:
+            # Analysed here rather than in the worker: the display frame is already small.
+            score = detector.feed(frame, time.time())
+            if score is not None:
+                self.motion_scored.emit(score)
+
+    def _on_record_frame(self, slot, seq):
+        record_queue = self.record_queue
+        if not self._record_ring or record_queue is None or record_queue.full():
+            return
+
+        frame = self._record_ring.copy(slot, seq)
+        if frame is not None:
+            record_queue.put_nowait(frame)
+
+    def set_display_size(self, width, height):
+        self.display_size = (width, height)
+
+    def set_display_fps(self, fps):
+        self.display_fps = fps or None
+        self.display_pacer.set_rate(fps)
+
+    def set_visible(self, visible):
+        self.visible = visible
+
+    def stop(self):
+        self.running = False
@@ -0,0 +1,187 @@
+import bisect
+import os
+from datetime import datetime
+
+from PySide6.QtCore import QObject, Signal, QUrl
+from PySide6.QtMultimedia import QMediaPlayer
+
+from app.services.frame_index import FrameIndex, frame_index_path
+from app.services.session_manifest import SessionManifest
+
+
+class RecordingPlayer(QObject):
+    """
+    ``QMediaPlayer`` over one recording: an MP4, or a session's segments played as one timeline.
+
+    Positions are milliseconds on the recording's timeline. ``wall_time_at()`` and
+    ``position_at()`` convert to and from capture time through each segment's
+    frame index, falling back to the segment's start time when it has none.
+    """
+    durationChanged = Signal(int)
+    positionChanged = Signal(int)
+    ended = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.player = QMediaPlayer(self)
+        self.player.durationChanged.connect(self._on_duration_changed)
+        self.player.positionChanged.connect(self._on_position_changed)
+        self.player.mediaStatusChanged.connect(self._on_media_status)
+        self.path = None
+        self.segments = []
+        self.segment_index = 0
+        self._pending_position = None
+
+    def load(self, path, started_at=None, duration=None):
+        """
+        Open ``path`` (paused at its start); False if nothing of it is left to play.
+
+        ``started_at`` and ``duration`` (seconds, e.g. from the catalog) place a
+        single MP4 in time until the player has read it.
+        """
+        self.path = path
+        if os.path.isdir(path):
+            manifest = SessionManifest.load(path)
+            self.segments = self._timeline(manifest) if manifest else []
+        else:
+            self.segments = [self._segment(path, duration, started_at)]
+        self._update_offsets()
+        if not self.segments:
+            return False
+        self._open_segment(0, 0)
+        self.durationChanged.emit(self.duration())
+        return True
+
+    @staticmethod
+    def _segment(path, duration, started_at):
+        return {
+            'path': path,
+            'duration': int(duration * 1000) if duration else None,
+            'started_at': started_at,
+            'index': FrameIndex.load(frame_index_path(path)),
+        }
+
+    def _timeline(self, manifest):
+        segments = []
+        for segment in manifest.existing_segments():
+            started = segment.get('started_at')
+            segments.append(self._segment(
+                os.path.join(manifest.directory, segment['path']),
+                segment.get('duration'),
+                datetime.fromisoformat(started).timestamp() if started else None,
+            ))
+        return segments
+
+    def _update_offsets(self):
+        offset = 0
+        for segment in self.segments:
+            segment['offset'] = offset
+            offset += segment['duration'] or 0
+
+    def _open_segment(self, index, position):
+        self.segment_index = index
+        self._pending_position = position or None
+        self.player.setSource(QUrl.fromLocalFile(self.segments[index]['path']))
+
+    def _on_media_status(self, status):
+        if status in (QMediaPlayer.LoadedMedia, QMediaPlayer.BufferedMedia) and self._pending_position:
+            self.player.setPosition(self._pending_position)
+            self._pending_position = None
+        elif status == QMediaPlayer.EndOfMedia and self.segments:
+            if self.segment_index + 1 < len(self.segments):
+                self._open_segment(self.segment_index + 1, 0)
+                self.player.play()
+            else:
+                self.ended.emit()
+
+    def _on_duration_changed(self, duration):
+        segment = self.segments[self.segment_index] if self.segments else None
+        if segment and segment['duration'] is None and duration > 0:
+            # A single file, or a segment still being written (or cut short) when the manifest was read.
+            segment['duration'] = duration
+            self._update_offsets()
+        self.durationChanged.emit(self.duration())
+
+    def _on_position_changed(self, position):
+        if self.segments:
+            self.positionChanged.emit(self.segments[self.segment_index]['offset'] + position)
+
+    def duration(self):
+        if not self.segments:
+            return 0
+        last = self.segments[-1]
+        return last['offset'] + (last['duration'] or 0)
+
+    def position(self):
+        if not self.segments:
+            return 0
+        return self.segments[self.segment_index]['offset'] + self.player.position()
+
+    def set_position(self, position):
+        if not self.segments:
+            return
+        offsets = [segment['offset'] for segment in self.segments]
+        index = max(0, bisect.bisect_right(offsets, position) - 1)
+        local = position - offsets[index]
+        if index == self.segment_index:
+            self.player.setPosition(local)
+        else:
+            playing = self.is_playing()
+            self._open_segment(index, local)
+            if playing:
+                self.player.play()
+
+    def set_video_output(self, output):
+        self.player.setVideoOutput(output)
+
+    def play(self):
+        self.player.play()
+
+    def pause(self):
+        self.player.pause()
+
+    def stop(self):
+        self.player.stop()
+
+    def is_playing(self):
+        return self.player.playbackState() == QMediaPlayer.PlayingState
+
+    def set_rate(self, rate):
+        self.player.setPlaybackRate(rate)
+
+    def wall_time_at(self, position):
+        """Capture time (epoch seconds) shown at ``position``, or None if it is unknown."""
+        if not self.segments:
+            return None
+        offsets = [segment['offset'] for segment in self.segments]
+        segment = self.segments[max(0, bisect.bisect_right(offsets, position) - 1)]
+        local = position - segment['offset']
+        if segment['index']:
+            return segment['index'].time_at_position(local)
+        if segment['started_at']:
+            return segment['started_at'] + local / 1000
+        return None
+
+    def position_at(self, timestamp, nearest=False):
+        """
+        Timeline position showing capture time ``timestamp``, or None if nothing was recorded then.
+
+        With ``nearest`` a time before or between segments maps to the next recorded frame.
+        """
+        for segment in self.segments:
+            index = segment['index']
+            if index:
+                started, ended = index.started_at, index.ended_at
+            elif segment['started_at'] and segment['duration']:
+                started, ended = segment['started_at'], segment['started_at'] + segment['duration'] / 1000
+            else:
+                continue
+            if timestamp < started:
+                if nearest:
+                    return segment['offset']
+                continue
+            if timestamp <= ended:
+                if index:
+                    return segment['offset'] + index.position_at(timestamp)
+                return segment['offset'] + int((timestamp - started) * 1000)
+        return None
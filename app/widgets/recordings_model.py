@@ -0,0 +1,134 @@
+import html
+from datetime import datetime
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QUrl
+from PySide6.QtGui import QColor, QPixmap
+
+from app.services.recordings_catalog import SESSION, RecordingsCatalog
+from app.services.thumbnails import THUMBNAIL_SIZE, ThumbnailProvider
+
+PAGE_SIZE = 200
+
+
+def describe(recording):
+    parts = [recording.camera or "Unknown camera"]
+    if recording.started_at:
+        parts.append(datetime.fromtimestamp(recording.started_at).strftime('%Y-%m-%d %H:%M:%S'))
+    if recording.duration:
+        secs = int(recording.duration)
+        parts.append(f"{secs // 3600}:{secs // 60 % 60:02d}:{secs % 60:02d}" if secs >= 3600
+                     else f"{secs // 60:02d}:{secs % 60:02d}")
+    if recording.width:
+        parts.append(f"{recording.width}x{recording.height} {recording.codec or ''}".strip())
+    parts.append(f"{recording.size / 2 ** 20:.1f} MB")
+    if recording.active:
+        parts.append("recording")
+    return " · ".join(parts)
+
+
+class RecordingsModel(QAbstractListModel):
+    """
+    Recordings from the catalog, fetched a page at a time as the view scrolls.
+
+    Filtering and ordering happen in the catalog query, so the model only ever
+    holds the rows the user has scrolled past. Thumbnails are requested from
+    ``data()``, which the view only calls for the rows it paints.
+    """
+
+    def __init__(self, catalog: RecordingsCatalog, thumbnails: ThumbnailProvider, parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+        self.thumbnails = thumbnails
+        self.thumbnails.ready.connect(self._on_thumbnail_ready)
+        self.camera = None
+        self.since = None
+        self.until = None
+        self.newest_first = True
+        self._recordings = []
+        self._rows = {}   # path -> row
+        self._total = 0
+        # Stands in for thumbnails still being made, so every row has the same size.
+        self._placeholder = QPixmap(*THUMBNAIL_SIZE)
+        self._placeholder.fill(QColor('#1e1e1e'))
+
+    def set_filter(self, camera=None, since=None, until=None):
+        self.camera, self.since, self.until = camera, since, until
+        self._recordings = []
+        self.reload()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.newest_first = order == Qt.DescendingOrder
+        self._recordings = []
+        self.reload()
+
+    def reload(self):
+        """Re-query the catalog, keeping as many rows loaded as before."""
+        self.beginResetModel()
+        self._total = self.catalog.count(self.camera, self.since, self.until)
+        self._recordings = self._query(0, max(PAGE_SIZE, len(self._recordings)))
+        self._index_rows(0)
+        self.endResetModel()
+
+    def _query(self, offset, limit):
+        return self.catalog.query(self.camera, self.since, self.until,
+                                  limit=limit, offset=offset, newest_first=self.newest_first)
+
+    def _index_rows(self, start):
+        if start == 0:
+            self._rows = {}
+        for row in range(start, len(self._recordings)):
+            recording = self._recordings[row]
+            self._rows[recording.path] = row
+            if recording.active:
+                # Still growing; its thumbnail will be remade from the newer manifest.
+                self.thumbnails.forget(recording.path)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self._recordings) < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        page = self._query(len(self._recordings), PAGE_SIZE)
+        if not page:
+            # Rows were deleted since the count; stop asking.
+            self._total = len(self._recordings)
+            return
+        start = len(self._recordings)
+        self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+        self._recordings.extend(page)
+        self._index_rows(start)
+        self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._recordings)
+
+    def recording(self, row):
+        return self._recordings[row]
+
+    def row_of(self, path):
+        return self._rows.get(path, -1)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        recording = self._recordings[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{'🎞' if recording.kind == SESSION else '📹'} {recording.name}"
+        if role == Qt.UserRole:
+            return recording.path
+        if role == Qt.DecorationRole:
+            poster = self.thumbnails.poster(recording.path)
+            return self._placeholder if poster is None else poster
+        if role == Qt.ToolTipRole:
+            strip = self.thumbnails.strip_file(recording.path)
+            if not strip:
+                return describe(recording)
+            return f"{html.escape(describe(recording))}<br><img src='{QUrl.fromLocalFile(strip).toString()}'>"
+        return None
+
+    def _on_thumbnail_ready(self, path):
+        row = self._rows.get(path, -1)
+        if row >= 0:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole, Qt.ToolTipRole])
@@ -4,10 +4,18 @@ import ipaddress
 from PySide6.QtCore import Qt, QSettings
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QGroupBox, QFormLayout, QLineEdit, QMessageBox
+    QPushButton, QLabel, QGroupBox, QFormLayout, QLineEdit, QMessageBox, QComboBox, QSpinBox, QCheckBox,
+    QScrollArea, QFrame
 )
 from app import APP_NAME
+from app.services import axis, retention
+from app.services.frame_overlay import DEFAULT_FONT_SCALE, DEFAULT_POSITION
+from app.services.frame_pacer import DEFAULT_DISPLAY_FPS
 from app.services.logger import get_logger
+from app.services.motion_detector import DEFAULT_MAX_FPS, DEFAULT_POST_ROLL_SECONDS
+from app.services.pre_event_buffer import DEFAULT_PRE_EVENT_MB, DEFAULT_PRE_EVENT_SECONDS
+from app.services.recording_service import DEFAULT_QUEUE_MB, DROP_NEWEST, DROP_NON_KEY, DROP_OLDEST
+from app.services.wall_layout import DEFAULT_CAMERA_COUNT, DEFAULT_LAYOUT, LAYOUTS, MAX_CAMERAS
 
 
 class SettingsWidget(QWidget):
@@ -35,38 +43,199 @@ class SettingsWidget(QWidget):
 
         self.ip_fields = []
         self.name_fields = []
+        self.pre_event_fields = []
+        self.motion_fields = []
+        self.zone_fields = []
+        self.display_fps_fields = []
 
         settings = QSettings(APP_NAME, "AxisApp")
 
-        for i in range(4):
-            ip_input = QLineEdit()
-            ip_input.setPlaceholderText("e.g., 127.0.0.1")
-            ip_input.setInputMask("000.000.000.000;_")
-            ip_input.setFixedWidth(180)
-            ip_input.setText(settings.value(f"device_{i}/ip"))
-
-            name_input = QLineEdit()
-            name_input.setPlaceholderText("Nickname")
-            name_input.setFixedWidth(150)
-            name_input.setText(settings.value(f"device_{i}/name"))
-
-            ip_input.setStyleSheet(self.input_style())
-            name_input.setStyleSheet(self.input_style())
+        self.camera_count_spin = self.make_spin(
+            1, MAX_CAMERAS, " cameras", settings.value("cameras/count", DEFAULT_CAMERA_COUNT)
+        )
+        self.camera_count_spin.valueChanged.connect(self.show_device_rows)
+        self.wall_layout_combo = QComboBox()
+        for name in LAYOUTS:
+            self.wall_layout_combo.addItem(f"{name} layout", name)
+        self.wall_layout_combo.setFixedWidth(180)
+        self.wall_layout_combo.setStyleSheet(self.combo_style())
+        self.wall_layout_combo.setCurrentIndex(max(0, self.wall_layout_combo.findData(settings.value("wall/layout", DEFAULT_LAYOUT))))
+
+        row_layout = QHBoxLayout()
+        row_layout.setSpacing(20)
+        row_layout.addWidget(self.camera_count_spin)
+        row_layout.addWidget(self.wall_layout_combo)
+        row_layout.addStretch()
+        row_widget = QWidget()
+        row_widget.setLayout(row_layout)
+
+        label = QLabel("Camera wall:")
+        label.setStyleSheet("font-size: 16px; color: white;")
+        form_layout.addRow(label, row_widget)
+
+        # Rows are made as the camera count grows; those past it stay hidden and unsaved.
+        self.devices_layout = QFormLayout()
+        devices_widget = QWidget()
+        devices_widget.setLayout(self.devices_layout)
+        self.devices_scroll = QScrollArea()
+        self.devices_scroll.setWidget(devices_widget)
+        self.devices_scroll.setWidgetResizable(True)
+        self.devices_scroll.setMaximumHeight(320)
+        self.devices_scroll.setFrameShape(QFrame.NoFrame)
+        self.devices_scroll.viewport().setAutoFillBackground(False)
+        form_layout.addRow(self.devices_scroll)
+        self.show_device_rows(self.camera_count_spin.value())
+
+        self.backend_combo = QComboBox()
+        self.backend_combo.addItem("In-app threads", "thread")
+        self.backend_combo.addItem("Worker processes", "process")
+        self.backend_combo.setFixedWidth(180)
+        self.backend_combo.setStyleSheet(self.combo_style())
+        self.backend_combo.setCurrentIndex(max(0, self.backend_combo.findData(settings.value("capture/backend", "thread"))))
+
+        label = QLabel("Decode engine:")
+        label.setStyleSheet("font-size: 16px; color: white;")
+        form_layout.addRow(label, self.backend_combo)
+
+        self.grid_stream_combo = QComboBox()
+        self.grid_stream_combo.addItem("Auto (tile size)", axis.AUTO_RESOLUTION)
+        self.grid_stream_combo.addItem("Full resolution", "")
+        for resolution in ("960x540", "640x360", "480x270"):
+            self.grid_stream_combo.addItem(resolution, resolution)
+        self.grid_stream_combo.setFixedWidth(180)
+        self.grid_stream_combo.setStyleSheet(self.combo_style())
+        grid_resolution = settings.value("stream/grid_resolution", axis.DEFAULT_GRID_RESOLUTION)
+        self.grid_stream_combo.setCurrentIndex(max(0, self.grid_stream_combo.findData(grid_resolution)))
+
+        label = QLabel("Grid stream:")
+        label.setStyleSheet("font-size: 16px; color: white;")
+        form_layout.addRow(label, self.grid_stream_combo)
+
+        self.display_fps_spin = self.make_spin(
+            0, 60, " fps shown", settings.value("display/max_fps", DEFAULT_DISPLAY_FPS), "All frames"
+        )
+        self.display_fps_spin.setToolTip("Frames drawn per second and camera; recordings keep the camera's rate")
+
+        label = QLabel("Live view:")
+        label.setStyleSheet("font-size: 16px; color: white;")
+        form_layout.addRow(label, self.display_fps_spin)
+
+        self.recording_mode_combo = QComboBox()
+        self.recording_mode_combo.addItem("Re-encode with overlay", "encode")
+        self.recording_mode_combo.addItem("Passthrough (ffmpeg)", "passthrough")
+        self.recording_mode_combo.setFixedWidth(180)
+        self.recording_mode_combo.setStyleSheet(self.combo_style())
+        self.recording_mode_combo.setCurrentIndex(max(0, self.recording_mode_combo.findData(settings.value("recording/mode", "encode"))))
+
+        label = QLabel("Recording mode:")
+        label.setStyleSheet("font-size: 16px; color: white;")
+        form_layout.addRow(label, self.recording_mode_combo)
+
+        self.overlay_position_combo = QComboBox()
+        for text, position in (("Top left", "top-left"), ("Top right", "top-right"),
+                               ("Bottom left", "bottom-left"), ("Bottom right", "bottom-right")):
+            self.overlay_position_combo.addItem(text, position)
+        self.overlay_size_combo = QComboBox()
+        for text, scale in (("Small text", 1.0), ("Medium text", 1.5), ("Large text", 2.0)):
+            self.overlay_size_combo.addItem(text, scale)
+        self.overlay_time_combo = QComboBox()
+        self.overlay_time_combo.addItem("Minutes", "minute")
+        self.overlay_time_combo.addItem("Seconds", "second")
+        self.overlay_battery_check = QCheckBox("Battery")
+        self.overlay_battery_check.setStyleSheet("font-size: 16px; color: white;")
+        self.overlay_battery_check.setChecked(settings.value("overlay/battery", False, type=bool))
+
+        row_layout = QHBoxLayout()
+        row_layout.setSpacing(20)
+        for combo, key, default in ((self.overlay_position_combo, "overlay/position", DEFAULT_POSITION),
+                                    (self.overlay_size_combo, "overlay/font_scale", DEFAULT_FONT_SCALE),
+                                    (self.overlay_time_combo, "overlay/resolution", "minute")):
+            combo.setFixedWidth(150)
+            combo.setStyleSheet(self.combo_style())
+            value = settings.value(key, default)
+            combo.setCurrentIndex(max(0, combo.findData(float(value) if isinstance(default, float) else value)))
+            row_layout.addWidget(combo)
+        row_layout.addWidget(self.overlay_battery_check)
+        row_widget = QWidget()
+        row_widget.setLayout(row_layout)
+
+        label = QLabel("Overlay:")
+        label.setStyleSheet("font-size: 16px; color: white;")
+        form_layout.addRow(label, row_widget)
+
+        self.segment_spin = self.make_spin(1, 60, " min", settings.value("recording/segment_minutes", 5))
+
+        label = QLabel("Segment length:")
+        label.setStyleSheet("font-size: 16px; color: white;")
+        form_layout.addRow(label, self.segment_spin)
+
+        self.queue_mb_spin = self.make_spin(
+            8, 4096, " MB / camera", settings.value("recording/queue_mb", DEFAULT_QUEUE_MB)
+        )
+        self.queue_mb_spin.setToolTip("Frames waiting for the encoder; beyond this the overflow policy applies")
+        self.overflow_combo = QComboBox()
+        self.overflow_combo.addItem("Drop oldest", DROP_OLDEST)
+        self.overflow_combo.addItem("Drop newest", DROP_NEWEST)
+        self.overflow_combo.addItem("Keep 1 frame/s", DROP_NON_KEY)
+        self.overflow_combo.setFixedWidth(180)
+        self.overflow_combo.setStyleSheet(self.combo_style())
+        self.overflow_combo.setCurrentIndex(max(0, self.overflow_combo.findData(settings.value("recording/overflow", DROP_OLDEST))))
+
+        row_layout = QHBoxLayout()
+        row_layout.setSpacing(20)
+        row_layout.addWidget(self.queue_mb_spin)
+        row_layout.addWidget(self.overflow_combo)
+        row_widget = QWidget()
+        row_widget.setLayout(row_layout)
+
+        label = QLabel("Encoder queue:")
+        label.setStyleSheet("font-size: 16px; color: white;")
+        form_layout.addRow(label, row_widget)
+
+        self.pre_event_mb_spin = self.make_spin(
+            8, 1024, " MB / camera", settings.value("recording/pre_event_mb", DEFAULT_PRE_EVENT_MB)
+        )
 
-            self.ip_fields.append(ip_input)
-            self.name_fields.append(name_input)
+        label = QLabel("Pre-event memory:")
+        label.setStyleSheet("font-size: 16px; color: white;")
+        form_layout.addRow(label, self.pre_event_mb_spin)
 
-            row_layout = QHBoxLayout()
-            row_layout.setSpacing(20)
-            row_layout.addWidget(ip_input)
-            row_layout.addWidget(name_input)
+        self.post_roll_spin = self.make_spin(
+            1, 600, " s after", settings.value("motion/post_roll_seconds", DEFAULT_POST_ROLL_SECONDS)
+        )
+        self.post_roll_spin.setToolTip("A motion recording stops after this long without motion")
+        self.motion_fps_spin = self.make_spin(1, 30, " checks/s", settings.value("motion/max_fps", DEFAULT_MAX_FPS))
+        self.motion_fps_spin.setToolTip("Frames analysed per second and camera")
+
+        row_layout = QHBoxLayout()
+        row_layout.setSpacing(20)
+        row_layout.addWidget(self.post_roll_spin)
+        row_layout.addWidget(self.motion_fps_spin)
+        row_widget = QWidget()
+        row_widget.setLayout(row_layout)
+
+        label = QLabel("Motion:")
+        label.setStyleSheet("font-size: 16px; color: white;")
+        form_layout.addRow(label, row_widget)
+
+        self.max_age_spin = self.make_spin(
+            0, 3650, " days", settings.value("retention/max_age_days", retention.DEFAULT_MAX_AGE_DAYS)
+        )
+        self.max_size_spin = self.make_spin(0, 100000, " GB max", settings.value("retention/max_gb", 0))
+        self.min_free_spin = self.make_spin(
+            0, 100000, " GB free", settings.value("retention/min_free_gb", retention.DEFAULT_MIN_FREE_GB)
+        )
 
-            row_widget = QWidget()
-            row_widget.setLayout(row_layout)
+        row_layout = QHBoxLayout()
+        row_layout.setSpacing(20)
+        for spin in (self.max_age_spin, self.max_size_spin, self.min_free_spin):
+            row_layout.addWidget(spin)
+        row_widget = QWidget()
+        row_widget.setLayout(row_layout)
 
-            label = QLabel(f"Device {i+1}:")
-            label.setStyleSheet("font-size: 16px; color: white;")
-            form_layout.addRow(label, row_widget)
+        label = QLabel("Keep recordings:")
+        label.setStyleSheet("font-size: 16px; color: white;")
+        form_layout.addRow(label, row_widget)
 
         form_group.setLayout(form_layout)
         layout.addWidget(form_group)
@@ -91,6 +260,73 @@ class SettingsWidget(QWidget):
         layout.addStretch()
         self.setLayout(layout)
 
+    def add_device_row(self, settings):
+        i = len(self.ip_fields)
+        ip_input = QLineEdit()
+        ip_input.setPlaceholderText("e.g., 127.0.0.1")
+        ip_input.setInputMask("000.000.000.000;_")
+        ip_input.setFixedWidth(180)
+        ip_input.setText(settings.value(f"device_{i}/ip"))
+
+        name_input = QLineEdit()
+        name_input.setPlaceholderText("Nickname")
+        name_input.setFixedWidth(150)
+        name_input.setText(settings.value(f"device_{i}/name"))
+
+        pre_event_spin = self.make_spin(
+            0, 60, " s before", settings.value(f"device_{i}/pre_event_seconds", DEFAULT_PRE_EVENT_SECONDS), "No pre-event"
+        )
+        pre_event_spin.setToolTip("Seconds kept in memory and written at the start of each recording")
+
+        motion_spin = self.make_spin(
+            0, 100, " motion", settings.value(f"device_{i}/motion_sensitivity", 0), "No motion"
+        )
+        motion_spin.setToolTip("Sensitivity (1-100) of motion-triggered recording")
+        zones_input = QLineEdit()
+        zones_input.setPlaceholderText("Zones: x,y,w,h; ... (%)")
+        zones_input.setToolTip("Areas watched for motion, in percent of the frame; empty watches all of it")
+        zones_input.setFixedWidth(200)
+        zones_input.setText(settings.value(f"device_{i}/motion_zones", ""))
+
+        display_fps_spin = self.make_spin(
+            0, 60, " fps shown", settings.value(f"device_{i}/display_fps", 0), "Live view fps"
+        )
+        display_fps_spin.setToolTip("Frames drawn per second for this camera, instead of the live view setting")
+
+        ip_input.setStyleSheet(self.input_style())
+        name_input.setStyleSheet(self.input_style())
+        zones_input.setStyleSheet(self.input_style())
+
+        self.ip_fields.append(ip_input)
+        self.name_fields.append(name_input)
+        self.pre_event_fields.append(pre_event_spin)
+        self.motion_fields.append(motion_spin)
+        self.zone_fields.append(zones_input)
+        self.display_fps_fields.append(display_fps_spin)
+
+        row_layout = QHBoxLayout()
+        row_layout.setSpacing(20)
+        row_layout.addWidget(ip_input)
+        row_layout.addWidget(name_input)
+        row_layout.addWidget(pre_event_spin)
+        row_layout.addWidget(motion_spin)
+        row_layout.addWidget(zones_input)
+        row_layout.addWidget(display_fps_spin)
+
+        row_widget = QWidget()
+        row_widget.setLayout(row_layout)
+
+        label = QLabel(f"Device {i+1}:")
+        label.setStyleSheet("font-size: 16px; color: white;")
+        self.devices_layout.addRow(label, row_widget)
+
+    def show_device_rows(self, count):
+        settings = QSettings(APP_NAME, "AxisApp")
+        while len(self.ip_fields) < count:
+            self.add_device_row(settings)
+        for i in range(len(self.ip_fields)):
+            self.devices_layout.setRowVisible(i, i < count)
+
     def btn_style(self):
         return """
             QPushButton {
@@ -118,6 +354,28 @@ class SettingsWidget(QWidget):
             }
         """
 
+    def combo_style(self):
+        return """
+            QComboBox {
+                padding: 6px;
+                font-size: 14px;
+                border: 1px solid #aaa;
+                border-radius: 4px;
+                color: white;
+            }
+        """
+
+    def make_spin(self, minimum, maximum, suffix, value, special_text="No limit"):
+        spin = QSpinBox()
+        spin.setRange(minimum, maximum)
+        spin.setSuffix(suffix)
+        if minimum == 0:
+            spin.setSpecialValueText(special_text)
+        spin.setValue(int(value))
+        spin.setFixedWidth(150)
+        spin.setStyleSheet(self.input_style())
+        return spin
+
     def is_valid_ip(self, ip: str) -> bool:
         try:
             ipaddress.ip_address(ip)
@@ -128,9 +386,18 @@ class SettingsWidget(QWidget):
     def save_configuration(self):
         settings = QSettings(APP_NAME, "AxisApp")
 
-        for i, (ip_field, name_field) in enumerate(zip(self.ip_fields, self.name_fields)):
+        count = self.camera_count_spin.value()
+        settings.setValue("cameras/count", count)
+        settings.setValue("wall/layout", self.wall_layout_combo.currentData())
+        for i, (ip_field, name_field, pre_event_spin, motion_spin, zones_field, display_fps_spin) in enumerate(
+                zip(self.ip_fields[:count], self.name_fields, self.pre_event_fields, self.motion_fields,
+                    self.zone_fields, self.display_fps_fields)):
             ip = ip_field.text().strip()
             name = name_field.text().strip()
+            settings.setValue(f"device_{i}/pre_event_seconds", pre_event_spin.value())
+            settings.setValue(f"device_{i}/motion_sensitivity", motion_spin.value())
+            settings.setValue(f"device_{i}/motion_zones", zones_field.text().strip())
+            settings.setValue(f"device_{i}/display_fps", display_fps_spin.value())
 
             if ip and not self.is_valid_ip(ip):
                 ip_field.clear()
@@ -140,6 +407,24 @@ class SettingsWidget(QWidget):
             settings.setValue(f"device_{i}/ip", ip)
             settings.setValue(f"device_{i}/name", name)
 
+        settings.setValue("capture/backend", self.backend_combo.currentData())
+        settings.setValue("stream/grid_resolution", self.grid_stream_combo.currentData())
+        settings.setValue("display/max_fps", self.display_fps_spin.value())
+        settings.setValue("recording/mode", self.recording_mode_combo.currentData())
+        settings.setValue("overlay/position", self.overlay_position_combo.currentData())
+        settings.setValue("overlay/font_scale", self.overlay_size_combo.currentData())
+        settings.setValue("overlay/resolution", self.overlay_time_combo.currentData())
+        settings.setValue("overlay/battery", self.overlay_battery_check.isChecked())
+        settings.setValue("recording/segment_minutes", self.segment_spin.value())
+        settings.setValue("recording/pre_event_mb", self.pre_event_mb_spin.value())
+        settings.setValue("motion/post_roll_seconds", self.post_roll_spin.value())
+        settings.setValue("motion/max_fps", self.motion_fps_spin.value())
+        settings.setValue("recording/queue_mb", self.queue_mb_spin.value())
+        settings.setValue("recording/overflow", self.overflow_combo.currentData())
+        settings.setValue("retention/max_age_days", self.max_age_spin.value())
+        settings.setValue("retention/max_gb", self.max_size_spin.value())
+        settings.setValue("retention/min_free_gb", self.min_free_spin.value())
+
         msg = QMessageBox(self)
         msg.setIcon(QMessageBox.Information)
         msg.setWindowTitle("Saved")
@@ -0,0 +1,278 @@
+import math
+import time
+from datetime import datetime
+
+from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QPushButton, QLabel, QSlider, QComboBox
+)
+from PySide6.QtMultimediaWidgets import QVideoWidget
+
+from app.services.recordings_catalog import Recording
+from app.widgets.recording_player import RecordingPlayer
+
+SYNC_INTERVAL_MS = 250
+DRIFT_NUDGE_MS = 80       # a tile further off plays slightly faster or slower until it catches up
+DRIFT_SEEK_MS = 1000      # a tile further off than this seeks
+NUDGE = 0.1
+RATES = (0.5, 1.0, 2.0, 4.0)
+
+
+def overlapping_recordings(catalog, recording: Recording):
+    """``recording`` plus, for every other camera, the recording overlapping it the most."""
+    best = {recording.camera: recording}
+    for other in catalog.query(since=recording.started_at, until=recording.ended_at):
+        if other.camera == recording.camera or not other.started_at or not other.ended_at:
+            continue
+        overlap = min(other.ended_at, recording.ended_at) - max(other.started_at, recording.started_at)
+        current = best.get(other.camera)
+        if current is None or overlap > min(current.ended_at, recording.ended_at) - max(current.started_at, recording.started_at):
+            best[other.camera] = other
+    return sorted(best.values(), key=lambda r: r.camera or '')
+
+
+class SyncClock:
+    """Master clock in capture time (epoch seconds), advancing at ``rate`` while running."""
+
+    def __init__(self):
+        self.rate = 1.0
+        self.running = False
+        self._time = 0.0
+        self._anchor = time.monotonic()
+
+    def now(self):
+        if not self.running:
+            return self._time
+        return self._time + (time.monotonic() - self._anchor) * self.rate
+
+    def set(self, timestamp):
+        self._time = timestamp
+        self._anchor = time.monotonic()
+
+    def start(self):
+        self.set(self.now())
+        self.running = True
+
+    def pause(self):
+        self.set(self.now())
+        self.running = False
+
+    def set_rate(self, rate):
+        self.set(self.now())
+        self.rate = rate
+
+
+class SyncTile(QWidget):
+    def __init__(self, recording: Recording, parent=None):
+        super().__init__(parent)
+        self.recording = recording
+        self.rate = 1.0
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+        self.label = QLabel(recording.camera or recording.name)
+        self.label.setStyleSheet("color: white; font-size: 16px; font-weight: bold;")
+        self.video_widget = QVideoWidget()
+        self.video_widget.setStyleSheet("background-color: black;")
+        layout.addWidget(self.label)
+        layout.addWidget(self.video_widget, 1)
+
+        self.player = RecordingPlayer(self)
+        self.player.set_video_output(self.video_widget)
+        self.loaded = self.player.load(recording.path, recording.started_at, recording.duration)
+
+    def set_rate(self, rate):
+        if rate != self.rate:
+            self.rate = rate
+            self.player.set_rate(rate)
+
+
+class SyncPlaybackWidget(QWidget):
+    """
+    N-up playback of recordings from several cameras, driven by one master clock.
+
+    Every tile has its own player, so the streams decode in parallel. The clock
+    runs in capture time; each tile maps it to its own timeline through the
+    recordings' frame indexes and start times, and a periodic check nudges the
+    playback rate of tiles that drift, or re-seeks them when they fall far behind.
+    """
+    closed = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.clock = SyncClock()
+        self.tiles = []
+        self.started_at = self.ended_at = 0
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(15)
+
+        self.title = QLabel("")
+        self.title.setAlignment(Qt.AlignCenter)
+        self.title.setStyleSheet("color: white; font-size: 24px; font-weight: bold;")
+        self.grid = QGridLayout()
+        self.grid.setSpacing(8)
+
+        seek_layout = QHBoxLayout()
+        self.time_label = QLabel("")
+        self.time_label.setStyleSheet("color: white; font-size: 20px; font-weight: bold;")
+        self.seek_slider = QSlider(Qt.Horizontal)
+        self.seek_slider.setRange(0, 0)
+        self.seek_slider.sliderReleased.connect(lambda: self.seek(self.started_at + self.seek_slider.value() / 1000))
+        seek_layout.addWidget(self.time_label)
+        seek_layout.addWidget(self.seek_slider, 1)
+
+        controls_layout = QHBoxLayout()
+        controls_layout.setSpacing(20)
+        self.back_btn = QPushButton("⬅ Back")
+        self.rewind_btn = QPushButton("⏪ 10s")
+        self.play_pause_btn = QPushButton("▶️ Play")
+        self.forward_btn = QPushButton("10s ⏩")
+        for btn in (self.back_btn, self.rewind_btn, self.play_pause_btn, self.forward_btn):
+            btn.setFixedSize(150, 70)
+            btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #444;
+                    color: white;
+                    font-size: 24px;
+                    font-weight: bold;
+                    border-radius: 15px;
+                }
+                QPushButton:pressed {
+                    background-color: #666;
+                }
+            """)
+            controls_layout.addWidget(btn)
+        self.rate_combo = QComboBox()
+        for rate in RATES:
+            self.rate_combo.addItem(f"{rate:g}x", rate)
+        self.rate_combo.setCurrentIndex(RATES.index(1.0))
+        self.rate_combo.setStyleSheet("background-color: #2a2a2a; color: white; font-size: 20px; padding: 8px;")
+        controls_layout.addWidget(self.rate_combo)
+
+        layout.addWidget(self.title)
+        layout.addLayout(self.grid, 1)
+        layout.addLayout(seek_layout)
+        layout.addLayout(controls_layout)
+
+        self.back_btn.clicked.connect(self.close_playback)
+        self.play_pause_btn.clicked.connect(self.toggle_play_pause)
+        self.rewind_btn.clicked.connect(lambda: self.seek(self.clock.now() - 10))
+        self.forward_btn.clicked.connect(lambda: self.seek(self.clock.now() + 10))
+        self.rate_combo.currentIndexChanged.connect(lambda: self.set_rate(self.rate_combo.currentData()))
+
+        self.sync_timer = QTimer(self)
+        self.sync_timer.setInterval(SYNC_INTERVAL_MS)
+        self.sync_timer.timeout.connect(self.sync)
+
+    def load(self, recordings):
+        """Lay out ``recordings`` (one per camera) and start playing them from the earliest start."""
+        self.stop()
+        for tile in self.tiles:
+            self.grid.removeWidget(tile)
+            tile.deleteLater()
+        self.tiles = [SyncTile(recording) for recording in recordings if recording.started_at]
+        self.tiles = [tile for tile in self.tiles if tile.loaded]
+        if not self.tiles:
+            self.title.setText("⚠️ Nothing to play")
+            return
+
+        columns = math.ceil(math.sqrt(len(self.tiles)))
+        for i, tile in enumerate(self.tiles):
+            self.grid.addWidget(tile, i // columns, i % columns)
+        self.started_at = min(tile.recording.started_at for tile in self.tiles)
+        self.ended_at = max(tile.recording.ended_at or tile.recording.started_at for tile in self.tiles)
+        self.seek_slider.setRange(0, int((self.ended_at - self.started_at) * 1000))
+        self.title.setText(f"🔲 {len(self.tiles)} cameras · "
+                           f"{datetime.fromtimestamp(self.started_at).strftime('%Y-%m-%d %H:%M:%S')}")
+
+        self.clock.set(self.started_at)
+        self.play()
+
+    def play(self):
+        self.clock.start()
+        self.play_pause_btn.setText("⏸ Pause")
+        self.sync()
+        self.sync_timer.start()
+
+    def pause(self):
+        self.clock.pause()
+        self.play_pause_btn.setText("▶️ Play")
+        self.sync_timer.stop()
+        for tile in self.tiles:
+            tile.player.pause()
+        self._align()
+
+    def toggle_play_pause(self):
+        if self.clock.running:
+            self.pause()
+        else:
+            self.play()
+
+    def stop(self):
+        self.clock.pause()
+        self.sync_timer.stop()
+        for tile in self.tiles:
+            tile.player.stop()
+
+    def close_playback(self):
+        self.stop()
+        self.closed.emit()
+
+    def seek(self, timestamp):
+        self.clock.set(min(max(self.started_at, timestamp), self.ended_at))
+        self._align()
+        self.sync()
+
+    def set_rate(self, rate):
+        self.clock.set_rate(rate)
+        for tile in self.tiles:
+            tile.set_rate(rate)
+
+    def _align(self):
+        """Seek every tile exactly to the clock."""
+        now = self.clock.now()
+        for tile in self.tiles:
+            target = tile.player.position_at(now)
+            if target is not None:
+                tile.player.set_position(target)
+        self._update_time(now)
+
+    def sync(self):
+        now = self.clock.now()
+        if now >= self.ended_at and self.clock.running:
+            self.pause()
+            return
+
+        for tile in self.tiles:
+            target = tile.player.position_at(now)
+            if target is None:
+                # This camera recorded nothing at this moment.
+                if tile.player.is_playing():
+                    tile.player.pause()
+                tile.label.setText(f"{tile.recording.camera} · no recording")
+                continue
+            tile.label.setText(tile.recording.camera or tile.recording.name)
+            if not self.clock.running:
+                continue
+            if not tile.player.is_playing():
+                tile.player.set_position(target)
+                tile.player.play()
+                tile.set_rate(self.clock.rate)
+                continue
+
+            drift = tile.player.position() - target
+            if abs(drift) > DRIFT_SEEK_MS:
+                tile.player.set_position(target)
+                tile.set_rate(self.clock.rate)
+            elif abs(drift) > DRIFT_NUDGE_MS:
+                tile.set_rate(self.clock.rate * (1 - NUDGE if drift > 0 else 1 + NUDGE))
+            else:
+                tile.set_rate(self.clock.rate)
+        self._update_time(now)
+
+    def _update_time(self, now):
+        if not self.seek_slider.isSliderDown():
+            self.seek_slider.setValue(int((now - self.started_at) * 1000))
+        self.time_label.setText(datetime.fromtimestamp(now).strftime('%H:%M:%S'))
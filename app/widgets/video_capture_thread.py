@@ -1,55 +1,85 @@
-
-
-import cv2
-import time
-
 from PySide6.QtCore import Signal, QThread
 
+from app.services.capture_loop import CaptureLoop
+from app.services.frame_mailbox import FrameMailbox
+from app.services.frame_pacer import FramePacer
+from app.services.frame_prep import prepare_display_frame
 from app.services.logger import get_logger
-from app.services.safe_video_capture import open_capture
 
 
 class VideoCaptureThread(QThread):
-    frame_received = Signal(object)
     video_error = Signal(str)
-    cap_capture_signal = Signal(object)
+    stream_opened = Signal(object)
+    state_changed = Signal(object)
+    motion_scored = Signal(float)
 
-    def __init__(self, video_source):
+    def __init__(self, video_source, mailbox: FrameMailbox | None, record_queue=None, probe_result=None):
         super().__init__()
         self.video_source = video_source
-        self.cap: cv2.VideoCapture | None = None
-        self.running = False
+        self.mailbox = mailbox
+        self.record_queue = record_queue
+        self.display_size = None
+        self.visible = False
+        self.display_pacer = FramePacer()
+        self.motion_detector = None
         self.logger = get_logger('VideoThread')
-        self.ret_none_counter = 0
+        self.loop = CaptureLoop(
+            video_source,
+            probe_result=probe_result,
+            on_opened=self.stream_opened.emit,
+            on_frame=self._on_frame,
+            on_state=self.state_changed.emit,
+            wants_frame=self._wants_frame
+        )
 
     def run(self):
         try:
             self.logger.info(f'trying video capture for: {self.video_source}')
-            self.cap = open_capture(self.video_source)
-            if not self.cap:
-                self.logger.warning(f'Failed to open video source for: {self.video_source}')
-                return
-
-            self.cap_capture_signal.emit(self.cap)
-
-            self.running = True
-            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 0)
-            while self.running:
-                ret, frame = self.cap.read()
-                if not ret:
-                    self.running = False
-                    self.logger.debug('Frame read failed, skipping...')
-                    continue
-                self.frame_received.emit(frame)
+            self.loop.run()
         except Exception as e:
             self.logger.exception(f'Exception in video thread: {e}')
             self.video_error.emit(str(e))
         finally:
-            if self.cap:
-                self.cap.release()
-                self.cap = None
             self.logger.info('Video thread stopped and camera released.')
 
+    def _wants_frame(self, timestamp):
+        # Not recording: only the frames due on screen or for the motion detector are retrieved;
+        # the rest are grabbed, which still decodes them but skips the BGR conversion.
+        if self.record_queue is not None:
+            return True
+        if self.visible and self.mailbox is not None and self.display_pacer.due(timestamp):
+            return True
+        detector = self.motion_detector
+        return detector is not None and detector.due(timestamp)
+
+    def _on_frame(self, frame, timestamp):
+        detector = self.motion_detector
+        show = self.visible and self.mailbox is not None and self.display_pacer.admit(timestamp)
+        analyse = detector is not None and detector.due(timestamp)
+        display_frame = frame
+        if self.mailbox is not None and (show or analyse):
+            display_frame = prepare_display_frame(frame, self.display_size)
+        if show:
+            self.mailbox.put(display_frame)
+
+        if analyse:
+            score = detector.feed(display_frame, timestamp)
+            if score is not None:
+                self.motion_scored.emit(score)
+
+        record_queue = self.record_queue
+        if record_queue is not None and not record_queue.full():
+            record_queue.put_nowait(frame)
+
+    def set_display_size(self, width, height):
+        self.display_size = (width, height)
+
+    def set_display_fps(self, fps):
+        """Cap the frames handed to the display, whatever the stream's rate; None for all of them."""
+        self.display_pacer.set_rate(fps)
+
+    def set_visible(self, visible):
+        self.visible = visible
 
     def stop(self):
-        self.running = False
+        self.loop.stop()
@@ -0,0 +1,109 @@
+from PySide6.QtCore import Signal, QRect, QTimer
+from PySide6.QtGui import QFont, QPainter, QRegion
+from PySide6.QtWidgets import QWidget, QSizePolicy
+
+DISPLAY_TICK_MS = 33
+# Small enough for a 6x6 wall on a tablet; the picture follows the panel's size.
+MIN_PANEL_WIDTH = 160
+MIN_PANEL_HEIGHT = 100
+
+
+class VideoWall(QWidget):
+    """
+    Draws a page of ``WallPanel``s in a single ``paintEvent``.
+
+    On a fixed-rate tick every placed panel takes its newest frame, wrapped as a
+    ``QImage`` without a copy, and only the panels that changed are repainted,
+    with ``drawImage`` into rects worked out when the wall is laid out. So the
+    GUI thread does one repaint per tick whatever the number of panels, instead
+    of a pixmap conversion and a label update per frame and panel. Panels that
+    aren't placed, and all of them while the wall is hidden, are told so their
+    streams can idle.
+    """
+    doubleClicked = Signal(object)   # the WallPanel
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.placed = []   # [(WallPanel, Cell)]
+        self.rows = 1
+        self.cols = 1
+        self.spacing = 20
+
+        self.title_font = QFont()
+        self.title_font.setPixelSize(16)
+
+        self.display_timer = QTimer(self)
+        self.display_timer.timeout.connect(self.on_display_tick)
+
+    def set_panels(self, placed, rows, cols, spacing=20):
+        """Lay out ``[(panel, cell)]`` on a ``rows`` x ``cols`` grid; panels left out stop displaying."""
+        panels = {panel for panel, _ in placed}
+        for panel, _ in self.placed:
+            if panel not in panels:
+                panel.set_visible(False)
+
+        self.placed = list(placed)
+        self.rows = rows
+        self.cols = cols
+        self.spacing = spacing
+        self.setMinimumSize(cols * MIN_PANEL_WIDTH + (cols + 1) * spacing,
+                            rows * MIN_PANEL_HEIGHT + (rows + 1) * spacing)
+        self._place_panels()
+        for panel in panels:
+            panel.set_visible(self.isVisible())
+        self.update()
+
+    def _place_panels(self):
+        spacing = self.spacing
+        cell_width = (self.width() - spacing * (self.cols + 1)) / self.cols
+        cell_height = (self.height() - spacing * (self.rows + 1)) / self.rows
+        for panel, cell in self.placed:
+            left = spacing + round(cell.col * (cell_width + spacing))
+            top = spacing + round(cell.row * (cell_height + spacing))
+            right = spacing + round((cell.col + cell.col_span) * (cell_width + spacing)) - spacing
+            bottom = spacing + round((cell.row + cell.row_span) * (cell_height + spacing)) - spacing
+            panel.set_geometry(QRect(left, top, max(1, right - left), max(1, bottom - top)))
+
+    def panel_at(self, pos):
+        return next((panel for panel, _ in self.placed if panel.rect.contains(pos)), None)
+
+    def on_display_tick(self):
+        changed = QRegion()
+        for panel, _ in self.placed:
+            if panel.take_frame() or panel.dirty:
+                changed += panel.rect
+        if not changed.isEmpty():
+            self.update(changed)
+
+    def paintEvent(self, event):
+        region = event.region()
+        painter = QPainter(self)
+        painter.setFont(self.title_font)
+        for panel, _ in self.placed:
+            if region.intersects(panel.rect):
+                panel.paint(painter)
+        painter.end()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._place_panels()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        for panel, _ in self.placed:
+            panel.set_visible(True)
+        self.display_timer.start(DISPLAY_TICK_MS)
+
+    def hideEvent(self, event):
+        # Behind another stack page or minimised: stop drawing, and let the
+        # capture only grab what nobody sees (still decoded, but not converted).
+        super().hideEvent(event)
+        self.display_timer.stop()
+        for panel, _ in self.placed:
+            panel.set_visible(False)
+
+    def mouseDoubleClickEvent(self, event):
+        panel = self.panel_at(event.position().toPoint())
+        if panel is not None:
+            self.doubleClicked.emit(panel)
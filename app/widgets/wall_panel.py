@@ -0,0 +1,174 @@
+import ping3
+
+from PySide6.QtCore import Qt, QObject, QPoint, QRect
+from PySide6.QtGui import QImage, QPainter
+
+from app.services.camera_channel import CameraChannel
+from app.services.logger import get_logger
+from app.services.stream_health import StreamState
+
+NO_IP = "Does not have an assigned IP address."
+TITLE_HEIGHT = 26
+STATE_TEXT = {
+    StreamState.CONNECTING: "Connecting...",
+    StreamState.STALLED: "Stream stalled",
+    StreamState.RECONNECTING: "Reconnecting...",
+    StreamState.OFFLINE: "Camera offline, retrying...",
+}
+
+class WallPanel(QObject):
+    """
+    A camera on the video wall: its ``CameraChannel``, which does the capturing and
+    recording, and what the ``VideoWall`` draws for it (title, status, latest frame).
+    """
+
+    def __init__(self, title, stream_ip, panel_index, recording_service=None, tile_size=None, parent=None):
+        super().__init__(parent)
+
+        self.logger = get_logger('WallPanel')
+
+        self.channel = CameraChannel(title, stream_ip, panel_index, recording_service, parent=self)
+        self.channel.state_changed.connect(self.on_state_changed)
+        self.channel.video_error.connect(self.on_video_error)
+
+        self.label = title
+        self.message = "Starting camera..."
+        self.image = None
+        self._frame = None   # the pixels ``image`` wraps
+        self.rect = QRect()
+        self.video_rect = QRect()
+        self.image_rect = QRect()
+        self.dirty = True
+
+        if tile_size:
+            # Not placed yet; the wall's estimate picks the first stream, placing corrects it.
+            self.channel.set_display_size(*tile_size)
+        self.channel.start()
+        if not self.channel.video_url:
+            self.message = NO_IP
+
+    @property
+    def title(self):
+        return self.channel.title
+
+    @property
+    def stream_ip(self):
+        return self.channel.stream_ip
+
+    @property
+    def video_url(self):
+        return self.channel.video_url
+
+    @property
+    def video_thread(self):
+        return self.channel.video_thread
+
+    @property
+    def motion_recording(self):
+        return self.channel.motion_recording
+
+    def ping_test(self):
+        try:
+            response = ping3.ping(dest_addr=self.stream_ip, timeout=2)
+            return not response
+        except ping3.errors.PingError:
+            self.logger.warning(f'A ping error raised for {self.stream_ip}.')
+            return False
+
+    def set_geometry(self, rect):
+        self.rect = QRect(rect)
+        self.video_rect = rect.adjusted(0, TITLE_HEIGHT, 0, 0)
+        self._fit_image()
+        self.channel.set_display_size(self.video_rect.width(), self.video_rect.height())
+        self.dirty = True
+
+    def set_visible(self, visible):
+        self.channel.set_visible(visible)
+
+    def take_frame(self):
+        """Pick up the channel's newest frame, if there is one."""
+        frame = self.channel.take_frame()
+        if frame is None:
+            return False
+
+        # Frames arrive already resized to the panel and owned by the panel (the
+        # process backend copies them out of shared memory), so this only wraps
+        # the BGR buffer for drawImage, which may redraw it at any time.
+        h, w = frame.shape[:2]
+        resized = self.image is None or (w, h) != (self.image.width(), self.image.height())
+        self._frame = frame
+        self.image = QImage(frame.data, w, h, frame.strides[0], QImage.Format_BGR888)
+        if resized:
+            self._fit_image()
+        self.dirty = True
+        return True
+
+    def _fit_image(self):
+        """Centre the image in the video area; it is scaled only until the worker has caught up with a resize."""
+        if self.image is None:
+            self.image_rect = QRect()
+            return
+        size = self.image.size()
+        area = self.video_rect.size()
+        fits = (size.width() <= area.width() and size.height() <= area.height()
+                and (size.width() == area.width() or size.height() == area.height()))
+        if not fits:
+            size = size.scaled(area, Qt.KeepAspectRatio)
+        self.image_rect = QRect(QPoint(0, 0), size)
+        self.image_rect.moveCenter(self.video_rect.center())
+
+    def paint(self, painter: QPainter):
+        painter.setPen(Qt.white)
+        painter.drawText(QRect(self.rect.x(), self.rect.y(), self.rect.width(), TITLE_HEIGHT), Qt.AlignCenter, self.label)
+        painter.fillRect(self.video_rect, Qt.black)
+        if self.image is not None:
+            painter.setRenderHint(QPainter.SmoothPixmapTransform, self.image_rect.size() != self.image.size())
+            painter.drawImage(self.image_rect, self.image)
+        else:
+            painter.drawText(self.video_rect, Qt.AlignCenter | Qt.TextWordWrap, self.message)
+        self.dirty = False
+
+    def set_message(self, text):
+        """Show ``text`` instead of the video until the next frame."""
+        self.image = None
+        self._frame = None
+        self.message = text
+        self.dirty = True
+
+    def on_state_changed(self, state):
+        if state == StreamState.LIVE:
+            self.label = self.title
+        else:
+            # Keep the last frame on screen while the stream heals itself.
+            self.label = f'{self.title} - {STATE_TEXT[state]}'
+            if self.image is None:
+                self.message = STATE_TEXT[state]
+        self.dirty = True
+
+    def on_video_error(self, message):
+        self.set_message(message)
+
+    def set_stream_profile(self, profile):
+        """Switch the displayed stream between the grid and full-resolution profiles."""
+        self.channel.set_stream_profile(profile)
+
+    def start_recording_thread(self, motion=False):
+        self.channel.start_recording_thread(motion)
+
+    def stop_recording(self):
+        self.channel.stop_recording()
+
+    def load_config(self):
+        self.channel.load_config()
+        self.label = self.title
+        self.dirty = True
+
+    def refresh_video(self, probe_result=None):
+        self.channel.refresh(probe_result)
+        self.label = self.title
+        self.dirty = True
+        if not self.channel.video_url:
+            self.set_message(NO_IP)
+
+    def close(self):
+        self.channel.close()